@@ -1,74 +1,215 @@
 import pandas as pd
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from Scrapers.NewsScraper import NewsScraper
-from Analysis.Sentiment import analyzeSentiment
+from analysis.SentimentScorer import SentimentScorer
 from Analysis.Correlation import correlateSentimentWithPrice
 from Strategy.Scanner import Scanner
 from Backtester.MonteCarlo import MonteCarlo
-from Scrapers.PriceScraper import PriceScraper
-from utils.DataCleaner import clean_ohlcv
+from Backtester.ResultsStore import ResultsStore, configParams
+from Backtester.ResultCache import resultKey
+from Backtester.Stages import dateChunks, timed
+from data.PriceCache import PriceCache
+
+# Date-range chunks for streaming news fetch -> sentiment scoring, and for price requests
+# (Yahoo serves intraday bars for at most about 60 days per request)
+NEWS_CHUNK_DAYS = 30
+PRICE_CHUNK_DAYS = 60
+
+
 class Engine:
-    def __init__(self, config):
+    def __init__(self, config, cache=None):
+        """
+        :param cache: optional ResultCache; runBacktest then returns memoized results for data,
+                      date range, parameters and code it has already seen
+        """
         self.config = config
+        self.cache = cache
         self.log = logging.getLogger(__name__)
 
-    def runBacktest(self, symbol, startDate, endDate, priceData=None):
+    def _loadSentiment(self, symbol, startDate, endDate, timings, abort):
+        """
+        News fetch and sentiment scoring as a two-stage stream: chunk downloads run concurrently
+        on threads while already-downloaded chunks are scored (SentimentScorer batches new text
+        over a process pool and never rescores cached headlines). Setting abort stops the stream
+        after the chunk in hand and cancels the downloads not yet started.
+        """
+        chunks = dateChunks(startDate, endDate, getattr(self.config, "newsChunkDays", NEWS_CHUNK_DAYS))
+        newsScraper = NewsScraper(self.config.newsApiKey, query=symbol)
+        scorer = SentimentScorer()
+
+        def fetch(chunk):
+            if abort.is_set():
+                return []
+            with timed(timings, "newsFetch"):
+                return newsScraper.scrapeNews(*chunk)
+
+        parts = []
+        pool = ThreadPoolExecutor(max_workers=min(4, len(chunks)))
+        try:
+            for future in [pool.submit(fetch, chunk) for chunk in chunks]:
+                newsData = future.result()
+                if abort.is_set():
+                    break
+                with timed(timings, "sentimentScoring"):
+                    parts.append(scorer.scoreNews(newsData))
+        finally:
+            pool.shutdown(cancel_futures=True)
+            scorer.close()
+
+        parts = [part for part in parts if not part.empty]
+        if not parts:
+            return scorer.scoreNews([])
+        return pd.concat(parts, ignore_index=True).sort_values("datetime", kind="stable").reset_index(drop=True)
+
+    def _loadPrices(self, symbol, startDate, endDate, timings):
+        """
+        Cleaned bars through the PriceCache, requested chunk by chunk (priceChunkDays) so long
+        ranges stay within what the data source serves per request; each chunk tops up the cache.
+        """
+        priceCache = PriceCache(symbol)
+        parts = []
+        for chunk in dateChunks(startDate, endDate, getattr(self.config, "priceChunkDays", PRICE_CHUNK_DAYS)):
+            with timed(timings, "priceLoad"):
+                parts.append(priceCache.getHistoricalData(*chunk))
+
+        nonEmpty = [part for part in parts if not part.empty]
+        if len(nonEmpty) < 2:
+            return nonEmpty[0] if nonEmpty else parts[-1]
+        priceData = pd.concat(nonEmpty, ignore_index=True)
+        priceData.attrs["ohlcvCleaned"] = True
+        return priceData
+
+    @staticmethod
+    def _noPriceResults(timings):
+        return {
+            "finalBalance": 0,
+            "winRate": 0,
+            "expectedValue": 0,
+            "monteCarlo": (0, 0, 0),
+            "timings": timings
+        }
+
+    def _storeTrades(self, tradeLog, symbol, startDate, endDate, runId, timings):
+        """Append tradeLog to the ResultsStore under runId and the config's parameters; returns the run ID."""
+        with timed(timings, "tradeLogWrite"):
+            params = dict(configParams(self.config), startDate=str(startDate), endDate=str(endDate))
+            return ResultsStore().writeTrades(tradeLog, symbol, params, runId=runId)
+
+    def runBacktest(self, symbol, startDate, endDate, priceData=None, sentimentData=None, writeTrades=True, runId=None):
         """
         Runs a backtest using cleaned price data.
         If priceData is not provided, it will fetch it internally.
-        """
+        If sentimentData is not provided and sentiment is enabled, news is fetched and scored internally.
+        With writeTrades the trade log is appended to the ResultsStore under runId (a new one if None)
+        and the config's parameter hash; optimizer trials pass writeTrades=False and skip the I/O.
+
+        Price loading overlaps the news/sentiment stream (both request long ranges in date chunks),
+        and the trade log write overlaps the Monte Carlo run. Without usable prices the news stream
+        is aborted rather than awaited. The results dict carries per-stage wall-clock seconds under 'timings'
+        (newsFetch sums the concurrent chunk downloads, so it can exceed the dataLoad wall time).
 
-        # Step 1: Price data
-        if priceData is None:
-            self.log.warning("No cleaned price data provided. Fetching inside Engine (less efficient).")
-            scraper = PriceScraper(symbol)
-            raw_data = scraper.getHistoricalData(startDate, endDate)
-            priceData = clean_ohlcv(raw_data, source_name="Engine")
+        With a cache, a hit skips every stage after data loading and comes back with cached=True.
+        The cached trade log is re-stored under this call's runId, so every run ID holds all of its
+        windows whether they were computed or cached.
+        """
+        timings = {}
+        totalStart = time.perf_counter()
+        useSentiment = self.config.useSentiment
 
-        if priceData.empty:
+        # Stage 1: price data || news & sentiment (only if enabled)
+        if priceData is not None and priceData.empty:
             self.log.error("No usable price data available for backtest.")
-            return {
-                "finalBalance": 0,
-                "winRate": 0,
-                "expectedValue": 0,
-                "monteCarlo": (0, 0, 0)
-            }
-
-        # Step 2: News & Sentiment (only if enabled)
-        sentimentData = None
-        if self.config.useSentiment:
-            newsScraper = NewsScraper(self.config.newsApiKey, query=symbol)
-            newsData = newsScraper.scrapeNews(startDate, endDate)
-            sentimentData = analyzeSentiment(newsData)
-            corr, _ = correlateSentimentWithPrice(sentimentData, priceData)
+            return self._noPriceResults(timings)
+
+        abort = threading.Event()
+        pool = ThreadPoolExecutor(max_workers=1)
+        try:
+            with timed(timings, "dataLoad"):
+                sentimentFuture = None
+                if useSentiment and sentimentData is None:
+                    sentimentFuture = pool.submit(self._loadSentiment, symbol, startDate, endDate, timings, abort)
+
+                if priceData is None:
+                    self.log.warning("No cleaned price data provided. Loading inside Engine (less efficient).")
+                    priceData = self._loadPrices(symbol, startDate, endDate, timings)
+
+                if priceData.empty:
+                    self.log.error("No usable price data available for backtest.")
+                    return self._noPriceResults(timings)
+
+                if sentimentFuture is not None:
+                    sentimentData = sentimentFuture.result()
+        finally:
+            # An early exit (no prices, a failed load) stops the news stream instead of waiting for it;
+            # after a normal load the stream has already finished
+            abort.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        cacheKey = None
+        if self.cache is not None:
+            cacheKey = resultKey(symbol, startDate, endDate, priceData, sentimentData if useSentiment else None,
+                                 configParams(self.config))
+            cached = self.cache.get(cacheKey)
+            # Entries without a trade log can't be stored under a new run, so they only serve trials
+            if cached is not None and (not writeTrades or "tradeLog" in cached):
+                results = {name: value for name, value in cached.items() if name != "tradeLog"}
+                results["runId"] = None
+                if writeTrades:
+                    results["runId"] = self._storeTrades(cached["tradeLog"], symbol, startDate, endDate, runId, timings)
+                timings["total"] = time.perf_counter() - totalStart
+                self.log.info(f"Cached result for {symbol} {startDate} to {endDate}")
+                return dict(results, timings=timings, cached=True)
+
+        # Stage 2: correlation
+        if useSentiment:
+            with timed(timings, "correlation"):
+                corr, _ = correlateSentimentWithPrice(sentimentData, priceData)
             self.log.info(f"Sentiment-Price correlation: {corr:.4f}")
         else:
+            sentimentData = None
             self.log.warning("Skipping sentiment analysis (Config.useSentiment = False).")
 
-        # Step 3: Scanner
-        scanner = Scanner(self.config)
-        trades = scanner.scan(priceData, sentimentData)
+        # Stage 3: Scanner
+        with timed(timings, "scan"):
+            scanner = Scanner(self.config)
+            trades = scanner.scan(priceData, sentimentData)
 
-        # Step 4: Simulation
-        tradeLog, finalBalance, winRate, ev = scanner.runSimulation(trades)
+        # Stage 4: Simulation
+        with timed(timings, "simulate"):
+            tradeLog, finalBalance, winRate, ev = scanner.runSimulation(trades)
 
-        # Step 5: Save trade log
-        pd.DataFrame(tradeLog).to_csv("TradeLog.csv", index=False)
-        self.log.info("Trade log saved to TradeLog.csv")
+        # Stage 5: trade log write || Monte Carlo
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            writeFuture = None
+            if writeTrades:
+                writeFuture = pool.submit(self._storeTrades, tradeLog, symbol, startDate, endDate, runId, timings)
+            with timed(timings, "monteCarlo"):
+                mcResults = MonteCarlo.run(tradeLog)
+            if writeFuture is not None:
+                runId = writeFuture.result()
+                self.log.info(f"Trade log stored under run {runId}")
 
-        # Step 6: Monte Carlo
-        mcResults = MonteCarlo.run(tradeLog)
+        timings["total"] = time.perf_counter() - totalStart
 
-        # Step 7: Results
+        # Stage 6: Results
         self.log.info(f"Trades Taken: {len(tradeLog)}")
         self.log.info(f"Final Balance: ${finalBalance:,.2f}")
         self.log.info(f"Win Rate: {winRate*100:.2f}%")
         self.log.info(f"Expected Value: {ev:.2f}R")
         self.log.info(f"Monte Carlo (5% / 50% / 95%): {mcResults}")
+        self.log.info("Stage timings: " + ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in timings.items()))
 
-        return {
+        results = {
             "finalBalance": finalBalance,
             "winRate": winRate,
             "expectedValue": ev,
-            "monteCarlo": mcResults
+            "monteCarlo": mcResults,
+            "timings": timings,
+            "runId": runId if writeTrades else None
         }
+        if cacheKey is not None:
+            self.cache.put(cacheKey, dict(results, tradeLog=tradeLog))
+        return dict(results, cached=False)
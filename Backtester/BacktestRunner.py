@@ -1,30 +1,91 @@
+import time
+
+import numpy as np
+import pandas as pd
+
 from strategies.SignalEvaluator import SignalEvaluator
 from strategies.DonchianZones import DonchianZones
-from strategies.LiquidityZones import LiquidityZones
+from strategies.LiquidityZones import LiquidityZones, SessionZoneIndex, sweepDirection
+from strategies.Indicators import StreamingIndicators, indicatorColumns, confirmationFlags
+from strategies.ColumnarSignals import (
+    TQS_COMPONENTS, toUtcNaive, rollingDonchian, sessionZone, sweepFlags, scoreTqsColumns
+)
 from utils.PriceBuffer import PriceBuffer
+from utils.Instrumentation import metrics
+
+WARMUP_BARS = 100
 
 class BacktestEngine:
-    def __init__(self, priceData, evaluatorInputs):
-        self.priceData = priceData.to_dict("records")  # Convert DataFrame to list of dicts
+    def __init__(self, priceData, evaluatorInputs, mode="loop", sweepZone="londonLow", sessionAnchor=None,
+                 useIndicators=True):
+        """
+        :param priceData: DataFrame with timestamp/open/high/low/close (and optional volume) columns,
+                          one row per bar in time order
+        :param evaluatorInputs: static SignalEvaluator inputs (ev, biasAligned, vixInRange, and
+                                rvol/macdAligned/rsiAligned when useIndicators is False)
+        :param mode: 'loop' evaluates bar by bar; 'columnar' scores whole NumPy columns at once
+        :param sweepZone: liquidity zone checked for sweeps (e.g. 'londonLow')
+        :param sessionAnchor: None scores each bar against its own trading day's sessions;
+                              a datetime pins every bar to that day's sessions (LiquidityZones behaviour)
+        :param useIndicators: take rvol and MACD/RSI alignment from per-bar indicators
+                              (strategies.Indicators) instead of the static evaluatorInputs
+        """
+        if mode not in ("loop", "columnar"):
+            raise ValueError(f"Unknown backtest mode '{mode}'")
+
+        self.mode = mode
+        self.priceFrame = priceData
+        self.priceData = priceData.to_dict("records") if mode == "loop" else None  # Convert DataFrame to list of dicts
         self.evaluatorInputs = evaluatorInputs
+        self.sweepZone = sweepZone
+        self.sessionAnchor = sessionAnchor
+        self.useIndicators = useIndicators
         self.buffer = PriceBuffer()
 
+    def _confirmationInputs(self, values):
+        """rvol/macdAligned/rsiAligned for one bar (scalars) or every bar (indicator columns)."""
+        inputs = self.evaluatorInputs
+        if not self.useIndicators:
+            return inputs["rvol"], inputs["macdAligned"], inputs["rsiAligned"]
+        macdAligned, rsiAligned = confirmationFlags(sweepDirection(self.sweepZone), values["macdHist"], values["rsi"])
+        return values["rvol"], macdAligned, rsiAligned
+
     def run(self):
+        """
+        Loop mode returns a list of evaluator result dicts.
+        Columnar mode returns a DataFrame with timestamp, priceUsed, score, mask and one points column per component.
+        """
+        start = time.perf_counter()
+        results = self._runColumnar() if self.mode == "columnar" else self._runLoop()
+        if metrics.enabled:
+            elapsed = time.perf_counter() - start
+            bars = len(self.priceFrame)
+            metrics.count("backtest.bars", bars)
+            metrics.observe(f"backtest.{self.mode}Seconds", elapsed)
+            metrics.observe("backtest.barsPerSecond", bars / max(elapsed, 1e-9))
+        return results
+
+    def _runLoop(self):
         results = []
+        zoneIndex = SessionZoneIndex(capacity=len(self.priceData) or 1)
+        indicators = StreamingIndicators()
 
         for bar in self.priceData:
             self.buffer.updateFromBar(bar)
+            zoneIndex.update(bar)
+            indicatorValues = indicators.update(bar)
             bars = self.buffer.getBars()
-            if not bars or len(bars) < 100:  # Skip warm-up
+            if not bars or len(bars) < WARMUP_BARS:  # Skip warm-up
                 continue
 
             currentPrice = bar["close"]
             donchian = DonchianZones(bars)
-            liquidity = LiquidityZones(bars)
+            liquidity = zoneIndex if self.sessionAnchor is None else LiquidityZones(bars, now=self.sessionAnchor)
             donchianRange = donchian.getRange()
 
-            isSwept = liquidity.detectSweep(currentPrice, "londonLow")
-            isConfirmed = liquidity.isSweepConfirmed(currentPrice, "londonLow")
+            isSwept = liquidity.detectSweep(currentPrice, self.sweepZone)
+            isConfirmed = liquidity.isSweepConfirmed(currentPrice, self.sweepZone)
+            rvol, macdAligned, rsiAligned = self._confirmationInputs(indicatorValues)
 
             evaluator = SignalEvaluator(
                 quoteTick={"last": currentPrice},
@@ -33,9 +94,9 @@ class BacktestEngine:
                 isSwept=isSwept,
                 isSweepConfirmed=isConfirmed,
                 ev=self.evaluatorInputs["ev"],
-                rvol=self.evaluatorInputs["rvol"],
-                macdAligned=self.evaluatorInputs["macdAligned"],
-                rsiAligned=self.evaluatorInputs["rsiAligned"],
+                rvol=rvol,
+                macdAligned=bool(macdAligned),
+                rsiAligned=bool(rsiAligned),
                 biasAligned=self.evaluatorInputs["biasAligned"],
                 vixInRange=self.evaluatorInputs["vixInRange"]
             )
@@ -45,3 +106,68 @@ class BacktestEngine:
             results.append(result)
 
         return results
+
+    def features(self):
+        """
+        Threshold-independent per-bar columns behind the columnar score: close, Donchian range,
+        sweep zone and flags, confirmation inputs and ATR. Backtester.FeatureStore persists these.
+        """
+        df = self.priceFrame
+        high = df["high"].to_numpy(dtype="float64")
+        low = df["low"].to_numpy(dtype="float64")
+        close = df["close"].to_numpy(dtype="float64")
+
+        donchianHigh, donchianLow = rollingDonchian(high, low)
+        if self.sessionAnchor is None:
+            zone = SessionZoneIndex.fromFrame(df).zoneColumn(self.sweepZone)
+        else:
+            # The loop's buffer holds the current bar plus up to maxBars closed ones
+            window = self.buffer.maxBars + 1
+            timestamps = toUtcNaive(df["timestamp"])
+            zone = sessionZone(timestamps, high, low, self.sweepZone, self.sessionAnchor, window)
+        isSwept, isConfirmed = sweepFlags(close, zone, self.sweepZone)
+        volume = df["volume"].to_numpy(dtype="float64") if "volume" in df.columns else None
+        indicators = indicatorColumns(high, low, close, volume)
+        rvol, macdAligned, rsiAligned = self._confirmationInputs(indicators)
+
+        return {
+            "priceUsed": close,
+            "donchianHigh": donchianHigh,
+            "donchianLow": donchianLow,
+            "zone": zone,
+            "isSwept": isSwept,
+            "isConfirmed": isConfirmed,
+            # Static inputs (useIndicators=False) are broadcast so every feature is a column
+            "rvol": np.broadcast_to(np.asarray(rvol, dtype="float64"), close.shape),
+            "macdAligned": np.broadcast_to(np.asarray(macdAligned, dtype=bool), close.shape),
+            "rsiAligned": np.broadcast_to(np.asarray(rsiAligned, dtype=bool), close.shape),
+            "atr": indicators["atr"],
+        }
+
+    def _runColumnar(self):
+        df = self.priceFrame
+        if df.empty:
+            return pd.DataFrame(columns=["timestamp", "priceUsed", "score", "mask"] + TQS_COMPONENTS)
+        return scoreFeatures(df["timestamp"].to_numpy(), self.features(), self.evaluatorInputs)
+
+
+def scoreFeatures(timestamps, features, evaluatorInputs):
+    """
+    Columnar result (timestamp, priceUsed, component points, score, mask) from a features() dict
+    and the static evaluator inputs, with the warm-up bars dropped like the loop.
+    """
+    close = features["priceUsed"]
+    frame = scoreTqsColumns(
+        close, features["donchianHigh"], features["donchianLow"], features["isSwept"], features["isConfirmed"],
+        ev=evaluatorInputs["ev"],
+        rvol=features["rvol"],
+        macdAligned=features["macdAligned"],
+        rsiAligned=features["rsiAligned"],
+        biasAligned=evaluatorInputs["biasAligned"],
+        vixInRange=evaluatorInputs["vixInRange"]
+    )
+    frame.insert(0, "priceUsed", close)
+    frame.insert(0, "timestamp", timestamps)
+
+    # Skip warm-up, same as the loop
+    return frame.iloc[WARMUP_BARS - 1:].reset_index(drop=True)
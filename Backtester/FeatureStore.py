@@ -0,0 +1,241 @@
+import hashlib
+import itertools
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from config import config
+from Backtester.BacktestRunner import BacktestEngine, WARMUP_BARS, scoreFeatures
+from Backtester.FillSimulator import DIRECTIONS
+from Backtester.ResultCache import codeVersion, frameFingerprint
+from strategies.LiquidityZones import sweepDirection
+from strategies.ColumnarSignals import toUtcNaive
+from strategies.TqsKernel import scoreMasks
+
+log = logging.getLogger(__name__)
+
+FEATURE_COLUMNS = [
+    "priceUsed", "donchianHigh", "donchianLow", "zone", "isSwept", "isConfirmed",
+    "rvol", "macdAligned", "rsiAligned", "atr"
+]
+# Evaluator inputs the stored features don't cover; sweeps may vary them along with the threshold
+STATIC_INPUTS = ["ev", "biasAligned", "vixInRange"]
+# Values of the static inputs a sweep leaves out of its grid
+STATIC_DEFAULTS = {"ev": 0.0, "biasAligned": False, "vixInRange": False}
+# Keys (and abandoned temp directories) untouched for less than this are never pruned,
+# since another process may be about to open them
+PRUNE_MIN_AGE_SECONDS = 3600
+
+
+class FeatureMatrix:
+    """
+    Per-bar features of one symbol/interval (FEATURE_COLUMNS, usually read-only memory maps)
+    plus the bar timestamps. Scoring and signal selection run straight off these columns.
+    """
+
+    def __init__(self, timestamps, columns, meta=None):
+        self.timestamps = timestamps
+        self.columns = columns
+        self.meta = meta or {}
+        self._epochNs = None
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def epochNs(self):
+        """Bar times as naive-UTC int64 epoch nanoseconds, parsed on first use and kept."""
+        if self._epochNs is None:
+            self._epochNs = toUtcNaive(self.timestamps).view("int64")
+        return self._epochNs
+
+    def barRange(self, start=None, end=None):
+        """(first, stop) bar indexes of the bars with start <= timestamp < end; None leaves a side open."""
+        if start is None and end is None:
+            return 0, len(self)
+        times = self.epochNs()
+        first = 0 if start is None else int(np.searchsorted(times, toUtcNaive([start]).view("int64")[0], side="left"))
+        stop = len(self) if end is None else int(np.searchsorted(times, toUtcNaive([end]).view("int64")[0], side="left"))
+        return first, stop
+
+    def score(self, evaluatorInputs):
+        """(score, mask) for every bar, warm-up included."""
+        c = self.columns
+        return scoreMasks(
+            c["priceUsed"], c["donchianHigh"], c["donchianLow"], c["isSwept"], c["isConfirmed"],
+            evaluatorInputs["ev"], c["rvol"], c["macdAligned"], c["rsiAligned"],
+            evaluatorInputs["biasAligned"], evaluatorInputs["vixInRange"]
+        )
+
+    def scoreFrame(self, evaluatorInputs):
+        """The same DataFrame BacktestEngine(mode='columnar').run() returns."""
+        return scoreFeatures(self.timestamps, self.columns, evaluatorInputs)
+
+    def signals(self, threshold, evaluatorInputs, score=None, stopAtr=1.5, bars=None):
+        """
+        FillSimulator signals for bars past warm-up scoring at or above threshold, traded in the
+        stored sweep zone's direction with stops stopAtr ATRs beyond the signal close. 'barIndex'
+        rows refer to the bars the matrix was built from.
+        :param score: precomputed score(evaluatorInputs)[0], to reuse across thresholds
+        :param bars: optional (first, stop) bar range from barRange to take signals from
+        """
+        if score is None:
+            score = self.score(evaluatorInputs)[0]
+        barIdx = np.flatnonzero(score >= threshold)
+        barIdx = barIdx[barIdx >= WARMUP_BARS - 1]
+        if bars is not None:
+            barIdx = barIdx[(barIdx >= bars[0]) & (barIdx < bars[1])]
+        direction = DIRECTIONS[sweepDirection(self.meta.get("sweepZone", config.DEFAULT_SWEEP_ZONE))]
+        return pd.DataFrame({
+            "timestamp": self.timestamps[barIdx],
+            "barIndex": barIdx,
+            "direction": direction,
+            "stop": self.columns["priceUsed"][barIdx] - direction * stopAtr * self.columns["atr"][barIdx],
+        })
+
+
+class FeatureStore:
+    """
+    On-disk feature matrices, one directory of .npy columns per (symbol, interval, content key).
+
+    The key hashes the bars, sweep zone, session anchor and backtest code version, so a matrix is
+    computed once per dataset and re-opened as memory maps by every later sweep or worker process.
+    Writes go to a temp directory that is renamed into place. Each load marks its key as used;
+    beyond maxKeys per symbol/interval the least recently used keys are pruned, but never the
+    one being loaded or any used within minAge seconds.
+    """
+
+    def __init__(self, cacheDir=None, maxKeys=None, minAge=PRUNE_MIN_AGE_SECONDS):
+        self.cacheDir = cacheDir or config.FEATURE_STORE_DIR
+        self.maxKeys = maxKeys or config.FEATURE_STORE_KEYS
+        self.minAge = minAge
+
+    @staticmethod
+    def key(priceData, sweepZone, sessionAnchor=None):
+        payload = f"{frameFingerprint(priceData)}|{sweepZone}|{sessionAnchor}|{codeVersion()}"
+        return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+    def _root(self, symbol, interval):
+        safeSymbol = "".join(ch if ch.isalnum() else "_" for ch in symbol)
+        return os.path.join(self.cacheDir, f"{safeSymbol}_{interval}")
+
+    def load(self, priceData, symbol, interval="30m", sweepZone=None, sessionAnchor=None):
+        """
+        Feature matrix for priceData (timestamp/open/high/low/close[/volume] bars), computed and
+        saved on first use, memory-mapped from disk afterwards.
+        """
+        sweepZone = sweepZone or config.DEFAULT_SWEEP_ZONE
+        root = self._root(symbol, interval)
+        path = os.path.join(root, self.key(priceData, sweepZone, sessionAnchor))
+
+        def build():
+            features = BacktestEngine(priceData, {}, mode="columnar", sweepZone=sweepZone,
+                                      sessionAnchor=sessionAnchor).features()
+            self._save(root, path, priceData["timestamp"], features, {
+                "symbol": symbol, "interval": interval, "sweepZone": sweepZone,
+                "sessionAnchor": str(sessionAnchor) if sessionAnchor else None, "rows": len(priceData),
+            })
+
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            build()
+        try:
+            matrix = self._open(path)
+        except FileNotFoundError:
+            # Pruned by another process between the check and the open
+            build()
+            matrix = self._open(path)
+        os.utime(os.path.join(path, "meta.json"))
+        self._prune(root, path)
+        return matrix
+
+    def _save(self, root, path, timestamps, features, meta):
+        os.makedirs(root, exist_ok=True)
+        tmpPath = os.path.join(root, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(tmpPath)
+        try:
+            timestamps = np.asarray(timestamps)
+            if timestamps.dtype == object:
+                timestamps = timestamps.astype(str)  # fixed-width text can be memory-mapped, objects can't
+            np.save(os.path.join(tmpPath, "timestamp.npy"), timestamps)
+            for name in FEATURE_COLUMNS:
+                np.save(os.path.join(tmpPath, f"{name}.npy"), np.ascontiguousarray(features[name]))
+            with open(os.path.join(tmpPath, "meta.json"), "w") as f:
+                json.dump(meta, f)
+            os.rename(tmpPath, path)
+        except OSError:
+            # Another process published the same key first; its matrix is identical
+            shutil.rmtree(tmpPath, ignore_errors=True)
+            if not os.path.exists(os.path.join(path, "meta.json")):
+                raise
+        log.info(f"Feature matrix for {meta['symbol']} {meta['interval']} saved ({meta['rows']} bars)")
+
+    def _prune(self, root, keep):
+        cutoff = time.time() - self.minAge
+        lastUsed = {}
+        for name in os.listdir(root):
+            path = os.path.join(root, name)
+            try:
+                if name.startswith("."):
+                    # Temp directory of a writer that died before renaming it into place
+                    if os.path.getmtime(path) < cutoff:
+                        shutil.rmtree(path, ignore_errors=True)
+                elif path != keep:
+                    lastUsed[path] = os.path.getmtime(os.path.join(path, "meta.json"))
+            except OSError:
+                continue  # removed concurrently, or a key still being renamed into place
+        # keep itself takes one of the maxKeys slots
+        for path in sorted(lastUsed, key=lastUsed.get, reverse=True)[self.maxKeys - 1:]:
+            if lastUsed[path] < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+
+    @staticmethod
+    def _open(path):
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        timestamps = np.load(os.path.join(path, "timestamp.npy"), mmap_mode="r")
+        columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in FEATURE_COLUMNS}
+        return FeatureMatrix(timestamps, columns, meta)
+
+
+def sweep(matrix, paramGrid, simulator=None, stopAtr=1.5, targetR=1.8, start=None, end=None):
+    """
+    Score and select over a grid without touching the raw bars again.
+
+    :param paramGrid: dict with 'threshold' and optionally STATIC_INPUTS keys -> candidate values
+                      (missing static inputs take STATIC_DEFAULTS)
+    :param simulator: optional FillSimulator over the same bars; adds trades/winRate/expectedValue
+    :param start: only signals at or after this time (e.g. a walk-forward training window)
+    :param end: only signals before this time
+    :return: DataFrame with one row per grid point: its parameters, 'signals' and any trade stats
+    """
+    thresholds = paramGrid["threshold"]
+    bars = matrix.barRange(start, end)
+    names = [name for name in STATIC_INPUTS if name in paramGrid]
+
+    rows = []
+    for values in itertools.product(*(paramGrid[name] for name in names)):
+        inputs = dict(STATIC_DEFAULTS, **dict(zip(names, values)))
+        score = matrix.score(inputs)[0]  # once per input combination, reused by every threshold
+        levels = np.unique(score)
+        outcomes = {}  # thresholds between two score levels select the same bars
+        for threshold in thresholds:
+            above = levels[levels >= threshold]
+            effective = above[0] if len(above) else np.inf
+            if effective not in outcomes:
+                signals = matrix.signals(effective, inputs, score=score, stopAtr=stopAtr, bars=bars)
+                outcome = {"signals": len(signals)}
+                if simulator is not None:
+                    rMultiples = simulator.simulate(signals, targetR=targetR)["rMultiple"].to_numpy()
+                    outcome.update(
+                        trades=len(rMultiples),
+                        winRate=float((rMultiples > 0).mean()) if len(rMultiples) else 0.0,
+                        expectedValue=float(rMultiples.mean()) if len(rMultiples) else 0.0,
+                    )
+                outcomes[effective] = outcome
+            rows.append(dict(zip(names, values), threshold=threshold, **outcomes[effective]))
+    return pd.DataFrame(rows)
@@ -0,0 +1,278 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from strategies.ColumnarSignals import toUtcNaive
+from utils.Instrumentation import metrics
+
+log = logging.getLogger(__name__)
+
+# MES defaults: $5 per point, 0.25 tick, round-turn commission split per side
+TICK_SIZE = 0.25
+POINT_VALUE = 5.0
+COMMISSION_PER_SIDE = 0.62
+
+AMBIGUOUS_POLICIES = ("stop", "target", "nearest")
+DIRECTIONS = {"long": 1, "short": -1}
+
+TRADE_COLUMNS = [
+    "signalTime", "entryTime", "exitTime", "direction", "entryPrice", "stopPrice", "targetPrice",
+    "exitPrice", "exitReason", "barsHeld", "rMultiple", "pnl", "outcome", "drilledDown"
+]
+
+
+class FirstTouch:
+    """
+    Sparse table of block minima (or maxima) over a price column, answering "first index in
+    [start, limit) whose value is at or beyond level" for many queries at once.
+
+    Each query descends the power-of-two blocks from the largest down, skipping any block that
+    stays entirely on the safe side of its level: O(log n) vectorized steps for the whole batch.
+    """
+
+    def __init__(self, values, kind, maxSpan=None):
+        if kind not in ("min", "max"):
+            raise ValueError(f"Unknown first-touch kind '{kind}'")
+        values = np.asarray(values, dtype="float64")
+        self.kind = kind
+        self.size = len(values)
+        span = max(1, min(self.size, maxSpan or self.size))
+        reduce = np.minimum if kind == "min" else np.maximum
+
+        self.levels = [values]
+        step = 1
+        while step * 2 <= span:
+            previous = self.levels[-1]
+            self.levels.append(reduce(previous[:-step], previous[step:]))
+            step *= 2
+
+    def first(self, start, limit, level):
+        """
+        :param start: int array of first indices to search
+        :param limit: int array of exclusive end indices (limit <= size)
+        :param level: float array; 'min' finds value <= level, 'max' finds value >= level
+        :return: int array of first-touch indices, equal to limit where the level is never reached
+        """
+        pos = np.array(start, dtype=np.int64, copy=True)
+        limit = np.asarray(limit, dtype=np.int64)
+        level = np.asarray(level, dtype="float64")
+
+        for k in range(len(self.levels) - 1, -1, -1):
+            step = 1 << k
+            table = self.levels[k]
+            fits = pos + step <= limit
+            block = table[np.minimum(pos, len(table) - 1)]
+            safe = block > level if self.kind == "min" else block < level
+            pos += np.where(fits & safe, step, 0)
+
+        return np.minimum(pos, limit)
+
+
+class FillSimulator:
+    def __init__(self, priceData, lowerTimeframe=None, tickSize=TICK_SIZE, pointValue=POINT_VALUE,
+                 slippageTicks=1, commissionPerSide=COMMISSION_PER_SIDE, ambiguous="stop", maxHoldBars=None):
+        """
+        Resolves entry signals into fills over OHLC bars.
+
+        Entries fill at the open of the bar after the signal bar; stops and time exits are market
+        orders (slipped against the trade), targets are limits (no slippage). A bar that opens beyond
+        a level fills at that open. A bar whose range touches both stop and target is re-run on the
+        lower-timeframe bars inside it; what it cannot settle falls back to the `ambiguous` policy.
+
+        :param priceData: DataFrame with timestamp/open/high/low/close, one row per bar in time order
+        :param lowerTimeframe: optional finer DataFrame (same columns) used only for ambiguous bars
+        :param slippageTicks: ticks lost on each market fill
+        :param commissionPerSide: dollars per contract per fill
+        :param ambiguous: 'stop' (conservative), 'target', or 'nearest' (level closer to the bar open hits first)
+        :param maxHoldBars: close trades still open after this many bars; None holds until the data ends
+        """
+        if ambiguous not in AMBIGUOUS_POLICIES:
+            raise ValueError(f"Unknown ambiguous-bar policy '{ambiguous}'")
+
+        self.times = toUtcNaive(priceData["timestamp"])
+        self.open, self.high, self.low, self.close = (
+            priceData[column].to_numpy(dtype="float64") for column in ("open", "high", "low", "close")
+        )
+        self.tickSize = tickSize
+        self.pointValue = pointValue
+        self.slippage = slippageTicks * tickSize
+        self.commissionPerSide = commissionPerSide
+        self.ambiguous = ambiguous
+        self.maxHoldBars = maxHoldBars
+
+        self.lows = FirstTouch(self.low, "min", maxHoldBars)
+        self.highs = FirstTouch(self.high, "max", maxHoldBars)
+
+        self.lower = None
+        if lowerTimeframe is not None and len(lowerTimeframe):
+            self.lower = {
+                "times": toUtcNaive(lowerTimeframe["timestamp"]),
+                "open": lowerTimeframe["open"].to_numpy(dtype="float64"),
+                "lows": FirstTouch(lowerTimeframe["low"], "min"),
+                "highs": FirstTouch(lowerTimeframe["high"], "max"),
+            }
+
+    def signalIndex(self, timestamps):
+        """Bar index of each signal timestamp (-1 where it doesn't match a bar)."""
+        times = toUtcNaive(timestamps)
+        index = np.searchsorted(self.times, times)
+        matched = (index < len(self.times)) & (self.times[np.minimum(index, len(self.times) - 1)] == times)
+        return np.where(matched, index, -1)
+
+    def simulate(self, signals, stopPoints=None, targetR=1.8):
+        """
+        :param signals: DataFrame with 'timestamp' (signal bar) and 'direction' (1 long, -1 short),
+                        and optionally absolute 'stop' / 'target' prices per signal; a 'barIndex'
+                        column (row of the signal bar in priceData) skips the timestamp lookup
+        :param stopPoints: stop distance from the entry fill, used where no 'stop' price is given
+        :param targetR: target at this multiple of the initial risk, used where no 'target' price is given
+        :return: DataFrame of trades (TRADE_COLUMNS); `.to_dict('records')` is a MonteCarlo trade log
+        """
+        if "barIndex" in signals:
+            signalIdx = signals["barIndex"].to_numpy(dtype=np.int64)
+        else:
+            signalIdx = self.signalIndex(signals["timestamp"])
+        direction = np.sign(signals["direction"].to_numpy(dtype="float64"))
+        entryIdx = signalIdx + 1
+        keep = (signalIdx >= 0) & (entryIdx < len(self.times)) & (direction != 0)
+
+        entry = self.open[np.minimum(entryIdx, len(self.open) - 1)] + direction * self.slippage
+        if "stop" in signals:
+            stop = signals["stop"].to_numpy(dtype="float64")
+        else:
+            if stopPoints is None:
+                raise ValueError("stopPoints is required when signals carry no 'stop' prices")
+            stop = np.full(len(direction), np.nan)
+        stop = np.where(np.isnan(stop), entry - direction * (stopPoints or 0.0), stop)
+        risk = direction * (entry - stop)
+        keep &= risk > 0
+
+        target = signals["target"].to_numpy(dtype="float64") if "target" in signals else np.full(len(direction), np.nan)
+        target = np.where(np.isnan(target), entry + direction * targetR * risk, target)
+
+        if (~keep).any():
+            log.debug(f"Dropped {int((~keep).sum())} signals (no matching bar, no next bar, or stop beyond entry)")
+
+        return self._resolve(signalIdx[keep], entryIdx[keep], direction[keep], entry[keep], stop[keep], target[keep])
+
+    def _resolve(self, signalIdx, entryIdx, direction, entry, stop, target):
+        size = len(self.times)
+        limit = entryIdx + self.maxHoldBars if self.maxHoldBars else np.full(len(entryIdx), size)
+        limit = np.minimum(limit, size)
+        isLong = direction > 0
+
+        # First bar touching each level: longs stop on lows and target on highs, shorts the reverse
+        stopHit = np.where(isLong, self.lows.first(entryIdx, limit, stop), self.highs.first(entryIdx, limit, stop))
+        targetHit = np.where(isLong, self.highs.first(entryIdx, limit, target), self.lows.first(entryIdx, limit, target))
+
+        exitIdx = np.minimum(np.minimum(stopHit, targetHit), limit - 1)
+        touched = np.minimum(stopHit, targetHit) < limit
+        isStop = touched & (stopHit < targetHit)
+        bothHit = touched & (stopHit == targetHit)
+
+        # Same-bar touches: a gap open beyond a level settles it, otherwise drill down
+        barOpen = self.open[exitIdx]
+        gapped = exitIdx > entryIdx
+        gapStop = bothHit & gapped & (direction * (barOpen - stop) <= 0)
+        gapTarget = bothHit & gapped & (direction * (barOpen - target) >= 0)
+        isStop |= gapStop
+        ambiguous = bothHit & ~gapStop & ~gapTarget
+
+        drilled = np.zeros(len(entryIdx), dtype=bool)
+        exitTimes = self.times[exitIdx].copy()
+        if ambiguous.any():
+            stopFirst, settled, settledTimes = self._drillDown(exitIdx[ambiguous], direction[ambiguous],
+                                                               stop[ambiguous], target[ambiguous])
+            fallback = self._fallback(barOpen[ambiguous], stop[ambiguous], target[ambiguous])
+            isStop[ambiguous] = np.where(settled, stopFirst, fallback)
+            drilled[ambiguous] = settled
+            exitTimes[np.flatnonzero(ambiguous)[settled]] = settledTimes[settled]
+
+        # Fill prices: gaps fill at the open, stops and time exits are slipped, targets are limits
+        stopFill = np.where(gapped & (direction * (barOpen - stop) < 0), barOpen, stop) - direction * self.slippage
+        targetFill = np.where(gapped & (direction * (barOpen - target) > 0), barOpen, target)
+        timeFill = self.close[exitIdx] - direction * self.slippage
+        exitPrice = np.where(isStop, stopFill, np.where(touched, targetFill, timeFill))
+
+        reason = np.where(isStop, "stop", np.where(touched, "target", np.where(limit < size, "time", "end")))
+
+        points = direction * (exitPrice - entry)
+        risk = direction * (entry - stop)
+        pnl = points * self.pointValue - 2 * self.commissionPerSide
+        rMultiple = pnl / (risk * self.pointValue)
+
+        trades = pd.DataFrame({
+            "signalTime": self.times[signalIdx],
+            "entryTime": self.times[entryIdx],
+            "exitTime": exitTimes,
+            "direction": direction.astype(np.int8),
+            "entryPrice": entry,
+            "stopPrice": stop,
+            "targetPrice": target,
+            "exitPrice": exitPrice,
+            "exitReason": reason,
+            "barsHeld": exitIdx - entryIdx + 1,
+            "rMultiple": rMultiple,
+            "pnl": pnl,
+            "outcome": np.where(rMultiple > 0, "WIN", "LOSS"),
+            "drilledDown": drilled,
+        }, columns=TRADE_COLUMNS)
+        metrics.count("fills.trades", len(trades))
+        metrics.count("fills.drilledDown", int(drilled.sum()))
+        return trades
+
+    def _fallback(self, barOpen, stop, target):
+        if self.ambiguous == "stop":
+            return np.ones(len(barOpen), dtype=bool)
+        if self.ambiguous == "target":
+            return np.zeros(len(barOpen), dtype=bool)
+        return np.abs(barOpen - stop) <= np.abs(barOpen - target)
+
+    def _drillDown(self, barIdx, direction, stop, target):
+        """
+        First-touch search on the lower-timeframe bars inside each ambiguous bar.
+        :return: (stopFirst, settled, exitTimes); settled is False where the finer bars can't order the touches
+        """
+        count = len(barIdx)
+        if self.lower is None:
+            return np.ones(count, dtype=bool), np.zeros(count, dtype=bool), np.zeros(count, dtype="datetime64[ns]")
+
+        lower = self.lower
+        barStart = self.times[barIdx]
+        spacing = np.median(np.diff(self.times)) if len(self.times) > 1 else np.timedelta64(0, "ns")
+        barEnd = np.where(barIdx + 1 < len(self.times), self.times[np.minimum(barIdx + 1, len(self.times) - 1)],
+                          barStart + spacing)
+        start = np.searchsorted(lower["times"], barStart, side="left")
+        end = np.searchsorted(lower["times"], barEnd, side="left")
+
+        isLong = direction > 0
+        stopHit = np.where(isLong, lower["lows"].first(start, end, stop), lower["highs"].first(start, end, stop))
+        targetHit = np.where(isLong, lower["highs"].first(start, end, target), lower["lows"].first(start, end, target))
+
+        settled = (np.minimum(stopHit, targetHit) < end) & (stopHit != targetHit)
+        hitIdx = np.minimum(np.minimum(stopHit, targetHit), len(lower["times"]) - 1)
+        return stopHit < targetHit, settled, lower["times"][hitIdx]
+
+
+def summarize(trades, startBalance=5000, riskPerTrade=25):
+    """
+    (tradeLog, finalBalance, winRate, expectedValue) in the shape Engine.runBacktest expects from
+    the simulation stage, sizing each trade at riskPerTrade dollars per 1R.
+    """
+    tradeLog = trades.to_dict("records")
+    if trades.empty:
+        return tradeLog, float(startBalance), 0.0, 0.0
+    rMultiples = trades["rMultiple"].to_numpy()
+    finalBalance = float(startBalance + riskPerTrade * rMultiples.sum())
+    return tradeLog, finalBalance, float((rMultiples > 0).mean()), float(rMultiples.mean())
+
+
+def signalsFromScores(scored, threshold, direction):
+    """
+    Signals from a columnar BacktestRunner result: every bar scoring at or above threshold,
+    traded in `direction` (1 / -1, or 'long' / 'short' as sweepDirection(sweepZone) returns).
+    """
+    selected = scored.loc[scored["score"] >= threshold, ["timestamp"]].reset_index(drop=True)
+    selected["direction"] = DIRECTIONS.get(direction, direction)
+    return selected
@@ -1,27 +1,95 @@
 # Backtester/MonteCarlo.py
 import numpy as np
+import pandas as pd
+
+# Cap on simulated trade cells held in memory at once (~40 MB of float64 equity)
+MAX_CELLS_PER_CHUNK = 5_000_000
 
 class MonteCarlo:
     @staticmethod
-    def run(trades, numSimulations=1000, startBalance=5000, riskPerTrade=25, rWin=1.8, rLoss=1.0):
+    def run(trades, numSimulations=1000, startBalance=5000, riskPerTrade=25, rWin=1.8, rLoss=1.0, seed=None):
         """
         Runs Monte Carlo simulations on the trade log.
         Returns (5th percentile, 50th percentile, 95th percentile) ending balances.
         """
-        results = []
-        outcomes = [t["outcome"] for t in trades]
-
-        for _ in range(numSimulations):
-            balance = startBalance
-            shuffled = np.random.permutation(outcomes)
-            for outcome in shuffled:
-                if outcome == "WIN":
-                    balance += rWin * riskPerTrade
+        stats = MonteCarlo.simulate(
+            trades, numSimulations=numSimulations, startBalance=startBalance,
+            riskPerTrade=riskPerTrade, rWin=rWin, rLoss=rLoss, seed=seed
+        )
+        return stats["endingBalance"]
+
+    @staticmethod
+    def encodeOutcomes(trades):
+        """Trade log -> int8 array, 1 for WIN and 0 for anything else."""
+        return np.fromiter((t["outcome"] == "WIN" for t in trades), dtype=np.int8, count=len(trades))
+
+    @staticmethod
+    def encodeRMultiples(trades, rWin=1.8, rLoss=1.0):
+        """
+        Trade log -> float R per trade: the trade's own 'rMultiple' when it has one, else rWin / -rLoss.
+        A missing rMultiple (absent, None, NaN or pd.NA, as nullable DataFrame columns give) takes the fixed R too.
+        """
+        fixed = np.where(MonteCarlo.encodeOutcomes(trades) == 1, rWin, -rLoss)
+        recorded = np.fromiter(
+            (np.nan if pd.isna(t.get("rMultiple")) else t["rMultiple"] for t in trades), dtype="float64", count=len(trades)
+        )
+        return np.where(np.isnan(recorded), fixed, recorded)
+
+    @staticmethod
+    def simulate(trades, numSimulations=1000, startBalance=5000, riskPerTrade=25, rWin=1.8, rLoss=1.0,
+                 method="permutation", ruinBalance=0, seed=None, chunkSize=None):
+        """
+        Vectorized Monte Carlo over the trade log. Paths are drawn as one (paths x trades) matrix per chunk.
+        Trades carrying an 'rMultiple' (FillSimulator output) use it; others count as rWin or -rLoss.
+
+        :param method: 'permutation' reshuffles the trade order; 'bootstrap' resamples trades with replacement
+        :param ruinBalance: a path is ruined once its equity touches this level
+        :param seed: int or numpy.random.Generator, for reproducible runs
+        :param chunkSize: paths per chunk; defaults to a size that bounds memory
+        :return: dict with (p5, p50, p95) for endingBalance/maxDrawdown/minBalance,
+                 riskOfRuin (fraction of ruined paths) and the per-path arrays
+        """
+        if method not in ("permutation", "bootstrap"):
+            raise ValueError(f"Unknown Monte Carlo method '{method}'")
+
+        rng = np.random.default_rng(seed)
+        rMultiples = MonteCarlo.encodeRMultiples(trades, rWin=rWin, rLoss=rLoss)
+        numTrades = len(rMultiples)
+
+        endingBalances = np.full(numSimulations, float(startBalance))
+        maxDrawdowns = np.zeros(numSimulations)
+        minBalances = np.full(numSimulations, float(startBalance))
+
+        if numTrades:
+            pnlPerTrade = rMultiples * riskPerTrade
+            chunkSize = chunkSize or max(1, MAX_CELLS_PER_CHUNK // numTrades)
+
+            for start in range(0, numSimulations, chunkSize):
+                stop = min(start + chunkSize, numSimulations)
+                paths = stop - start
+
+                if method == "permutation":
+                    draws = rng.permuted(np.broadcast_to(pnlPerTrade, (paths, numTrades)), axis=1)
                 else:
-                    balance -= rLoss * riskPerTrade
-            results.append(balance)
+                    draws = pnlPerTrade[rng.integers(0, numTrades, size=(paths, numTrades))]
+
+                equity = startBalance + np.cumsum(draws, axis=1)
+                peaks = np.maximum(np.maximum.accumulate(equity, axis=1), startBalance)
+
+                endingBalances[start:stop] = equity[:, -1]
+                maxDrawdowns[start:stop] = (peaks - equity).max(axis=1)
+                minBalances[start:stop] = np.minimum(equity.min(axis=1), startBalance)
+
+        def percentiles(values):
+            p5, p50, p95 = np.percentile(values, [5, 50, 95])
+            return (round(p5, 2), round(p50, 2), round(p95, 2))
 
-        p5 = np.percentile(results, 5)
-        p50 = np.percentile(results, 50)
-        p95 = np.percentile(results, 95)
-        return (round(p5, 2), round(p50, 2), round(p95, 2))
+        return {
+            "endingBalance": percentiles(endingBalances),
+            "maxDrawdown": percentiles(maxDrawdowns),
+            "minBalance": percentiles(minBalances),
+            "riskOfRuin": float(np.mean(minBalances <= ruinBalance)),
+            "endingBalances": endingBalances,
+            "maxDrawdowns": maxDrawdowns,
+            "minBalances": minBalances
+        }
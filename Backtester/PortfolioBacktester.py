@@ -0,0 +1,292 @@
+import heapq
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from Backtester.BacktestRunner import BacktestEngine
+from Backtester.FillSimulator import DIRECTIONS, TRADE_COLUMNS, FillSimulator, signalsFromScores
+from Backtester.MonteCarlo import MonteCarlo
+from Backtester.Stages import timed
+from data.PriceCache import PriceCache
+from strategies.ColumnarSignals import toUtcNaive
+from strategies.Indicators import atr
+from strategies.LiquidityZones import sweepDirection
+from utils.SharedFrame import SharedFrame
+
+log = logging.getLogger(__name__)
+
+DEFAULT_SYMBOLS = ["MES", "MNQ", "M2K", "MYM"]
+# Dollars per index point for the micro contracts
+POINT_VALUES = {"MES": 5.0, "MNQ": 2.0, "M2K": 5.0, "MYM": 0.5}
+PRICE_FIELDS = ["open", "high", "low", "close", "volume"]
+
+# Stores attached by this worker process, keyed by their block names
+_attachedStores = {}
+
+
+class PortfolioData:
+    """
+    Several symbols' bars on one shared time axis: each price field is a (symbols x times)
+    float64 matrix, NaN where a symbol has no bar at that time. A store over shared memory
+    (fromShared) holds one row view per symbol instead of a matrix.
+    """
+
+    def __init__(self, symbols, times, fields):
+        self.symbols = list(symbols)
+        self.times = times
+        self.fields = fields
+
+    @classmethod
+    def fromFrames(cls, frames, timeColumn="datetime"):
+        """:param frames: dict symbol -> cleaned OHLCV DataFrame"""
+        symbols = list(frames)
+        stamps = {symbol: toUtcNaive(frames[symbol][timeColumn]) for symbol in symbols}
+        times = np.unique(np.concatenate([stamps[symbol] for symbol in symbols])) if symbols else np.array([], "datetime64[ns]")
+
+        fields = {field: np.full((len(symbols), len(times)), np.nan) for field in PRICE_FIELDS}
+        for row, symbol in enumerate(symbols):
+            columns = np.searchsorted(times, stamps[symbol])
+            for field in PRICE_FIELDS:
+                if field in frames[symbol].columns:
+                    fields[field][row, columns] = frames[symbol][field].to_numpy(dtype="float64")
+        return cls(symbols, times, fields)
+
+    @classmethod
+    def load(cls, symbols, start, end, interval="30m", cacheDir=None):
+        frames = {
+            symbol: PriceCache(symbol, interval=interval, cacheDir=cacheDir).getHistoricalData(start, end)
+            for symbol in symbols
+        }
+        empty = [symbol for symbol, frame in frames.items() if frame.empty]
+        if empty:
+            log.warning(f"No price data for {empty}; leaving them out of the portfolio")
+        return cls.fromFrames({symbol: frame for symbol, frame in frames.items() if not frame.empty})
+
+    def frame(self, symbol):
+        """One symbol's own bars (rows it has a close for) with timestamp/open/high/low/close/volume."""
+        row = self.symbols.index(symbol)
+        present = ~np.isnan(self.fields["close"][row])
+        data = {"timestamp": self.times[present]}
+        data.update({field: self.fields[field][row][present] for field in PRICE_FIELDS})
+        return pd.DataFrame(data)
+
+    def publish(self):
+        """Wide SharedFrame ('datetime' plus one 'SYMBOL:field' column per matrix row) for pool workers."""
+        wide = {"datetime": self.times}
+        for row, symbol in enumerate(self.symbols):
+            wide.update({f"{symbol}:{field}": self.fields[field][row] for field in PRICE_FIELDS})
+        return SharedFrame.publish(pd.DataFrame(wide))
+
+    @classmethod
+    def fromShared(cls, shared, symbols):
+        """Store of symbols over an attached wide SharedFrame; the time axis and every field row are views, not copies."""
+        columns = shared.columns
+        fields = {field: [columns[f"{symbol}:{field}"] for symbol in symbols] for field in PRICE_FIELDS}
+        store = cls(symbols, columns["datetime"], fields)
+        store.shared = shared  # keeps the blocks mapped while the store views them
+        return store
+
+
+def _attachStore(spec, symbol):
+    """One symbol's store in this worker, mapping only the time axis and that symbol's columns."""
+    key = (tuple(column.get("block") for column in spec["columns"]), symbol)
+    if key not in _attachedStores:
+        names = ["datetime"] + [f"{symbol}:{field}" for field in PRICE_FIELDS]
+        _attachedStores[key] = PortfolioData.fromShared(SharedFrame.attach(spec, columns=names), [symbol])
+    return _attachedStores[key]
+
+
+def scanSymbol(bars, symbol, evaluatorInputs, threshold, sweepZone, stopAtr=1.5, targetR=1.8, maxHoldBars=None):
+    """
+    Columnar TQS scan plus fill simulation for one symbol.
+    Stops sit stopAtr ATRs beyond the signal bar's close; targets at targetR times the risk.
+    :return: trade DataFrame (FillSimulator columns plus 'symbol')
+    """
+    scored = BacktestEngine(bars, evaluatorInputs, mode="columnar", sweepZone=sweepZone).run()
+    direction = DIRECTIONS[sweepDirection(sweepZone)]
+    signals = signalsFromScores(scored, threshold, direction)
+
+    # Scored rows are the bars after warm-up, so row i is bar i + offset
+    barIdx = np.flatnonzero(scored["score"].to_numpy() >= threshold) + (len(bars) - len(scored))
+    close = bars["close"].to_numpy(dtype="float64")
+    averageRange = atr(bars["high"].to_numpy(dtype="float64"), bars["low"].to_numpy(dtype="float64"), close)
+    signals["stop"] = close[barIdx] - direction * stopAtr * averageRange[barIdx]
+
+    simulator = FillSimulator(bars, pointValue=POINT_VALUES.get(symbol, 5.0), maxHoldBars=maxHoldBars)
+    trades = simulator.simulate(signals, targetR=targetR)
+    trades.insert(0, "symbol", symbol)
+    return trades
+
+
+def _scanSymbolJob(spec, symbol, options):
+    """Worker entry point: scan one symbol of the shared store."""
+    store = _attachStore(spec, symbol)
+    return scanSymbol(store.frame(symbol), symbol, **options)
+
+
+def allocate(trades, startBalance=5000, riskPerTrade=25, riskFraction=None, maxPositions=2, maxPerSymbol=1):
+    """
+    Replay every symbol's trades in entry-time order against one account.
+
+    A trade is taken only if fewer than maxPositions trades (maxPerSymbol for its symbol) are open
+    and the equity left after the open trades' risk still covers its risk. Each trade risks
+    riskPerTrade dollars per 1R, or riskFraction of current equity when given. Exits at or before
+    an entry settle first.
+    :return: the trades with 'taken', 'skipReason', 'riskDollars', 'pnlDollars' and 'equity' columns
+    """
+    ordered = trades.sort_values(["entryTime", "symbol"], kind="stable").reset_index(drop=True)
+    count = len(ordered)
+    taken = np.zeros(count, dtype=bool)
+    skipReason = np.full(count, "", dtype=object)
+    riskDollars = np.zeros(count)
+    pnlDollars = np.zeros(count)
+    equityAfter = np.full(count, np.nan)
+
+    equity = float(startBalance)
+    openRisk = 0.0
+    openTrades = []  # heap of (exitTime, position)
+    openBySymbol = {}
+
+    entryTimes = ordered["entryTime"].to_numpy()
+    exitTimes = ordered["exitTime"].to_numpy()
+    symbols = ordered["symbol"].to_numpy()
+    rMultiples = ordered["rMultiple"].to_numpy()
+
+    for i in range(count):
+        while openTrades and openTrades[0][0] <= entryTimes[i]:
+            _, j = heapq.heappop(openTrades)
+            equity += pnlDollars[j]
+            openRisk -= riskDollars[j]
+            openBySymbol[symbols[j]] -= 1
+            equityAfter[j] = equity
+
+        risk = riskFraction * equity if riskFraction else float(riskPerTrade)
+        if len(openTrades) >= maxPositions:
+            skipReason[i] = "maxPositions"
+        elif openBySymbol.get(symbols[i], 0) >= maxPerSymbol:
+            skipReason[i] = "maxPerSymbol"
+        elif equity - openRisk < risk or risk <= 0:
+            skipReason[i] = "capital"
+        else:
+            taken[i] = True
+            riskDollars[i] = risk
+            pnlDollars[i] = rMultiples[i] * risk
+            openRisk += risk
+            openBySymbol[symbols[i]] = openBySymbol.get(symbols[i], 0) + 1
+            heapq.heappush(openTrades, (exitTimes[i], i))
+
+    while openTrades:
+        _, j = heapq.heappop(openTrades)
+        equity += pnlDollars[j]
+        equityAfter[j] = equity
+
+    ordered["taken"] = taken
+    ordered["skipReason"] = skipReason
+    ordered["riskDollars"] = riskDollars
+    ordered["pnlDollars"] = pnlDollars
+    ordered["equity"] = equityAfter
+    return ordered
+
+
+def _stats(trades, startBalance, riskPerTrade):
+    if trades.empty:
+        return {"trades": 0, "winRate": 0.0, "expectedValue": 0.0, "pnl": 0.0, "finalBalance": float(startBalance)}
+    pnl = float(trades["pnlDollars"].sum())
+    return {
+        "trades": int(len(trades)),
+        "winRate": float((trades["rMultiple"] > 0).mean()),
+        "expectedValue": float(trades["rMultiple"].mean()),
+        "pnl": pnl,
+        "finalBalance": float(startBalance) + pnl,
+        "monteCarlo": [float(v) for v in MonteCarlo.run(
+            trades.to_dict("records"), startBalance=startBalance, riskPerTrade=riskPerTrade)],
+    }
+
+
+class PortfolioBacktester:
+    def __init__(self, symbols, evaluatorInputs, threshold, sweepZone="londonLow", startBalance=5000,
+                 riskPerTrade=25, riskFraction=None, maxPositions=2, maxPerSymbol=1, stopAtr=1.5, targetR=1.8,
+                 maxHoldBars=None, maxWorkers=None):
+        """
+        Portfolio mode: every symbol is scanned and filled in parallel over a shared columnar store,
+        then the trades are merged in time order under one account's capital and position limits.
+        """
+        self.symbols = list(symbols)
+        self.evaluatorInputs = evaluatorInputs
+        self.startBalance = startBalance
+        self.riskPerTrade = riskPerTrade
+        self.limits = {"riskFraction": riskFraction, "maxPositions": maxPositions, "maxPerSymbol": maxPerSymbol}
+        self.scanOptions = {
+            "evaluatorInputs": evaluatorInputs, "threshold": threshold, "sweepZone": sweepZone,
+            "stopAtr": stopAtr, "targetR": targetR, "maxHoldBars": maxHoldBars,
+        }
+        self.maxWorkers = maxWorkers
+
+    def scan(self, store):
+        """All symbols' candidate trades, one process per symbol reading the store from shared memory."""
+        if len(store.symbols) <= 1 or self.maxWorkers == 1:
+            parts = [scanSymbol(store.frame(symbol), symbol, **self.scanOptions) for symbol in store.symbols]
+        else:
+            shared = store.publish()
+            try:
+                with ProcessPoolExecutor(max_workers=self.maxWorkers or min(len(store.symbols), os.cpu_count() or 1)) as pool:
+                    jobs = [pool.submit(_scanSymbolJob, shared.spec, symbol, self.scanOptions)
+                            for symbol in store.symbols]
+                    parts = [job.result() for job in jobs]
+            finally:
+                shared.close()
+        parts = [part for part in parts if not part.empty]
+        if not parts:
+            return pd.DataFrame(columns=["symbol"] + TRADE_COLUMNS)
+        return pd.concat(parts, ignore_index=True)
+
+    def run(self, store, timings=None):
+        """
+        :param store: PortfolioData
+        :param timings: dict the scan and allocate stage seconds are added to (as Engine.runBacktest
+                        reports them); a new one if omitted
+        :return: dict with 'trades' (every candidate, taken or not), 'perSymbol' and 'portfolio' stats,
+                 and 'timings'
+        """
+        timings = {} if timings is None else timings
+        with timed(timings, "scan"):
+            candidates = self.scan(store)
+        with timed(timings, "allocate"):
+            trades = allocate(candidates, startBalance=self.startBalance, riskPerTrade=self.riskPerTrade, **self.limits)
+        taken = trades[trades["taken"]]
+        log.info(f"Portfolio: {len(taken)} of {len(trades)} signals taken across {len(store.symbols)} symbols")
+        return {
+            "trades": trades,
+            "perSymbol": {
+                symbol: _stats(taken[taken["symbol"] == symbol], self.startBalance, self.riskPerTrade)
+                for symbol in store.symbols
+            },
+            "portfolio": _stats(taken, self.startBalance, self.riskPerTrade),
+            "timings": timings,
+        }
+
+
+def writeResults(results, outputDir=None):
+    """
+    TradeLog_<SYMBOL>.csv per symbol, TradeLog_portfolio.csv (all candidates, with taken/skipReason)
+    and summary.json in outputDir, a fresh timestamped directory by default so runs never overwrite.
+    The time spent is added to results['timings'] as the 'write' stage.
+    :return: the output directory
+    """
+    outputDir = outputDir or os.path.join("results", f"portfolio_{datetime.now():%Y%m%d_%H%M%S}")
+    with timed(results.setdefault("timings", {}), "write"):
+        os.makedirs(outputDir, exist_ok=True)
+
+        trades = results["trades"]
+        for symbol in results["perSymbol"]:
+            perSymbol = trades[(trades["symbol"] == symbol) & trades["taken"]]
+            perSymbol.to_csv(os.path.join(outputDir, f"TradeLog_{symbol}.csv"), index=False)
+        trades.to_csv(os.path.join(outputDir, "TradeLog_portfolio.csv"), index=False)
+        with open(os.path.join(outputDir, "summary.json"), "w") as f:
+            json.dump({"perSymbol": results["perSymbol"], "portfolio": results["portfolio"]}, f, indent=2)
+    return outputDir
@@ -0,0 +1,142 @@
+import functools
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from config import config
+from utils.Instrumentation import metrics
+
+log = logging.getLogger(__name__)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Packages whose source decides what a backtest returns: everything Engine.runBacktest imports,
+# directly or through the Scanner (missing directories hash as empty)
+CODE_VERSION_DIRS = ("Backtester", "Strategy", "strategies", "Analysis", "analysis", "Scrapers", "data", "utils", "config")
+
+
+@functools.lru_cache(maxsize=1)
+def codeVersion():
+    """
+    Hash of the backtest source (CODE_VERSION_DIRS), so edits to the strategy invalidate cached
+    results. The CODE_VERSION environment variable overrides it (e.g. a release tag).
+    """
+    override = os.getenv("CODE_VERSION")
+    if override:
+        return override
+    digest = hashlib.sha1()
+    for folder in CODE_VERSION_DIRS:
+        for dirPath, dirNames, fileNames in os.walk(os.path.join(REPO_ROOT, folder)):
+            dirNames[:] = sorted(name for name in dirNames if name != "__pycache__")
+            for name in sorted(fileNames):
+                if name.endswith(".py"):
+                    path = os.path.join(dirPath, name)
+                    digest.update(os.path.relpath(path, REPO_ROOT).encode())
+                    with open(path, "rb") as f:
+                        digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def frameFingerprint(df):
+    """Content hash of a DataFrame's columns and values (the index is ignored); None hashes as 'none'."""
+    if df is None:
+        return "none"
+    digest = hashlib.sha1(",".join(map(str, df.columns)).encode())
+    if len(df):
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def resultKey(symbol, startDate, endDate, priceData, sentimentData, params, version=None):
+    """Content address of one backtest: data fingerprints, date range, parameters and code version."""
+    payload = {
+        "symbol": symbol,
+        "startDate": str(startDate),
+        "endDate": str(endDate),
+        "price": frameFingerprint(priceData),
+        "sentiment": frameFingerprint(sentimentData),
+        "params": params,
+        "code": version or codeVersion(),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier memo of backtest results by resultKey: a bounded in-memory LRU in front of a
+    SQLite table that outlives the process. A disk hit is promoted into memory; every put is
+    written through, so a crashed or repeated walk-forward resumes from what already finished.
+    Values are pickled and must be picklable.
+    """
+
+    def __init__(self, cachePath=None, maxEntries=None):
+        self.cachePath = cachePath or config.RESULT_CACHE_PATH
+        self.maxEntries = maxEntries or config.RESULT_CACHE_ENTRIES
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        if os.path.dirname(self.cachePath):
+            os.makedirs(os.path.dirname(self.cachePath), exist_ok=True)
+        # Walk-forward workers share the file, so wait on each other's writes rather than fail
+        self.conn = sqlite3.connect(self.cachePath, timeout=30, check_same_thread=False)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB NOT NULL) WITHOUT ROWID")
+        self.conn.commit()
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+
+    def _remember(self, key, value):
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.maxEntries:
+            self.memory.popitem(last=False)
+
+    def get(self, key):
+        """Cached value or None."""
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.hits["memory"] += 1
+                metrics.count("resultCache.memoryHits")
+                return self.memory[key]
+            row = self.conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                metrics.count("resultCache.misses")
+                return None
+            value = pickle.loads(row[0])
+            self._remember(key, value)
+            self.hits["disk"] += 1
+            metrics.count("resultCache.diskHits")
+            return value
+
+    def put(self, key, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            self._remember(key, value)
+            with self.conn:
+                self.conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?)", (key, blob))
+
+    def getOrCompute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def clear(self):
+        with self.lock, self.conn:
+            self.memory.clear()
+            self.conn.execute("DELETE FROM results")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
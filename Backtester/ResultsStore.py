@@ -0,0 +1,149 @@
+import hashlib
+import json
+import logging
+import os
+import uuid
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from config import config
+
+log = logging.getLogger(__name__)
+
+# Hive partition keys, outermost first; kept as strings so hashes never parse as numbers
+PARTITION_KEYS = ["symbol", "paramHash", "runId"]
+PARTITIONING = ds.partitioning(pa.schema([(key, pa.string()) for key in PARTITION_KEYS]), flavor="hive")
+# Config attributes never recorded with a run (API keys and the like)
+SECRET_MARKERS = ("key", "token", "secret", "password")
+
+
+def configParams(config):
+    """Public, non-callable, non-secret attributes of a config object (or a dict) as a plain dict."""
+    if isinstance(config, dict):
+        values = dict(config)
+    else:
+        values = {
+            name: getattr(config, name) for name in dir(config)
+            if not name.startswith("_") and not callable(getattr(config, name))
+        }
+    return {name: value for name, value in values.items() if not any(m in name.lower() for m in SECRET_MARKERS)}
+
+
+def paramHash(params):
+    """Stable 12-character hash of a parameter dict (key order doesn't matter)."""
+    encoded = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha1(encoded.encode()).hexdigest()[:12]
+
+
+def newRunId():
+    """Sortable unique run ID, e.g. '20240304T153000-1a2b3c4d'."""
+    return f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+
+def _partitionValue(value):
+    return "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in str(value))
+
+
+class ResultsStore:
+    """
+    Trade logs as a Hive-partitioned Parquet dataset, symbol=/paramHash=/runId=/part-*.parquet,
+    plus one runs/<runId>/<paramHash>.json record of the parameters behind each partition.
+
+    Every write goes to a new file (temp name, then rename), so concurrent runs never clobber
+    each other and readers never see half-written parts. Queries are lazy: partition filters
+    prune whole directories and only the requested columns are read.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or config.RESULTS_DIR
+        self.tradesPath = os.path.join(self.root, "trades")
+        self.runsPath = os.path.join(self.root, "runs")
+
+    def writeTrades(self, tradeLog, symbol, params, runId=None):
+        """
+        Append a trade log (list of dicts or DataFrame) under its run ID and parameter hash.
+        :return: the run ID (a new one when not given)
+        """
+        runId = runId or newRunId()
+        digest = paramHash(params)
+        self._writeRunRecord(runId, digest, symbol, params)
+
+        trades = pd.DataFrame(tradeLog)
+        if trades.empty:
+            return runId
+
+        partition = os.path.join(
+            self.tradesPath, *(f"{key}={_partitionValue(value)}" for key, value in zip(PARTITION_KEYS, (symbol, digest, runId)))
+        )
+        os.makedirs(partition, exist_ok=True)
+        part = uuid.uuid4().hex
+        tmpPath = os.path.join(partition, f".part-{part}.tmp")
+        pq.write_table(pa.Table.from_pandas(trades, preserve_index=False), tmpPath)
+        os.replace(tmpPath, os.path.join(partition, f"part-{part}.parquet"))
+        log.debug(f"Stored {len(trades)} trades in {partition}")
+        return runId
+
+    def _writeRunRecord(self, runId, digest, symbol, params):
+        path = os.path.join(self.runsPath, _partitionValue(runId))
+        os.makedirs(path, exist_ok=True)
+        record = {
+            "runId": runId,
+            "paramHash": digest,
+            "symbol": symbol,
+            "createdAt": datetime.utcnow().isoformat(timespec="seconds"),
+            "params": json.loads(json.dumps(params, default=str)),
+        }
+        tmpPath = os.path.join(path, f".{digest}.tmp")
+        with open(tmpPath, "w") as f:
+            json.dump(record, f, indent=2)
+        os.replace(tmpPath, os.path.join(path, f"{digest}.json"))
+
+    def runs(self):
+        """One row per (runId, paramHash) with symbol, createdAt and the parameters."""
+        records = []
+        if os.path.isdir(self.runsPath):
+            for runDir in sorted(os.listdir(self.runsPath)):
+                for name in sorted(os.listdir(os.path.join(self.runsPath, runDir))):
+                    if name.endswith(".json"):
+                        with open(os.path.join(self.runsPath, runDir, name)) as f:
+                            records.append(json.load(f))
+        return pd.DataFrame(records, columns=["runId", "paramHash", "symbol", "createdAt", "params"])
+
+    def dataset(self):
+        """
+        Lazy pyarrow dataset over every trade part, or None before the first write.
+        Parts written by different code versions may differ in columns; the schema is their union.
+        """
+        if not os.path.isdir(self.tradesPath):
+            return None
+        dataset = ds.dataset(self.tradesPath, format="parquet", partitioning=PARTITIONING, exclude_invalid_files=True)
+        schemas = [fragment.physical_schema for fragment in dataset.get_fragments()]
+        if len(schemas) > 1:
+            unified = pa.unify_schemas(schemas + [PARTITIONING.schema], promote_options="permissive")
+            dataset = ds.dataset(self.tradesPath, schema=unified, format="parquet", partitioning=PARTITIONING,
+                                 exclude_invalid_files=True)
+        return dataset
+
+    def query(self, symbol=None, runId=None, paramHash=None, columns=None, where=None):
+        """
+        Load matching trades as a DataFrame.
+        :param symbol / runId / paramHash: a value or list of values to keep (partition pruning)
+        :param columns: columns to read (default all, partition keys included)
+        :param where: extra pyarrow.dataset expression, e.g. ds.field("rMultiple") > 0
+        """
+        dataset = self.dataset()
+        if dataset is None:
+            return pd.DataFrame(columns=columns)
+
+        expression = where
+        for key, wanted in zip(PARTITION_KEYS, (symbol, paramHash, runId)):
+            if wanted is None:
+                continue
+            values = [_partitionValue(value) for value in (wanted if isinstance(wanted, (list, tuple, set)) else [wanted])]
+            condition = ds.field(key).isin(values)
+            expression = condition if expression is None else expression & condition
+        return dataset.to_table(columns=columns, filter=expression).to_pandas()
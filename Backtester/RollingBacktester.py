@@ -1,23 +1,102 @@
+import itertools
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from datetime import timedelta
-from Scrapers.PriceScraper import PriceScraper
-from Scrapers.NewsScraper import NewsScraper
-from Analysis.Sentiment import analyzeSentiment
-from config.config import Config
+from types import SimpleNamespace
+from data.PriceCache import PriceCache
+from analysis.SentimentScorer import SentimentScorer
+from utils.SharedFrame import SharedFrame
+from Backtester.ResultsStore import ResultsStore, configParams, newRunId
+from Backtester.ResultCache import ResultCache
+from Backtester.FeatureStore import STATIC_DEFAULTS, FeatureStore, sweep
+from Backtester.FillSimulator import FillSimulator, summarize
+from Backtester.MonteCarlo import MonteCarlo
+from strategies.ColumnarSignals import toUtcNaive
 
 import logging
 
 log = logging.getLogger(__name__)
 
+DEFAULT_PARAM_GRID = {"tqsThreshold": list(np.arange(3, 7, 0.5))}
+
+# Shared frames attached by this worker process, keyed by their block names
+_attachedFrames = {}
+# This worker process's handle on the shared result cache file
+_workerCaches = {}
+
+
+def _configSnapshot(config, overrides):
+    """Picklable copy of a config object's public attributes with overrides applied."""
+    values = {
+        name: getattr(config, name) for name in dir(config)
+        if not name.startswith("_") and not callable(getattr(config, name))
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def _attachFrame(spec):
+    if spec is None:
+        return None
+    key = tuple(column.get("block") for column in spec["columns"])
+    if key not in _attachedFrames:
+        _attachedFrames[key] = SharedFrame.attach(spec)
+    return _attachedFrames[key]
+
+
+def _workerCache(cachePath):
+    if cachePath is None:
+        return None
+    if cachePath not in _workerCaches:
+        _workerCaches[cachePath] = ResultCache(cachePath)
+    return _workerCaches[cachePath]
+
+
+def _runWindowJob(symbol, config, priceSpec, sentimentSpec, start, end, writeTrades=False, runId=None, cachePath=None):
+    """Worker entry point: backtest one window from shared-memory data (trade logs stored only for final runs)."""
+    from Backtester.BacktestEngine import Engine
+
+    priceFrame = _attachFrame(priceSpec)
+    sentimentFrame = _attachFrame(sentimentSpec)
+    priceData = priceFrame.sliceByTime("datetime", start, end)
+    sentimentData = sentimentFrame.sliceByTime("datetime", start, end) if sentimentFrame else None
+
+    engine = Engine(config, cache=_workerCache(cachePath))
+    return engine.runBacktest(
+        symbol,
+        start.strftime("%Y-%m-%d"),
+        end.strftime("%Y-%m-%d"),
+        priceData=priceData,
+        sentimentData=sentimentData,
+        writeTrades=writeTrades,
+        runId=runId
+    )
+
+
 class RollingBacktester:
-    def __init__(self, symbol, startDate, endDate, config, trainWindowMonths=12, testWindowMonths=3):
+    def __init__(self, symbol, startDate, endDate, config, trainWindowMonths=12, testWindowMonths=3, cache=True,
+                 featureStore=False):
+        """
+        :param cache: True for the default ResultCache, a ResultCache instance, or False to recompute
+                      every window; cached windows are skipped on repeated or resumed runs
+        :param featureStore: True for the default FeatureStore, or a FeatureStore instance, to run
+                             runRollingBacktest off the precomputed feature matrix (columnar TQS
+                             scoring and FillSimulator fills) instead of the Engine: thresholds are
+                             tuned by a sweep, and test windows are scored and filled the same way,
+                             so a window is judged by the objective its threshold was picked on
+        """
         self.symbol = symbol
         self.startDate = pd.to_datetime(startDate)
         self.endDate = pd.to_datetime(endDate)
         self.config = config
         self.trainWindow = pd.DateOffset(months=trainWindowMonths)
         self.testWindow = pd.DateOffset(months=testWindowMonths)
+        # Every test window's trades are stored under this one run ID
+        self.runId = newRunId()
+        self.cache = ResultCache() if cache is True else (None if cache is False else cache)
+        self.featureStore = FeatureStore() if featureStore is True else (featureStore or None)
+        self._features = None
 
         # Load data on init
         self.priceData = None
@@ -26,20 +105,22 @@ class RollingBacktester:
 
     def _load_data(self):
         log.info(f"Loading price data for {self.symbol} from {self.startDate.date()} to {self.endDate.date()}")
-        priceScraper = PriceScraper(self.symbol)
-        self.priceData = priceScraper.getHistoricalData(
+        priceCache = PriceCache(self.symbol)
+        self.priceInterval = priceCache.interval
+        self.priceData = priceCache.getHistoricalData(
             self.startDate.strftime("%Y-%m-%d"),
             self.endDate.strftime("%Y-%m-%d")
         )
 
         if self.config.useSentiment:
             log.info(f"Loading news and sentiment data for {self.symbol}...")
+            from Scrapers.NewsScraper import NewsScraper
             newsScraper = NewsScraper(self.config.newsApiKey, query=self.symbol)
             newsData = newsScraper.scrapeNews(
                 self.startDate.strftime("%Y-%m-%d"),
                 self.endDate.strftime("%Y-%m-%d")
             )
-            self.sentimentData = analyzeSentiment(newsData)
+            self.sentimentData = SentimentScorer().scoreNews(newsData)
         else:
             log.warning("Sentiment disabled; skipping sentiment data load.")
 
@@ -59,8 +140,75 @@ class RollingBacktester:
             yield trainStart, trainEnd, testStart, testEnd
             trainStart += self.testWindow
 
+    def _sliceData(self, start, end):
+        """Preloaded price/sentiment rows with start <= datetime < end (no refetch)."""
+        priceDates = self.priceData["datetime"]
+        priceData = self.priceData[(priceDates >= start) & (priceDates < end)]
+
+        sentimentData = None
+        if self.sentimentData is not None:
+            sentimentDates = self.sentimentData["datetime"]
+            sentimentData = self.sentimentData[(sentimentDates >= start) & (sentimentDates < end)]
+        return priceData, sentimentData
+
+    def _runWindow(self, start, end, writeTrades=False):
+        if self.featureStore is not None:
+            return self._simulateWindow(start, end, writeTrades)
+
+        from Backtester.BacktestEngine import Engine
+        priceData, sentimentData = self._sliceData(start, end)
+        engine = Engine(self.config, cache=self.cache)
+        return engine.runBacktest(
+            self.symbol,
+            start.strftime("%Y-%m-%d"),
+            end.strftime("%Y-%m-%d"),
+            priceData=priceData,
+            sentimentData=sentimentData,
+            writeTrades=writeTrades,
+            runId=self.runId
+        )
+
+    def _featureSweepInputs(self):
+        """Feature matrix and fill simulator over all preloaded bars, built on first use."""
+        if self._features is None:
+            bars = self.priceData.sort_values("datetime").reset_index(drop=True)
+            bars = bars.assign(timestamp=toUtcNaive(bars["datetime"]))
+            matrix = self.featureStore.load(bars, self.symbol, self.priceInterval)
+            self._features = (matrix, FillSimulator(bars))
+        return self._features
+
+    def _staticInputs(self):
+        """Evaluator inputs the feature matrix doesn't hold: the config's where it sets them, else the sweep defaults."""
+        return {name: getattr(self.config, name, default) for name, default in STATIC_DEFAULTS.items()}
+
+    def _simulateWindow(self, start, end, writeTrades=False):
+        """
+        _runWindow over the feature store: signals at config.tqsThreshold filled by the simulator
+        _sweepTqsThreshold tunes with, from the same static inputs. Returns the Engine.runBacktest
+        result keys.
+        """
+        matrix, simulator = self._featureSweepInputs()
+        threshold = self.config.tqsThreshold
+        signals = matrix.signals(np.inf if threshold is None else threshold, self._staticInputs(),
+                                 bars=matrix.barRange(start, end))
+        tradeLog, finalBalance, winRate, ev = summarize(simulator.simulate(signals))
+
+        runId = None
+        if writeTrades:
+            params = dict(configParams(self.config), startDate=start.strftime("%Y-%m-%d"), endDate=end.strftime("%Y-%m-%d"))
+            runId = ResultsStore().writeTrades(tradeLog, self.symbol, params, runId=self.runId)
+        return {
+            "finalBalance": finalBalance,
+            "winRate": winRate,
+            "expectedValue": ev,
+            "monteCarlo": MonteCarlo.run(tradeLog),
+            "runId": runId,
+        }
+
     def _tuneTqsThreshold(self, trainStart, trainEnd):
         log.info(f"Tuning TQS threshold on training window {trainStart.date()} to {trainEnd.date()}")
+        if self.featureStore is not None:
+            return self._sweepTqsThreshold(trainStart, trainEnd)
 
         bestThreshold = None
         bestWinRate = 0
@@ -69,14 +217,7 @@ class RollingBacktester:
 
         for t in thresholds:
             self.config.tqsThreshold = t
-
-            from Backtester.BacktestEngine import Engine
-            engine = Engine(self.config)
-            result = engine.runBacktest(
-                self.symbol,
-                trainStart.strftime("%Y-%m-%d"),
-                trainEnd.strftime("%Y-%m-%d")
-            )
+            result = self._runWindow(trainStart, trainEnd)
 
             if result["winRate"] > bestWinRate:
                 bestWinRate = result["winRate"]
@@ -85,35 +226,132 @@ class RollingBacktester:
         log.info(f"Best TQS threshold found: {bestThreshold} with win rate {bestWinRate:.2%}")
         return bestThreshold
 
+    def _sweepTqsThreshold(self, trainStart, trainEnd):
+        """_tuneTqsThreshold over the feature store: every candidate re-runs only scoring, selection and fills."""
+        matrix, simulator = self._featureSweepInputs()
+        thresholds = DEFAULT_PARAM_GRID["tqsThreshold"]
+        grid = dict({name: [value] for name, value in self._staticInputs().items()}, threshold=thresholds)
+        results = sweep(matrix, grid, simulator, start=trainStart, end=trainEnd)
+
+        # First threshold with the highest positive win rate, as the Engine loop picks it
+        best = results[results["winRate"] > 0]
+        if best.empty:
+            log.info("Best TQS threshold found: None with win rate 0.00%")
+            return None
+        best = best.loc[best["winRate"].idxmax()]
+        log.info(f"Best TQS threshold found: {best['threshold']} with win rate {best['winRate']:.2%}")
+        return best["threshold"]
+
+    @staticmethod
+    def _record(trainStart, trainEnd, testStart, testEnd, tqsThreshold, result):
+        """One records row; result None marks a skipped window (no test run, NaN stats)."""
+        skipped = result is None
+        monteCarlo = (np.nan, np.nan, np.nan) if skipped else result["monteCarlo"]
+        return {
+            "TrainStart": trainStart.date(),
+            "TrainEnd": trainEnd.date(),
+            "TestStart": testStart.date(),
+            "TestEnd": testEnd.date(),
+            "TqsThreshold": tqsThreshold,
+            "Skipped": skipped,
+            "FinalBalance": np.nan if skipped else result["finalBalance"],
+            "WinRate": np.nan if skipped else result["winRate"],
+            "ExpectedValue": np.nan if skipped else result["expectedValue"],
+            "MonteCarloP5": monteCarlo[0],
+            "MonteCarloP50": monteCarlo[1],
+            "MonteCarloP95": monteCarlo[2]
+        }
+
     def runRollingBacktest(self):
+        """
+        Tune on each training window, then backtest its test window at the tuned threshold. A window
+        where no threshold has a positive win rate is recorded as skipped, with TqsThreshold None.
+        """
         records = []
 
         for trainStart, trainEnd, testStart, testEnd in self._generateWindows():
             bestThreshold = self._tuneTqsThreshold(trainStart, trainEnd)
+            if bestThreshold is None:
+                log.info(f"No TQS threshold won on {trainStart.date()} to {trainEnd.date()}; skipping test window {testStart.date()}")
+                records.append(self._record(trainStart, trainEnd, testStart, testEnd, None, None))
+                continue
             self.config.tqsThreshold = bestThreshold
 
             log.info(f"Backtesting on test window {testStart.date()} to {testEnd.date()} with TQS threshold {bestThreshold}")
 
-            from Backtester.BacktestEngine import Engine
-            engine = Engine(self.config)
-            result = engine.runBacktest(
-                self.symbol,
-                testStart.strftime("%Y-%m-%d"),
-                testEnd.strftime("%Y-%m-%d")
-            )
+            result = self._runWindow(testStart, testEnd, writeTrades=True)
+            records.append(self._record(trainStart, trainEnd, testStart, testEnd, bestThreshold, result))
+
+        return pd.DataFrame(records)
+
+    def runWalkForward(self, paramGrid=None, maxWorkers=None):
+        """
+        Parallel walk-forward: every (window, parameter combination) training job runs on a
+        ProcessPoolExecutor, then each window's best combination (by win rate) is run on its test window.
+        A window where no combination has a positive win rate is skipped, as in runRollingBacktest.
+        Workers read the preloaded data from shared memory instead of refetching or unpickling it.
+
+        :param paramGrid: dict of config attribute -> candidate values; defaults to the tqsThreshold sweep
+        :param maxWorkers: pool size (defaults to the CPU count)
+        :return: the runRollingBacktest records DataFrame, plus one column per extra grid parameter
+        """
+        paramGrid = paramGrid or DEFAULT_PARAM_GRID
+        names = list(paramGrid)
+        combos = [dict(zip(names, values)) for values in itertools.product(*paramGrid.values())]
+        windows = list(self._generateWindows())
+        if not windows:
+            return pd.DataFrame()
+
+        priceFrame = SharedFrame.publish(self.priceData.sort_values("datetime"))
+        sentimentFrame = None
+        if self.sentimentData is not None:
+            sentimentFrame = SharedFrame.publish(self.sentimentData.sort_values("datetime"))
+        sentimentSpec = sentimentFrame.spec if sentimentFrame else None
+        cachePath = self.cache.cachePath if self.cache is not None else None
+
+        try:
+            with ProcessPoolExecutor(max_workers=maxWorkers) as pool:
+                log.info(f"Walk-forward: {len(windows)} windows x {len(combos)} parameter sets")
+                trainJobs = {
+                    (w, c): pool.submit(
+                        _runWindowJob, self.symbol, _configSnapshot(self.config, combo),
+                        priceFrame.spec, sentimentSpec, trainStart, trainEnd, False, None, cachePath
+                    )
+                    for w, (trainStart, trainEnd, _, _) in enumerate(windows)
+                    for c, combo in enumerate(combos)
+                }
+
+                bestCombos = []
+                for w, (trainStart, trainEnd, _, _) in enumerate(windows):
+                    bestCombo, bestWinRate = None, 0
+                    for c, combo in enumerate(combos):
+                        winRate = trainJobs[(w, c)].result()["winRate"]
+                        if winRate > bestWinRate:
+                            bestCombo, bestWinRate = combo, winRate
+                    log.info(f"Best parameters for {trainStart.date()} to {trainEnd.date()}: {bestCombo} with win rate {bestWinRate:.2%}")
+                    bestCombos.append(bestCombo)
+
+                testJobs = [
+                    pool.submit(
+                        _runWindowJob, self.symbol, _configSnapshot(self.config, combo),
+                        priceFrame.spec, sentimentSpec, testStart, testEnd, True, self.runId, cachePath
+                    ) if combo is not None else None
+                    for (_, _, testStart, testEnd), combo in zip(windows, bestCombos)
+                ]
 
-            records.append({
-                "TrainStart": trainStart.date(),
-                "TrainEnd": trainEnd.date(),
-                "TestStart": testStart.date(),
-                "TestEnd": testEnd.date(),
-                "TqsThreshold": bestThreshold,
-                "FinalBalance": result["finalBalance"],
-                "WinRate": result["winRate"],
-                "ExpectedValue": result["expectedValue"],
-                "MonteCarloP5": result["monteCarlo"][0],
-                "MonteCarloP50": result["monteCarlo"][1],
-                "MonteCarloP95": result["monteCarlo"][2]
-            })
+                records = []
+                for (trainStart, trainEnd, testStart, testEnd), combo, job in zip(windows, bestCombos, testJobs):
+                    if combo is None:
+                        log.info(f"No parameters won on {trainStart.date()} to {trainEnd.date()}; skipping test window {testStart.date()}")
+                        record = self._record(trainStart, trainEnd, testStart, testEnd, None, None)
+                        record.update({name: None for name in names if name != "tqsThreshold"})
+                    else:
+                        record = self._record(trainStart, trainEnd, testStart, testEnd, combo.get("tqsThreshold"), job.result())
+                        record.update({name: value for name, value in combo.items() if name != "tqsThreshold"})
+                    records.append(record)
+        finally:
+            priceFrame.close()
+            if sentimentFrame:
+                sentimentFrame.close()
 
         return pd.DataFrame(records)
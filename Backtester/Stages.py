@@ -0,0 +1,31 @@
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+from utils.Instrumentation import metrics
+
+_timingsLock = threading.Lock()
+
+
+@contextmanager
+def timed(timings, stage):
+    """Add the wall-clock seconds spent in the block to timings[stage] (and the metrics registry)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _timingsLock:
+            timings[stage] = timings.get(stage, 0.0) + elapsed
+        metrics.observe(f"engine.{stage}Seconds", elapsed)
+
+
+def dateChunks(startDate, endDate, chunkDays):
+    """Split [startDate, endDate) into consecutive 'YYYY-MM-DD' ranges of at most chunkDays."""
+    edges = pd.date_range(startDate, endDate, freq=f"{chunkDays}D").strftime("%Y-%m-%d").tolist()
+    end = pd.Timestamp(endDate).strftime("%Y-%m-%d")
+    if not edges or edges[-1] != end:
+        edges.append(end)
+    return list(zip(edges[:-1], edges[1:])) or [(edges[0], end)]
@@ -1,9 +1,8 @@
 import logging
 from datetime import datetime, timedelta
-from Scrapers.PriceScraper import PriceScraper
+from data.PriceCache import PriceCache
 from Strategy.Scanner import Scanner
 from config.config import Config
-from utils.DataCleaner import clean_ohlcv
 
 # ===== Logging setup =====
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -16,18 +15,14 @@ start_date = end_date - timedelta(days=30)
 
 log.info(f"Testing Quick mode for {symbol} from {start_date} to {end_date}...")
 
-# ===== Step 1: Get historical price data =====
-scraper = PriceScraper(symbol)
-price_data = scraper.getHistoricalData(start_date, end_date)
+# ===== Step 1 & 2: Get cleaned historical price data (cached locally, only new bars are downloaded) =====
+cleaned_data = PriceCache(symbol).getHistoricalData(start_date, end_date)
 
-if price_data.empty:
+if cleaned_data.empty:
     log.error("❌ PriceScraper returned no data. Check your internet connection or symbol.")
     exit()
 else:
-    log.info(f"Retrieved {len(price_data)} rows of raw price data.")
-
-# ===== Step 2: Clean OHLCV data before using it anywhere =====
-cleaned_data = clean_ohlcv(price_data, source_name="QuickModeTest")
+    log.info(f"Retrieved {len(cleaned_data)} rows of cleaned price data.")
 
 # ===== Step 3: Run through Scanner indicators =====
 scanner = Scanner(Config)
@@ -0,0 +1,181 @@
+# Tests/AsyncMarketDataTest.py
+
+import asyncio
+import json
+import threading
+import time
+import urllib.request
+
+import websockets
+
+from data.AsyncMarketData import AsyncMarketDataClient
+from live.LiveSignalRunner import LiveSignalRunner
+from strategies.DonchianZones import StreamingDonchianZones
+from utils.Instrumentation import metrics
+
+SYMBOLS = ["MES", "MNQ", "M2K", "MYM"]
+TICKS_PER_SYMBOL = 200
+
+
+class RecordingRunner:
+    """Stands in for LiveSignalRunner: records ingested and scored ticks, scoring slowly."""
+
+    def __init__(self, scoreSeconds=0.0, failOn=None):
+        self.ingested = []
+        self.scoredTicks = []
+        self.scoreThreads = set()
+        self.scoreSeconds = scoreSeconds
+        self.failOn = failOn
+
+    def ingestTick(self, tick):
+        self.ingested.append(tick["last"])
+        return True
+
+    def scoreTick(self, tick):
+        self.scoreThreads.add(threading.get_ident())
+        time.sleep(self.scoreSeconds)
+        if tick["last"] == self.failOn:
+            raise ValueError("scoring failed")
+        self.scoredTicks.append(tick["last"])
+
+
+class ListSink:
+    def write(self, *row, symbol=None):
+        pass
+
+
+class MetricsProbe(LiveSignalRunner):
+    """A real runner that reads the client's metrics endpoint once it has scored its last tick."""
+
+    client = None
+    payload = None
+
+    def scoreTick(self, tick, timestamp=None):
+        super().scoreTick(tick, timestamp)
+        if tick["last"] == TICKS_PER_SYMBOL - 1:
+            url = f"http://127.0.0.1:{self.client.metricsServer.port}/metrics.json"
+            self.payload = json.loads(urllib.request.urlopen(url).read())
+
+
+class CheckedDonchian(StreamingDonchianZones):
+    """Slow reads that notice the zones being updated underneath them."""
+
+    def __init__(self):
+        super().__init__()
+        self.updates = 0
+        self.tornReads = 0
+
+    def update(self, bar):
+        self.updates += 1
+        super().update(bar)
+
+    def getRange(self, period=20):
+        before = self.updates
+        time.sleep(0.002)
+        result = super().getRange(period)
+        if self.updates != before:
+            self.tornReads += 1
+        return result
+
+
+async def runAgainstStandIn(runners, metricsPort=None, tickInterval=0.0):
+    """Serve quotes for every symbol over one local websocket and run the client against it."""
+    connections = []
+    received = []
+
+    async def handler(ws):
+        connections.append(ws)
+        for _ in range(1 + len(SYMBOLS)):
+            received.append(json.loads(await ws.recv()))
+        for i in range(TICKS_PER_SYMBOL):
+            for symbol in SYMBOLS:
+                await ws.send(json.dumps({"e": "quote", "d": {"symbol": symbol, "last": float(i)}}))
+            if tickInterval:
+                await asyncio.sleep(tickInterval)
+        await ws.send(json.dumps({"e": "quote", "d": {"symbol": "UNSUBSCRIBED", "last": 1.0}}))
+        await ws.close()
+
+    async with websockets.serve(handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        client = AsyncMarketDataClient("token", wsUrl=f"ws://127.0.0.1:{port}", metricsPort=metricsPort)
+        for symbol in SYMBOLS:
+            client.addSymbol(symbol, runners[symbol])
+            runners[symbol].client = client
+        await asyncio.wait_for(client.run(), timeout=30)
+
+    return client, connections, received
+
+
+def test_multiplexes_symbols_over_one_connection():
+    runners = {symbol: RecordingRunner() for symbol in SYMBOLS}
+    client, connections, received = asyncio.run(runAgainstStandIn(runners))
+
+    assert len(connections) == 1
+    assert received[0] == {"e": "authorize", "d": {"token": "token"}}
+    assert [m["d"]["symbol"] for m in received[1:]] == SYMBOLS
+
+    expected = [float(i) for i in range(TICKS_PER_SYMBOL)]
+    for symbol, runner in runners.items():
+        assert runner.ingested == expected
+        assert runner.scoredTicks[-1] == expected[-1]
+        assert client.stats()[symbol]["received"] == TICKS_PER_SYMBOL
+
+
+def test_scoring_runs_off_the_event_loop_and_failures_dont_stop_shutdown():
+    runners = {symbol: RecordingRunner(scoreSeconds=0.001) for symbol in SYMBOLS}
+    # The last tick is scored while the client shuts down; its failure must not stop the other scorers
+    runners["MES"].failOn = TICKS_PER_SYMBOL - 1
+    client, _, _ = asyncio.run(runAgainstStandIn(runners))
+
+    for symbol, runner in runners.items():
+        assert threading.get_ident() not in runner.scoreThreads
+        assert client.stats()[symbol]["scored"] == len(runner.scoredTicks) + (symbol == "MES")
+        if symbol != "MES":
+            assert runner.scoredTicks[-1] == TICKS_PER_SYMBOL - 1
+    assert TICKS_PER_SYMBOL - 1 not in runners["MES"].scoredTicks
+
+
+def test_slow_scoring_coalesces_to_latest_tick():
+    runners = {symbol: RecordingRunner(scoreSeconds=0.005) for symbol in SYMBOLS}
+    client, _, _ = asyncio.run(runAgainstStandIn(runners))
+
+    for symbol, runner in runners.items():
+        stats = client.stats()[symbol]
+        # Every tick still reaches the bar state; scoring skips stale ticks but always ends on the latest
+        assert len(runner.ingested) == TICKS_PER_SYMBOL
+        assert stats["coalesced"] > 0
+        assert stats["scored"] + stats["coalesced"] == TICKS_PER_SYMBOL
+        assert runner.scoredTicks == sorted(runner.scoredTicks)
+        assert runner.scoredTicks[-1] == TICKS_PER_SYMBOL - 1
+
+
+def test_serves_tick_metrics_while_running():
+    inputs = {"ev": 1.0, "biasAligned": True, "vixInRange": False}
+    runners = {symbol: MetricsProbe(inputs, sink=ListSink(), symbol=symbol) for symbol in SYMBOLS}
+    metrics.reset()
+    try:
+        client, _, _ = asyncio.run(runAgainstStandIn(runners, metricsPort=0))
+    finally:
+        metrics.disable()
+        metrics.reset()
+
+    assert client.metricsServer is None
+    # Each probe read the endpoint after its own last tick, so it saw at least that symbol's ticks
+    for runner in runners.values():
+        assert runner.payload["counters"]["live.ticks"]["count"] >= TICKS_PER_SYMBOL
+        assert runner.payload["histograms"]["live.tickToSignalSeconds"]["count"] > 0
+
+
+def test_live_runner_state_is_not_changed_while_it_scores():
+    inputs = {"ev": 1.0, "biasAligned": True, "vixInRange": False}
+    runners = {symbol: LiveSignalRunner(inputs, sink=ListSink(), symbol=symbol) for symbol in SYMBOLS}
+    for runner in runners.values():
+        runner.donchian = CheckedDonchian()
+    # Ticks keep arriving while each slow read is in progress
+    client, _, _ = asyncio.run(runAgainstStandIn(runners, tickInterval=0.001))
+
+    for symbol, runner in runners.items():
+        # Scoring overlapped the socket reader (ticks were coalesced), yet never saw ingestion mid-read
+        assert client.stats()[symbol]["coalesced"] > 0
+        assert runner.donchian.updates == TICKS_PER_SYMBOL
+        assert runner.donchian.tornReads == 0
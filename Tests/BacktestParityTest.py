@@ -0,0 +1,89 @@
+# Tests/BacktestParityTest.py
+
+from datetime import datetime
+
+import pandas as pd
+
+from Backtester.BacktestRunner import BacktestEngine
+
+# Reason text from TqsCalculator -> columnar breakdown column
+REASON_COMPONENTS = {
+    "Liquidity sweep confirmed": "sweep",
+    "Potential sweep (unconfirmed)": "sweep",
+    "Breakout above Donchian high": "donchian",
+    "Breakdown below Donchian low": "donchian",
+    "Expected value > 0": "ev",
+    "RVOL >= 1.5": "rvol",
+    "MACD aligned": "macd",
+    "RSI aligned": "rsi",
+    "Directional bias aligned": "bias",
+    "Correct VIX regime": "vix",
+}
+
+ANCHOR = datetime(2024, 3, 5, 23, 0)
+EVALUATOR_INPUTS = {
+    "ev": 0.4,
+    "rvol": 1.6,
+    "macdAligned": True,
+    "rsiAligned": False,
+    "biasAligned": True,
+    "vixInRange": False,
+}
+
+
+def loopToFrame(results):
+    rows = []
+    for result in results:
+        row = {name: 0.0 for name in set(REASON_COMPONENTS.values())}
+        for points, reason in result["breakdown"]:
+            row[REASON_COMPONENTS[reason]] = points
+        row["timestamp"] = result["timestamp"]
+        row["score"] = result["score"]
+        row["priceUsed"] = result["priceUsed"]
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def test_columnar_matches_loop(makeBars):
+    bars = makeBars(start="2024-03-04 16:00", tickSize=0.25)
+    for zone in ["londonLow", "londonHigh", "nyLow", "asianHigh"]:
+        loop = BacktestEngine(bars, EVALUATOR_INPUTS, sweepZone=zone, sessionAnchor=ANCHOR).run()
+        columnar = BacktestEngine(bars, EVALUATOR_INPUTS, mode="columnar", sweepZone=zone, sessionAnchor=ANCHOR).run()
+
+        expected = loopToFrame(loop)
+        assert len(columnar) == len(expected)
+        pd.testing.assert_frame_equal(
+            columnar[expected.columns].reset_index(drop=True),
+            expected,
+            check_dtype=False
+        )
+
+
+def test_columnar_matches_loop_bar_anchored(makeBars):
+    bars = makeBars(start="2024-03-04 16:00", tickSize=0.25)
+    for zone in ["londonLow", "nyHigh", "weeklyLow"]:
+        loop = BacktestEngine(bars, EVALUATOR_INPUTS, sweepZone=zone).run()
+        columnar = BacktestEngine(bars, EVALUATOR_INPUTS, mode="columnar", sweepZone=zone).run()
+
+        expected = loopToFrame(loop)
+        pd.testing.assert_frame_equal(
+            columnar[expected.columns].reset_index(drop=True),
+            expected,
+            check_dtype=False
+        )
+
+
+def test_parity_covers_sweeps(makeBars):
+    bars = makeBars(start="2024-03-04 16:00", tickSize=0.25)
+    columnar = BacktestEngine(bars, EVALUATOR_INPUTS, mode="columnar", sweepZone="londonLow", sessionAnchor=ANCHOR).run()
+    assert (columnar["sweep"] > 0).any()
+
+
+def test_parity_covers_per_bar_indicators(makeBars):
+    bars = makeBars(start="2024-03-04 16:00", tickSize=0.25)
+    columnar = BacktestEngine(bars, EVALUATOR_INPUTS, mode="columnar", sweepZone="londonLow").run()
+    for component in ["rvol", "macd", "rsi"]:
+        assert 0 < (columnar[component] > 0).sum() < len(columnar)
+
+    static = BacktestEngine(bars, EVALUATOR_INPUTS, mode="columnar", sweepZone="londonLow", useIndicators=False).run()
+    assert (static["rvol"] == 1.0).all() and (static["rsi"] == 0.0).all()
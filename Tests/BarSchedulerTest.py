@@ -0,0 +1,174 @@
+# Tests/BarSchedulerTest.py
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from live.BarScheduler import BarCloseScheduler, IncrementalBarFeed
+from live.MarketHours import CST, is_market_open, is_trading_day
+from strategies.Indicators import StreamingIndicators
+
+UTC = pytz.utc
+
+
+def cst(*args):
+    return CST.localize(datetime(*args))
+
+
+class FakeClock:
+    """Injectable clock: sleep() advances time instantly and records the wake-ups."""
+
+    def __init__(self, start):
+        self.current = start
+        self.wakeUps = []
+
+    def now(self):
+        return self.current
+
+    def sleep(self, seconds):
+        self.current += timedelta(seconds=seconds)
+        self.wakeUps.append(self.current)
+
+
+def test_next_bar_close_follows_exchange_calendar():
+    scheduler = BarCloseScheduler(lambda barClose: None)
+
+    assert scheduler.nextBarClose(cst(2024, 3, 5, 9, 10)) == cst(2024, 3, 5, 9, 30)
+    assert scheduler.nextBarClose(cst(2024, 3, 5, 9, 30)) == cst(2024, 3, 5, 10, 0)
+    assert scheduler.nextBarClose(cst(2024, 3, 5, 6, 0)) == cst(2024, 3, 5, 9, 0)
+    # After the close: next trading day; Friday evening skips the weekend
+    assert scheduler.nextBarClose(cst(2024, 3, 5, 17, 0)) == cst(2024, 3, 6, 9, 0)
+    assert scheduler.nextBarClose(cst(2024, 3, 8, 18, 0)) == cst(2024, 3, 11, 9, 0)
+    # Independence Day and Thanksgiving are skipped
+    assert scheduler.nextBarClose(cst(2024, 7, 3, 17, 30)) == cst(2024, 7, 5, 9, 0)
+    assert scheduler.nextBarClose(cst(2024, 11, 27, 17, 30)) == cst(2024, 11, 29, 9, 0)
+    assert not is_market_open(cst(2024, 12, 25, 10, 0))
+    # New Year's Day on a Saturday isn't observed on the Friday before; on a Sunday it moves to Monday
+    assert is_trading_day(datetime(2021, 12, 31).date()) and is_trading_day(datetime(2027, 12, 31).date())
+    assert scheduler.nextBarClose(cst(2021, 12, 30, 17, 30)) == cst(2021, 12, 31, 9, 0)
+    assert not is_trading_day(datetime(2023, 1, 2).date())
+
+    # DST: the first bar closes at 9:00 exchange time on both sides of the switch
+    assert scheduler.nextBarClose(cst(2024, 3, 8, 6, 0)).astimezone(UTC).hour == 15
+    assert scheduler.nextBarClose(cst(2024, 3, 11, 6, 0)).astimezone(UTC).hour == 14
+
+
+def test_wakes_on_exact_boundaries_across_sessions():
+    clock = FakeClock(cst(2024, 3, 8, 15, 50).astimezone(UTC))
+    fired = []
+    scheduler = BarCloseScheduler(fired.append, clock=clock, settleSeconds=5)
+    scheduler.run(maxCycles=5)
+
+    assert fired == [
+        cst(2024, 3, 8, 16, 0), cst(2024, 3, 8, 16, 30), cst(2024, 3, 8, 17, 0),
+        cst(2024, 3, 11, 9, 0), cst(2024, 3, 11, 9, 30),
+    ]
+    assert clock.wakeUps == [barClose + timedelta(seconds=5) for barClose in fired]
+
+
+def test_late_cycle_skips_to_latest_bar_without_refiring():
+    clock = FakeClock(cst(2024, 3, 5, 9, 50).astimezone(UTC))
+    fired = []
+
+    def slowCycle(barClose):
+        fired.append(barClose)
+        if len(fired) == 1:
+            clock.current += timedelta(minutes=65)
+
+    BarCloseScheduler(slowCycle, clock=clock).run(maxCycles=3)
+    assert fired == [cst(2024, 3, 5, 10, 0), cst(2024, 3, 5, 11, 0), cst(2024, 3, 5, 11, 30)]
+
+
+class FakePriceCache:
+    """
+    Cleaned 30m bars for [start, end) that exist up to the clock's current time. Bars that closed
+    less than formingSeconds ago come back half-formed (lower close and high, less volume).
+    """
+
+    def __init__(self, clock, formingSeconds=0):
+        self.clock = clock
+        self.formingSeconds = formingSeconds
+        self.calls = []
+        self.latestCalls = []
+
+    def _bars(self, start, end):
+        times = pd.date_range(start, end, freq="30min", inclusive="left", tz="UTC")
+        closes = times + pd.Timedelta(minutes=30)
+        times = times[closes <= self.clock.now()]
+        close = 5000 + (times.asi8 // 1_800_000_000_000 % 97) * 0.25
+        forming = (self.clock.now() - closes[:len(times)]).total_seconds() < self.formingSeconds
+        close = np.where(forming, close - 0.5, close)
+        return pd.DataFrame({
+            "datetime": times, "open": close, "high": close + np.where(forming, 0.25, 1.0), "low": close - 1,
+            "close": close, "volume": np.where(forming, 40.0, 100.0)
+        })
+
+    def getHistoricalData(self, start, end):
+        self.calls.append((start, end))
+        return self._bars(start, end)
+
+    def getLatestBars(self, start, end):
+        self.latestCalls.append((start, end))
+        return self._bars(start, end)
+
+
+class RecordingRunner:
+    def __init__(self):
+        self.bars = []
+        self.closes = []
+        self.indicators = StreamingIndicators()
+
+    def onBar(self, bar, closedAt=None):
+        self.bars.append(bar["timestamp"])
+        self.closes.append(closedAt)
+        self.indicators.update(bar)
+
+
+def test_feed_scores_each_closed_bar_once():
+    clock = FakeClock(cst(2024, 3, 5, 9, 50).astimezone(UTC))
+    runner = RecordingRunner()
+    feed = IncrementalBarFeed(FakePriceCache(clock), runner, warmupDays=1)
+    counts = []
+    BarCloseScheduler(lambda barClose: counts.append(feed(barClose)), clock=clock).run(maxCycles=4)
+
+    assert counts[0] > 1  # warm-up history on the first cycle
+    assert counts[1:] == [1, 1, 1]
+    assert len(runner.bars) == len(set(runner.bars))
+    assert pd.Timestamp(runner.bars[-1]) == pd.Timestamp(cst(2024, 3, 5, 11, 0)).tz_convert("UTC")
+    assert runner.closes[-1] == pd.Timestamp(runner.bars[-1]) + pd.Timedelta(minutes=30)
+
+
+def test_feed_reads_cached_history_once_and_fetches_only_today():
+    clock = FakeClock(cst(2024, 3, 5, 9, 50).astimezone(UTC))
+    priceCache = FakePriceCache(clock)
+    feed = IncrementalBarFeed(priceCache, RecordingRunner(), warmupDays=2)
+    BarCloseScheduler(feed, clock=clock).run(maxCycles=4)
+
+    # Whole days once, at warm-up; the forming day is never written to the cache
+    assert priceCache.calls == [("2024-03-03", "2024-03-05")]
+    assert priceCache.latestCalls == [("2024-03-05", "2024-03-06")] * 4
+
+
+def test_half_formed_bar_is_revised_once_final():
+    clock = FakeClock(cst(2024, 3, 5, 9, 50).astimezone(UTC))
+    priceCache = FakePriceCache(clock, formingSeconds=60)
+    runner = RecordingRunner()
+    feed = IncrementalBarFeed(priceCache, runner, warmupDays=1)
+    counts = []
+    BarCloseScheduler(lambda barClose: counts.append(feed(barClose)), clock=clock).run(maxCycles=4)
+
+    # Every cycle sees its newest bar half-formed and revises the previous cycle's one
+    assert counts[1:] == [1, 1, 1] and feed.revisions == 3
+    revised = [timestamp for timestamp in set(runner.bars) if runner.bars.count(timestamp) == 2]
+    assert len(revised) == 3 and runner.bars[-2] != runner.bars[-1]
+
+    # The runner ends up where feeding each bar once, as it stands now, gets it
+    now = priceCache._bars("2024-03-04", "2024-03-06")
+    now = now[now["datetime"] >= pd.Timestamp(runner.bars[0])]
+    bars = [dict(row, timestamp=row["datetime"].isoformat()) for row in now.to_dict("records")]
+    assert [bar["timestamp"] for bar in bars] == list(dict.fromkeys(runner.bars))
+    direct = StreamingIndicators.fromBars(bars)
+    for name, value in direct.values.items():
+        np.testing.assert_equal(runner.indicators.values[name], value, err_msg=name)
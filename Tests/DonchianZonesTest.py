@@ -0,0 +1,48 @@
+# Tests/DonchianZonesTest.py
+
+import pytest
+
+from strategies.DonchianZones import DonchianZones, StreamingDonchianZones
+
+PERIODS = (5, 20, 55)
+
+
+def assertMatchesBatch(zones, bars):
+    reference = DonchianZones(bars)
+    for period in PERIODS:
+        assert zones.getRange(period) == reference.getRange(period), (len(bars), period)
+
+
+def test_streaming_matches_batch(makeBars):
+    # Whole ticks, so equal highs/lows (deque ties) are common
+    bars = makeBars(400, seed=21, tickSize=0.25).to_dict("records")
+    zones = StreamingDonchianZones(PERIODS)
+    for i, bar in enumerate(bars):
+        zones.update(bar)
+        assertMatchesBatch(zones, bars[:i + 1])
+    assert zones.getRanges() == {period: DonchianZones(bars).getRange(period) for period in PERIODS}
+
+
+def test_revisions_match_batch_over_the_revised_bars(makeBars):
+    bars = makeBars(300, seed=22, tickSize=0.25).to_dict("records")
+    zones = StreamingDonchianZones(PERIODS)
+    seen = []
+    for bar in bars:
+        # The forming bar widens, overshoots and is then corrected narrower (the _rebuild path)
+        revisions = [
+            dict(bar, high=bar["open"], low=bar["open"]),
+            dict(bar, high=bar["high"] + 1.0, low=bar["low"] - 1.0),
+            dict(bar, high=bar["high"] + 1.0),
+            bar,
+        ]
+        seen.append(None)
+        for revision in revisions:
+            zones.update(revision)
+            seen[-1] = revision
+            assertMatchesBatch(zones, seen)
+
+
+def test_untracked_period_is_rejected(makeBars):
+    zones = StreamingDonchianZones.fromBars(makeBars(30).to_dict("records"), periods=PERIODS)
+    with pytest.raises(ValueError):
+        zones.getRange(100)
@@ -0,0 +1,84 @@
+# Tests/FeatureStoreTest.py
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from Backtester.BacktestRunner import BacktestEngine
+from Backtester.FeatureStore import FeatureStore, sweep
+from Backtester.FillSimulator import FillSimulator
+from config import config
+
+EVALUATOR_INPUTS = {"ev": 0.2, "biasAligned": True, "vixInRange": False}
+
+
+def test_stored_features_score_like_the_columnar_runner(tmp_path, makeBars):
+    bars = makeBars(1200, freq="15min")
+    store = FeatureStore(str(tmp_path))
+    store.load(bars, "MES", "15m")
+    matrix = store.load(bars, "MES", "15m")  # second load opens the saved files
+
+    assert isinstance(matrix.columns["priceUsed"], np.memmap)
+    expected = BacktestEngine(bars, EVALUATOR_INPUTS, mode="columnar").run()
+    actual = matrix.scoreFrame(EVALUATOR_INPUTS)
+    pd.testing.assert_frame_equal(actual.drop(columns="timestamp"), expected.drop(columns="timestamp"))
+    assert list(actual["timestamp"]) == list(expected["timestamp"])
+
+
+
+def test_recently_used_keys_survive_and_old_ones_are_pruned(tmp_path, makeBars, monkeypatch):
+    builds = []
+    features = BacktestEngine.features
+    monkeypatch.setattr(BacktestEngine, "features", lambda self: builds.append(1) or features(self))
+    datasets = [makeBars(300, seed=seed, freq="15min") for seed in range(4)]
+    root = os.path.join(str(tmp_path), "MES_15m")
+
+    # Alternating datasets reuse their matrices
+    store = FeatureStore(str(tmp_path), maxKeys=3)
+    for bars in [datasets[0], datasets[1], datasets[0], datasets[1]]:
+        store.load(bars, "MES", "15m")
+    assert len(builds) == 2 and len(os.listdir(root)) == 2
+
+    # Over maxKeys, keys used within minAge still stay (another process may be opening them)
+    for bars in datasets[2:]:
+        store.load(bars, "MES", "15m")
+    assert len(os.listdir(root)) == 4
+
+    # Once they are old enough, the least recently used goes first; the key being loaded never does
+    os.utime(os.path.join(root, store.key(datasets[1], config.DEFAULT_SWEEP_ZONE), "meta.json"), (0, 0))
+    pruning = FeatureStore(str(tmp_path), maxKeys=3, minAge=0)
+    pruning.load(datasets[2], "MES", "15m")
+    assert sorted(os.listdir(root)) == sorted(store.key(bars, config.DEFAULT_SWEEP_ZONE) for bars in [datasets[0]] + datasets[2:])
+
+    FeatureStore(str(tmp_path), maxKeys=1, minAge=0).load(datasets[1], "MES", "15m")
+    assert os.listdir(root) == [store.key(datasets[1], config.DEFAULT_SWEEP_ZONE)] and len(builds) == 5
+
+
+def test_sweep_matches_selecting_and_filling_each_threshold(tmp_path, makeBars):
+    bars = makeBars(1200, freq="15min")
+    matrix = FeatureStore(str(tmp_path)).load(bars, "MES", "15m")
+    simulator = FillSimulator(bars, maxHoldBars=50)
+    thresholds = [2.0, 3.0, 3.25, 4.0, 5.0]
+
+    result = sweep(matrix, {"threshold": thresholds, "ev": [0.2], "biasAligned": [True, False]}, simulator)
+    assert len(result) == 10 and result["signals"].nunique() > 2
+
+    scored = BacktestEngine(bars, EVALUATOR_INPUTS, mode="columnar").run()
+    for threshold, row in zip(thresholds, result[result["biasAligned"]].itertuples()):
+        selected = scored[scored["score"] >= threshold]
+        assert row.signals == len(selected)
+        trades = simulator.simulate(matrix.signals(threshold, EVALUATOR_INPUTS), targetR=1.8)
+        assert row.trades == len(trades)
+        assert row.expectedValue == (trades["rMultiple"].mean() if len(trades) else 0.0)
+
+
+def test_sweep_limited_to_a_window(tmp_path, makeBars):
+    bars = makeBars(1200, freq="15min")
+    matrix = FeatureStore(str(tmp_path)).load(bars, "MES", "15m")
+    start, end = bars["datetime"].iloc[400], bars["datetime"].iloc[900]
+    assert matrix.barRange(start, end) == (400, 900)
+
+    result = sweep(matrix, {"threshold": [3.0], "ev": [0.2], "biasAligned": [True]}, start=start, end=end)
+    signals = matrix.signals(3.0, EVALUATOR_INPUTS)
+    assert result["signals"].iloc[0] == signals["barIndex"].between(400, 899).sum() > 0
@@ -0,0 +1,107 @@
+# Tests/FillSimulatorTest.py
+
+import numpy as np
+import pandas as pd
+
+from Backtester.FillSimulator import FillSimulator, FirstTouch, summarize
+from Backtester.MonteCarlo import MonteCarlo
+
+
+def referenceExits(bars, signalIdx, direction, stopPoints, targetR, maxHoldBars):
+    """Bar-by-bar loop: (exit bar, reason) with the stop winning same-bar ties."""
+    results = []
+    for i, d in zip(signalIdx, direction):
+        entryIdx = i + 1
+        entry = bars["open"][entryIdx]
+        stop, target = entry - d * stopPoints, entry + d * targetR * stopPoints
+        last = min(entryIdx + maxHoldBars, len(bars["open"])) - 1
+        outcome = (last, "time" if last < len(bars["open"]) - 1 else "end")
+        for j in range(entryIdx, last + 1):
+            hitStop = bars["low"][j] <= stop if d > 0 else bars["high"][j] >= stop
+            hitTarget = bars["high"][j] >= target if d > 0 else bars["low"][j] <= target
+            if hitStop or hitTarget:
+                outcome = (j, "stop" if hitStop else "target")
+                break
+        results.append(outcome)
+    return results
+
+
+def test_first_touch_matches_linear_scan():
+    rng = np.random.default_rng(1)
+    values = rng.normal(size=500)
+    touch = FirstTouch(values, "min")
+    start = rng.integers(0, 500, size=300)
+    limit = np.minimum(start + rng.integers(1, 200, size=300), 500)
+    level = rng.normal(-1, 0.5, size=300)
+
+    expected = [next((j for j in range(s, e) if values[j] <= lv), e) for s, e, lv in zip(start, limit, level)]
+    np.testing.assert_array_equal(touch.first(start, limit, level), expected)
+
+
+def test_exits_match_bar_by_bar_reference(makeBars):
+    bars = makeBars(2000, seed=5, start="2024-03-04 14:30", freq="5min", tz="UTC")
+    rng = np.random.default_rng(9)
+    signalIdx = np.sort(rng.choice(len(bars) - 1, size=400, replace=False))
+    direction = rng.choice([-1, 1], size=400)
+    signals = pd.DataFrame({"timestamp": bars["timestamp"].iloc[signalIdx].to_numpy(), "direction": direction})
+
+    simulator = FillSimulator(bars, slippageTicks=0, commissionPerSide=0, maxHoldBars=40)
+    trades = simulator.simulate(signals, stopPoints=4.0, targetR=1.5)
+
+    expected = referenceExits(bars.to_dict("list"), signalIdx, direction, 4.0, 1.5, 40)
+    entryIdx = signalIdx + 1
+    assert list(trades["barsHeld"]) == [j - e + 1 for (j, _), e in zip(expected, entryIdx)]
+    assert list(trades["exitReason"]) == [reason for _, reason in expected]
+
+    # Without costs a stop is -1R (or worse on a gap) and a target is +1.5R (or better on a gap)
+    assert (trades.loc[trades["exitReason"] == "stop", "rMultiple"] <= -1 + 1e-9).all()
+    assert (trades.loc[trades["exitReason"] == "target", "rMultiple"] >= 1.5 - 1e-9).all()
+
+
+def test_ambiguous_bar_resolved_from_lower_timeframe():
+    bars = pd.DataFrame({
+        "timestamp": ["2024-03-04 15:00", "2024-03-04 15:30", "2024-03-04 16:00"],
+        "open": [100.0, 100.0, 101.0],
+        "high": [100.5, 104.0, 101.5],
+        "low": [99.5, 97.0, 100.5],
+        "close": [100.0, 101.0, 101.0],
+    })
+    # Inside the wide bar price rallies to the target before dropping through the stop
+    minutes = pd.DataFrame({
+        "timestamp": pd.date_range("2024-03-04 15:30", periods=30, freq="1min").astype(str),
+        "open": 100.0, "high": 100.5, "low": 99.5, "close": 100.0,
+    })
+    minutes.loc[5, "high"] = 104.0
+    minutes.loc[20, "low"] = 97.0
+    signals = pd.DataFrame({"timestamp": ["2024-03-04 15:00"], "direction": [1]})
+
+    coarse = FillSimulator(bars, slippageTicks=0, commissionPerSide=0).simulate(signals, stopPoints=2.0, targetR=1.5)
+    assert coarse["exitReason"][0] == "stop" and not coarse["drilledDown"][0]
+
+    drilled = FillSimulator(bars, lowerTimeframe=minutes, slippageTicks=0, commissionPerSide=0)
+    trade = drilled.simulate(signals, stopPoints=2.0, targetR=1.5).iloc[0]
+    assert trade["exitReason"] == "target" and trade["drilledDown"]
+    assert trade["rMultiple"] == 1.5
+    assert trade["exitTime"] == pd.Timestamp("2024-03-04 15:35")
+
+
+def test_gap_through_stop_fills_at_open_with_costs():
+    bars = pd.DataFrame({
+        "timestamp": ["2024-03-04 15:00", "2024-03-04 15:30", "2024-03-04 16:00"],
+        "open": [100.0, 100.0, 95.0],
+        "high": [100.5, 100.5, 96.0],
+        "low": [99.5, 99.5, 94.0],
+        "close": [100.0, 100.0, 95.0],
+    })
+    signals = pd.DataFrame({"timestamp": ["2024-03-04 15:00"], "direction": [1]})
+    simulator = FillSimulator(bars, tickSize=0.25, pointValue=5.0, slippageTicks=1, commissionPerSide=1.0)
+    trade = simulator.simulate(signals, stopPoints=2.0).iloc[0]
+
+    assert trade["entryPrice"] == 100.25 and trade["exitPrice"] == 94.75
+    assert trade["pnl"] == (94.75 - 100.25) * 5.0 - 2.0
+    assert trade["rMultiple"] == trade["pnl"] / (2.0 * 5.0)
+
+    tradeLog, finalBalance, winRate, ev = summarize(pd.DataFrame([trade]), startBalance=5000, riskPerTrade=25)
+    assert winRate == 0.0 and finalBalance == 5000 + 25 * trade["rMultiple"]
+    # Monte Carlo sizes the trade by its own R multiple instead of a flat -1R
+    assert MonteCarlo.encodeRMultiples(tradeLog)[0] == trade["rMultiple"]
@@ -0,0 +1,139 @@
+# Tests/HttpClientTest.py
+
+import json
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+
+from data.HttpClient import HttpClient, TtlCache
+from data.MarketData import TradovateData
+from data.NewsData import NewsData
+
+
+class StubApi(BaseHTTPRequestHandler):
+    """Minimal Tradovate/Benzinga stand-in; counts requests per path and client connections."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        state = self.server.state
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        with state["lock"]:
+            state["calls"][url.path] = state["calls"].get(url.path, 0) + 1
+            state["clients"].add(self.client_address)
+            failures = state["failures"].get(url.path, 0)
+            if failures:
+                state["failures"][url.path] = failures - 1
+
+        if failures:
+            return self._send(429, {"error": "slow down"}, {"Retry-After": "0"})
+        if url.path == "/contracts":
+            return self._send(200, [{"symbol": "MESU4", "id": 11}, {"symbol": "MNQU4", "id": 22}])
+        if url.path.startswith("/md/history/"):
+            # One bar per day, both range ends inclusive so adjacent chunks overlap by a bar
+            days = pd.date_range(pd.Timestamp(query["startTimestamp"]).normalize(),
+                                 pd.Timestamp(query["endTimestamp"]), freq="D")
+            bars = [{"timestamp": d.strftime("%Y-%m-%dT%H:%M:%SZ"), "close": float(d.day)} for d in days]
+            return self._send(200, {"bars": bars} if state.get("wrapBars") else bars)
+        if url.path == "/news":
+            return self._send(200, [{"title": f"{query['symbols']} headline"}])
+        self._send(404, {"error": "not found"})
+
+
+@pytest.fixture
+def stubServer():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubApi)
+    server.state = {"lock": threading.Lock(), "calls": {}, "clients": set(), "failures": {}}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def makeTradovate(server, **kwargs):
+    data = TradovateData("client", "token", http=HttpClient(backoff=0), **kwargs)
+    data.baseUrl = f"http://127.0.0.1:{server.server_address[1]}"
+    return data
+
+
+def test_contract_ids_are_cached_and_connection_reused(stubServer):
+    data = makeTradovate(stubServer)
+    for _ in range(3):
+        data.getHistoricalData("MESU4", "Daily", "2024-08-01T00:00:00Z", "2024-08-03T00:00:00Z")
+    assert data.getContractId("MNQU4") == 22
+
+    calls = stubServer.state["calls"]
+    assert calls["/contracts"] == 1
+    assert calls["/md/history/11"] == 3
+    assert len(stubServer.state["clients"]) == 1
+
+    with pytest.raises(ValueError):
+        data.getContractId("UNKNOWN")
+
+
+def test_retries_rate_limited_requests(stubServer):
+    stubServer.state["failures"] = {"/contracts": 2}
+    data = makeTradovate(stubServer)
+    assert data.getContractId("MESU4") == 11
+    assert stubServer.state["calls"]["/contracts"] == 3
+
+
+def test_long_ranges_download_in_chunks_without_duplicates(stubServer):
+    data = makeTradovate(stubServer, historyChunk=timedelta(days=5))
+    bars = data.getHistoricalData("MESU4", "Daily", "2024-08-01T00:00:00Z", "2024-08-31T00:00:00Z")
+
+    stamps = [bar["timestamp"] for bar in bars]
+    expected = pd.date_range("2024-08-01", "2024-08-31", freq="D").strftime("%Y-%m-%dT%H:%M:%SZ").tolist()
+    assert stamps == expected
+    assert stubServer.state["calls"]["/md/history/11"] == 6
+
+
+@pytest.mark.parametrize("wrapped", [False, True])
+def test_one_chunk_and_many_return_the_same_bar_list(stubServer, wrapped):
+    stubServer.state["wrapBars"] = wrapped
+    data = makeTradovate(stubServer, historyChunk=timedelta(days=5))
+    single = data.getHistoricalData("MESU4", "Daily", "2024-08-01T00:00:00Z", "2024-08-05T00:00:00Z")
+    # Crosses the chunk boundary at 2024-08-06, which both chunks return
+    crossing = data.getHistoricalData("MESU4", "Daily", "2024-08-01T00:00:00Z", "2024-08-09T00:00:00Z")
+
+    assert stubServer.state["calls"]["/md/history/11"] == 3
+    assert isinstance(single, list) and crossing[:len(single)] == single
+    expected = pd.date_range("2024-08-01", "2024-08-09", freq="D").strftime("%Y-%m-%dT%H:%M:%SZ").tolist()
+    assert [bar["timestamp"] for bar in crossing] == expected
+
+
+def test_news_uses_shared_client(stubServer):
+    http = HttpClient(backoff=0)
+    news = NewsData("key", f"http://127.0.0.1:{stubServer.server_address[1]}/news", http=http)
+    assert news.getNews("MES")[0]["title"] == "MES headline"
+    assert news.getNews("MNQ")[0]["title"] == "MNQ headline"
+    assert len(stubServer.state["clients"]) == 1
+
+
+def test_ttl_cache_expires_entries():
+    now = [0.0]
+    cache = TtlCache(ttlSeconds=10, clock=lambda: now[0])
+    cache.set("MESU4", 11)
+    now[0] = 9.9
+    assert cache.get("MESU4") == 11
+    now[0] = 10.0
+    assert cache.get("MESU4") is None
@@ -0,0 +1,53 @@
+# Tests/IndicatorsTest.py
+
+import numpy as np
+
+from strategies.Indicators import StreamingIndicators, indicatorColumns, ema, rsi, rvol
+
+
+def test_streaming_matches_batch(makeBars):
+    bars = makeBars(600, seed=11, start="2024-03-04 09:30", step=1.5, wick=2.0)
+    batch = indicatorColumns(bars["high"], bars["low"], bars["close"], bars["volume"])
+
+    indicators = StreamingIndicators()
+    streamed = {name: [] for name in batch}
+    for bar in bars.to_dict("records"):
+        values = indicators.update(bar)
+        for name in streamed:
+            streamed[name].append(values[name])
+
+    for name, column in batch.items():
+        streamedColumn = np.asarray(streamed[name])
+        assert np.allclose(streamedColumn, column, rtol=1e-10, atol=1e-9, equal_nan=True), name
+
+
+def test_revising_the_current_bar_matches_feeding_it_once(makeBars):
+    bars = makeBars(120, seed=11, start="2024-03-04 09:30", step=1.5, wick=2.0).to_dict("records")
+    revised, direct = StreamingIndicators(), StreamingIndicators()
+    for bar in bars:
+        # Build each bar up tick by tick, as the live runner does
+        for fraction in (0.25, 0.5, 1.0):
+            partial = dict(bar, close=bar["low"] + fraction * (bar["close"] - bar["low"]), volume=bar["volume"] * fraction)
+            revised.update(partial)
+        direct.update(bar)
+        for name, value in direct.values.items():
+            np.testing.assert_equal(revised.values[name], value, err_msg=name)
+
+
+def test_batch_values_agree_with_reference_definitions(makeBars):
+    bars = makeBars(600, seed=11, start="2024-03-04 09:30", step=1.5, wick=2.0)
+    close = bars["close"]
+
+    np.testing.assert_allclose(ema(close, 12), close.ewm(span=12, adjust=False).mean(), rtol=1e-12)
+
+    change = close.diff().iloc[1:]
+    avgGain = change.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    avgLoss = (-change).clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    values = rsi(close)
+    assert np.isnan(values[0])
+    np.testing.assert_allclose(values[1:], 100 - 100 / (1 + avgGain / avgLoss), rtol=1e-10)
+
+    ratio = rvol(bars["volume"], period=20)
+    expected = bars["volume"] / bars["volume"].shift(1).rolling(20).mean()
+    assert np.isnan(ratio[:20]).all()
+    np.testing.assert_allclose(ratio[20:], expected.iloc[20:], rtol=1e-12)
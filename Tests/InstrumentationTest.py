@@ -0,0 +1,104 @@
+# Tests/InstrumentationTest.py
+
+import json
+import urllib.request
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from live.LiveSignalRunner import LiveSignalRunner
+from utils.Instrumentation import Metrics, MetricsServer, metrics
+
+
+class ListSink:
+    def __init__(self):
+        self.rows = []
+
+    def write(self, *row, symbol=None):
+        self.rows.append(row)
+
+
+def test_disabled_registry_records_nothing():
+    registry = Metrics()
+    registry.count("ticks")
+    registry.observe("latency", 1.0)
+    with registry.timer("stage"):
+        pass
+    assert registry.timer("stage") is registry.timer("other")
+    assert registry.summary() == {"counters": {}, "histograms": {}}
+
+
+def test_counters_and_histogram_percentiles():
+    registry = Metrics().enable()
+    for value in np.arange(1, 101):
+        registry.observe("latency", float(value))
+    registry.count("ticks", 250)
+    with registry.timer("stage"):
+        pass
+
+    summary = registry.summary()
+    latency = summary["histograms"]["latency"]
+    assert latency["count"] == 100 and latency["min"] == 1.0 and latency["max"] == 100.0
+    assert latency["p50"] == np.percentile(np.arange(1, 101), 50)
+    assert latency["p99"] == np.percentile(np.arange(1, 101), 99)
+    assert summary["counters"]["ticks"]["count"] == 250
+    assert summary["counters"]["ticks"]["perSecond"] > 0
+    assert summary["histograms"]["stage"]["count"] == 1
+
+
+def test_endpoint_serves_json_and_prometheus_text():
+    registry = Metrics().enable()
+    registry.count("live.ticks", 3)
+    registry.observe("live.tickToSignalSeconds", 0.002)
+    server = MetricsServer(registry, port=0).start()
+    try:
+        base = f"http://127.0.0.1:{server.port}"
+        payload = json.loads(urllib.request.urlopen(f"{base}/metrics.json").read())
+        text = urllib.request.urlopen(f"{base}/metrics").read().decode()
+    finally:
+        server.stop()
+
+    assert payload["counters"]["live.ticks"]["count"] == 3
+    assert "hfl_live_ticks_total 3" in text
+    assert 'hfl_live_tickToSignalSeconds{quantile="0.99"} 0.002' in text
+
+
+def test_live_runner_reports_tick_to_signal_latency():
+    inputs = {"ev": 1.0, "biasAligned": True, "vixInRange": False}
+    metrics.reset()
+    metrics.enable()
+    try:
+        runner = LiveSignalRunner(inputs, sink=ListSink(), symbol="MES")
+        for i in range(40):
+            runner.onTick({"last": 5000 + 0.25 * i, "bid": 4999.75 + 0.25 * i, "ask": 5000 + 0.25 * i})
+        summary = metrics.summary()
+    finally:
+        metrics.disable()
+        metrics.reset()
+
+    assert summary["counters"]["live.ticks"]["count"] == 40
+    assert summary["counters"]["live.signals"]["count"] == 40
+    latency = summary["histograms"]["live.tickToSignalSeconds"]
+    assert latency["count"] == 40 and 0 < latency["p50"] <= latency["p99"]
+
+
+def test_live_runner_reports_bar_close_to_signal_latency(makeBars):
+    inputs = {"ev": 1.0, "biasAligned": True, "vixInRange": False}
+    bars = makeBars(60, freq="30min", tz="UTC")
+    metrics.reset()
+    metrics.enable()
+    try:
+        runner = LiveSignalRunner(inputs, sink=ListSink(), symbol="MES")
+        for bar in bars.to_dict("records"):
+            # A bar that closed a second ago, as the scheduler hands it over after its settle delay
+            runner.onBar(bar, closedAt=datetime.now(timezone.utc) - timedelta(seconds=1))
+        runner.onBar(bar)
+        summary = metrics.summary()
+    finally:
+        metrics.disable()
+        metrics.reset()
+
+    assert summary["counters"]["live.bars"]["count"] == 61
+    latency = summary["histograms"]["live.barCloseToSignalSeconds"]
+    assert latency["count"] == 60 and 1 <= latency["min"] <= latency["max"] < 10
+    assert "live.tickToSignalSeconds" not in summary["histograms"]
@@ -0,0 +1,59 @@
+# Tests/LiquidityZonesTest.py
+
+import numpy as np
+import pytest
+
+from strategies.LiquidityZones import SessionZoneIndex, WEEKLY_LOOKBACK_DAYS
+
+
+def test_retention_bounds_the_index_without_changing_zones(makeBars):
+    bars = makeBars(48 * 40, seed=5, start="2024-03-04", freq="30min", tz="UTC").to_dict("records")
+    retained = SessionZoneIndex(capacity=64, retainDays=WEEKLY_LOOKBACK_DAYS)
+    unbounded = SessionZoneIndex(capacity=64)
+    for i, bar in enumerate(bars):
+        if i % 7 == 0:
+            # A forming bar revised wider, then narrower, as ticks and late corrections arrive
+            for revision in (dict(bar, high=bar["high"] + 2, low=bar["low"] - 2), bar):
+                retained.update(revision)
+                unbounded.update(revision)
+        else:
+            retained.update(bar)
+            unbounded.update(bar)
+        assert retained.getZones() == unbounded.getZones()
+
+    assert len(unbounded) == len(bars)
+    # 40 days of bars streamed, but the arrays stop growing at a few weekly windows' worth
+    assert len(retained) < len(bars) // 4
+    assert len(retained.epochNs) <= 4 * 48 * WEEKLY_LOOKBACK_DAYS
+    np.testing.assert_array_equal(retained.zoneColumn("weeklyHigh"), unbounded.zoneColumn("weeklyHigh")[-len(retained):])
+
+
+def test_retention_shorter_than_the_weekly_lookback_is_rejected():
+    with pytest.raises(ValueError):
+        SessionZoneIndex(retainDays=WEEKLY_LOOKBACK_DAYS - 1)
+
+
+def test_sweep_checks_share_the_batch_signature(makeBars):
+    bars = makeBars(48 * 3, seed=6, start="2024-03-04", freq="30min", tz="UTC").to_dict("records")
+    index = SessionZoneIndex()
+    for bar in bars:
+        index.update(bar)
+    level = index.zoneLevel("londonLow")
+
+    # tickSize/toleranceTicks sit where LiquidityZones has them; barIndex only by keyword
+    price = level - 3 * 0.25
+    assert index.detectSweep(price, "londonLow", 0.25, 4) is True
+    assert index.detectSweep(price, "londonLow", 0.25, 2) is False
+    assert index.isSweepConfirmed(level + 1, "londonLow", barIndex=len(index) - 1) is True
+    with pytest.raises(TypeError):
+        index.isSweepConfirmed(level + 1, "londonLow", -1)
+
+
+def test_zone_level_rejects_out_of_range_bars(makeBars):
+    index = SessionZoneIndex()
+    for bar in makeBars(10, freq="30min", tz="UTC").to_dict("records"):
+        index.update(bar)
+    assert index.zoneLevel("weeklyHigh", -10) == index.zoneLevel("weeklyHigh", 0)
+    for barIndex in (10, -11):
+        with pytest.raises(IndexError):
+            index.zoneLevel("weeklyHigh", barIndex)
@@ -0,0 +1,105 @@
+# Tests/MonteCarloTest.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from Backtester.MonteCarlo import MonteCarlo
+
+START_BALANCE = 5000
+RISK_PER_TRADE = 25
+
+
+def tradeLog(numTrades=60, seed=3):
+    """Fixed-R outcomes mixed with FillSimulator-style trades that carry their own rMultiple."""
+    rng = np.random.default_rng(seed)
+    trades = []
+    for i, win in enumerate(rng.random(numTrades) < 0.45):
+        trade = {"outcome": "WIN" if win else "LOSS"}
+        if i % 3 == 0:
+            trade["rMultiple"] = float(rng.uniform(0.2, 2.5) if win else -rng.uniform(0.3, 1.0))
+        trades.append(trade)
+    return trades
+
+
+def referencePaths(trades, numSimulations, method, seed):
+    """One path at a time with plain loops, drawing from the generator in the same order as simulate."""
+    rng = np.random.default_rng(seed)
+    pnl = MonteCarlo.encodeRMultiples(trades) * RISK_PER_TRADE
+    endings, drawdowns, minimums = [], [], []
+    for _ in range(numSimulations):
+        if method == "permutation":
+            draws = rng.permuted(pnl[np.newaxis, :], axis=1)[0]
+        else:
+            draws = pnl[rng.integers(0, len(pnl), size=(1, len(pnl)))[0]]
+        balance = peak = lowest = START_BALANCE
+        drawdown = 0.0
+        for value in draws:
+            balance += value
+            peak = max(peak, balance)
+            lowest = min(lowest, balance)
+            drawdown = max(drawdown, peak - balance)
+        endings.append(balance)
+        drawdowns.append(drawdown)
+        minimums.append(lowest)
+    return np.array(endings), np.array(drawdowns), np.array(minimums)
+
+
+@pytest.mark.parametrize("method", ["permutation", "bootstrap"])
+def test_simulate_matches_loop_reference(method):
+    trades = tradeLog()
+    ruinBalance = START_BALANCE - 150
+    stats = MonteCarlo.simulate(trades, numSimulations=400, startBalance=START_BALANCE, riskPerTrade=RISK_PER_TRADE,
+                                method=method, ruinBalance=ruinBalance, seed=11)
+    endings, drawdowns, minimums = referencePaths(trades, 400, method, seed=11)
+
+    np.testing.assert_allclose(stats["endingBalances"], endings)
+    np.testing.assert_allclose(stats["maxDrawdowns"], drawdowns)
+    np.testing.assert_allclose(stats["minBalances"], minimums)
+    assert stats["riskOfRuin"] == np.mean(minimums <= ruinBalance)
+    assert 0 < stats["riskOfRuin"] < 1
+    np.testing.assert_allclose(stats["maxDrawdown"], np.round(np.percentile(drawdowns, [5, 50, 95]), 2))
+
+    if method == "permutation":
+        # Reordering trades never changes where a path ends
+        np.testing.assert_allclose(endings, endings[0])
+    else:
+        assert np.ptp(endings) > 0
+
+
+@pytest.mark.parametrize("method", ["permutation", "bootstrap"])
+def test_results_do_not_depend_on_chunk_size(method):
+    trades = tradeLog()
+    whole = MonteCarlo.simulate(trades, numSimulations=250, method=method, seed=7)
+    for chunkSize in (1, 16, 249, 1000):
+        chunked = MonteCarlo.simulate(trades, numSimulations=250, method=method, seed=7, chunkSize=chunkSize)
+        for name in ("endingBalances", "maxDrawdowns", "minBalances"):
+            np.testing.assert_array_equal(chunked[name], whole[name])
+        assert chunked["riskOfRuin"] == whole["riskOfRuin"]
+
+
+def test_seeded_runs_repeat_and_empty_logs_stay_flat():
+    trades = tradeLog()
+    assert MonteCarlo.run(trades, numSimulations=200, seed=5) == MonteCarlo.run(trades, numSimulations=200, seed=5)
+
+    flat = MonteCarlo.simulate([], numSimulations=10, startBalance=START_BALANCE, seed=5)
+    assert flat["endingBalance"] == (START_BALANCE, START_BALANCE, START_BALANCE)
+    assert flat["riskOfRuin"] == 0.0
+    with pytest.raises(ValueError):
+        MonteCarlo.simulate(trades, method="jackknife")
+
+
+def test_missing_r_multiples_fall_back_to_fixed_r():
+    trades = tradeLog()
+    bare = [{"outcome": trade["outcome"]} for trade in trades]
+    for missing in (None, float("nan"), pd.NA):
+        gapped = [dict(trade, rMultiple=trade.get("rMultiple", missing)) for trade in trades]
+        np.testing.assert_array_equal(MonteCarlo.encodeRMultiples(gapped), MonteCarlo.encodeRMultiples(trades))
+        assert MonteCarlo.run(gapped, numSimulations=50, seed=2) == MonteCarlo.run(trades, numSimulations=50, seed=2)
+
+    np.testing.assert_array_equal(MonteCarlo.encodeRMultiples([dict(t, rMultiple=None) for t in bare], rWin=2.0, rLoss=0.5),
+                                  np.where(MonteCarlo.encodeOutcomes(bare) == 1, 2.0, -0.5))
+
+    # A nullable column, as a FillSimulator log merged with fixed-R rows comes back from pandas
+    records = pd.DataFrame(trades).astype({"rMultiple": "Float64"}).to_dict("records")
+    np.testing.assert_array_equal(MonteCarlo.encodeRMultiples(records), MonteCarlo.encodeRMultiples(trades))
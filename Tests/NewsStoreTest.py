@@ -0,0 +1,135 @@
+# Tests/NewsStoreTest.py
+
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from data.NewsStore import NewsStore
+from strategies.BiasScoring import BiasScoring
+
+PAGE_SIZE = 3
+
+
+class FakeNewsData:
+    """Stands in for NewsData: four headlines every day (more than one page), with call log."""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def headlinesFor(self, symbol, start, end):
+        times = pd.date_range(start, end, freq="6h", inclusive="left", tz="America/New_York")
+        return [
+            {"id": f"{symbol}-{t.value}", "created": t.strftime("%a, %d %b %Y %H:%M:%S %z"),
+             "title": f"{symbol} {t}", "sentiment": "positive" if t.hour < 12 else "negative"}
+            for t in times
+        ]
+
+    def getNews(self, symbol, startDate=None, endDate=None, pageSize=100, page=0):
+        with self.lock:
+            self.calls.append((symbol, startDate, endDate, page))
+        items = self.headlinesFor(symbol, startDate, endDate)
+        return items[page * pageSize:(page + 1) * pageSize]
+
+    def getAllNews(self, symbol, startDate=None, endDate=None):
+        headlines, page = [], 0
+        while True:
+            batch = self.getNews(symbol, startDate, endDate, pageSize=PAGE_SIZE, page=page)
+            headlines.extend(batch)
+            if len(batch) < PAGE_SIZE:
+                return headlines
+            page += 1
+
+
+def ids(headlines):
+    return [h["id"] for h in headlines]
+
+
+def test_pages_full_range_and_serves_from_store(tmp_path):
+    news = FakeNewsData()
+    store = NewsStore(news, dbPath=str(tmp_path / "news.sqlite"))
+
+    headlines = store.getNews("MES", "2024-01-01", "2024-01-08")
+    expected = news.headlinesFor("MES", "2024-01-01", "2024-01-08")
+    assert sorted(ids(headlines)) == sorted(ids(expected))
+    assert len(headlines) == 7 * 4
+    # Seven day slices, each needing a second page
+    assert len(news.calls) == 14
+
+    inner = store.getNews("MES", "2024-01-03 12:00", "2024-01-05")
+    lower, upper = pd.Timestamp("2024-01-03 12:00", tz="UTC"), pd.Timestamp("2024-01-05", tz="UTC")
+    assert ids(inner) == ids([h for h in expected if lower <= pd.Timestamp(h["created"]) < upper])
+    assert len(news.calls) == 14
+
+    # Reopening the database keeps the coverage and headlines
+    reopened = NewsStore(news, dbPath=str(tmp_path / "news.sqlite"))
+    assert len(reopened.getNews("MES", "2024-01-02", "2024-01-07")) == 5 * 4
+    assert len(news.calls) == 14
+
+
+def test_fetches_only_head_and_since_high_water_mark(tmp_path):
+    news = FakeNewsData()
+    store = NewsStore(news, dbPath=str(tmp_path / "news.sqlite"))
+    store.prefetch("MES", "2024-01-05", "2024-01-08")
+    news.calls.clear()
+
+    store.prefetch("MES", "2024-01-03", "2024-01-10")
+    fetchedDays = sorted({call[1] for call in news.calls})
+    assert fetchedDays == ["2024-01-03", "2024-01-04", "2024-01-08", "2024-01-09"]
+    assert store.coverage("MES") == ("2024-01-03", "2024-01-10")
+    assert len(store.query("MES", "2024-01-03", "2024-01-10")) == 7 * 4
+
+
+def test_aware_bounds_are_covered_in_utc_days(tmp_path):
+    news = FakeNewsData()
+    store = NewsStore(news, dbPath=str(tmp_path / "news.sqlite"))
+    # Both bounds fall on the next UTC day; the last headline (midnight in New York) is after 00:00 UTC
+    start = pd.Timestamp("2024-01-05 21:00", tz="America/New_York")
+    end = pd.Timestamp("2024-01-07 21:30", tz="America/Los_Angeles")
+    headlines = store.getNews("MES", start, end)
+
+    assert store.coverage("MES") == ("2024-01-06", "2024-01-09")
+    assert ids(headlines)[-1] == ids(news.headlinesFor("MES", "2024-01-08", "2024-01-09"))[0]
+    assert len(headlines) == 9
+
+
+def test_bias_scoring_over_backtest_costs_one_fetch(tmp_path):
+    news = FakeNewsData()
+    store = NewsStore(news, dbPath=str(tmp_path / "news.sqlite"))
+    store.prefetch("MES", "2024-01-01", "2024-01-31")
+    fetches = len(news.calls)
+
+    bias = BiasScoring(store)
+    for day in pd.date_range("2024-01-02", "2024-01-30", freq="D"):
+        # The morning window only holds positive headlines
+        start = day.tz_localize("America/New_York")
+        assert bias.getBiasScore("MES", "long", start, start + pd.Timedelta(hours=7)) == 1.0
+    assert len(news.calls) == fetches
+
+
+def test_today_is_refetched_only_after_the_ttl(tmp_path, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr("data.NewsStore.time.time", lambda: now[0])
+    news = FakeNewsData()
+    store = NewsStore(news, dbPath=str(tmp_path / "news.sqlite"), partialTtl=300.0)
+    today = pd.Timestamp(datetime.utcnow().date())
+    start, end = today - pd.Timedelta(days=2), today + pd.Timedelta(hours=12)
+
+    store.getNews("MES", start, end)
+    fetches = len(news.calls)
+    now[0] += 299.0
+    store.getNews("MES", start, end)
+    assert len(news.calls) == fetches
+
+    now[0] += 2.0
+    store.getNews("MES", start, end)
+    assert {call[1] for call in news.calls[fetches:]} == {today.strftime("%Y-%m-%d")}
+    assert store.coverage("MES") == (start.strftime("%Y-%m-%d"), today.strftime("%Y-%m-%d"))
+
+
+def test_reversed_range_fetches_nothing(tmp_path):
+    news = FakeNewsData()
+    store = NewsStore(news, dbPath=str(tmp_path / "news.sqlite"))
+    assert store.getNews("MES", "2024-01-05", "2024-01-03") == []
+    assert news.calls == []
@@ -0,0 +1,86 @@
+# Tests/PortfolioBacktesterTest.py
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from Backtester.PortfolioBacktester import PortfolioBacktester, PortfolioData, _attachStore, allocate, writeResults
+
+EVALUATOR_INPUTS = {"ev": 0.0, "biasAligned": False, "vixInRange": False}
+HALF_HOURLY = {"freq": "30min", "tz": "UTC", "step": 3.0, "wick": 4.0}
+
+
+def test_store_aligns_symbols_on_one_time_axis(makeBars):
+    mes = makeBars(50, seed=3, **HALF_HOURLY)
+    store = PortfolioData.fromFrames({"MES": mes, "MNQ": makeBars(50, seed=4, drop=[3, 7], **HALF_HOURLY)})
+
+    assert store.fields["close"].shape == (2, 50)
+    assert np.isnan(store.fields["close"][1, [3, 7]]).all()
+    assert len(store.frame("MNQ")) == 48
+    np.testing.assert_array_equal(store.frame("MES")["close"], mes["close"])
+
+
+def test_worker_store_views_only_its_symbol(makeBars, monkeypatch):
+    monkeypatch.setattr("Backtester.PortfolioBacktester._attachedStores", {})
+    frames = {"MES": makeBars(50, seed=3, **HALF_HOURLY), "MNQ": makeBars(50, seed=4, drop=[3, 7], **HALF_HOURLY)}
+    store = PortfolioData.fromFrames(frames)
+    shared = store.publish()
+    try:
+        attached = _attachStore(shared.spec, "MNQ")
+        assert sorted(attached.shared.columns) == ["MNQ:close", "MNQ:high", "MNQ:low", "MNQ:open", "MNQ:volume", "datetime"]
+        assert all(np.shares_memory(attached.fields[field][0], attached.shared.columns[f"MNQ:{field}"])
+                   for field in ["open", "high", "low", "close", "volume"])
+        pd.testing.assert_frame_equal(attached.frame("MNQ"), store.frame("MNQ"))
+        attached.shared.close()
+    finally:
+        shared.close()
+
+
+def test_allocate_enforces_position_limits_and_shared_capital():
+    t = pd.Timestamp("2024-03-04 15:00")
+    hours = [pd.Timedelta(hours=h) for h in range(6)]
+    trades = pd.DataFrame({
+        "symbol": ["MES", "MNQ", "M2K", "MES", "MYM"],
+        "entryTime": [t, t, t + hours[1], t + hours[1], t + hours[3]],
+        "exitTime": [t + hours[2], t + hours[3], t + hours[2], t + hours[2], t + hours[5]],
+        "rMultiple": [1.0, -1.0, 2.0, 1.0, 1.0],
+    })
+    result = allocate(trades, startBalance=5000, riskPerTrade=25, maxPositions=2, maxPerSymbol=1)
+    assert list(result["taken"]) == [True, True, False, False, True]
+    assert list(result["skipReason"]) == ["", "", "maxPositions", "maxPositions", ""]
+    assert result.loc[result["taken"], "pnlDollars"].sum() == 25.0
+
+    # 30 dollars of equity only covers one 25 dollar risk at a time
+    result = allocate(trades, startBalance=30, riskPerTrade=25, maxPositions=5)
+    assert list(result["skipReason"]) == ["", "capital", "capital", "maxPerSymbol", ""]
+
+
+def test_parallel_scan_matches_serial_and_writes_separate_logs(tmp_path, makeBars):
+    frames = {
+        "MES": makeBars(seed=1, **HALF_HOURLY),
+        "MNQ": makeBars(seed=2, drop=range(100, 120), **HALF_HOURLY),
+        "M2K": makeBars(seed=3, **HALF_HOURLY),
+    }
+    store = PortfolioData.fromFrames(frames)
+
+    serial = PortfolioBacktester(list(frames), EVALUATOR_INPUTS, threshold=1.5, maxWorkers=1).run(store)
+    parallel = PortfolioBacktester(list(frames), EVALUATOR_INPUTS, threshold=1.5, maxWorkers=3).run(store)
+
+    assert serial["portfolio"]["trades"] > 0
+    pd.testing.assert_frame_equal(serial["trades"], parallel["trades"])
+    assert serial["portfolio"] == parallel["portfolio"]
+    assert sum(stats["trades"] for stats in serial["perSymbol"].values()) == serial["portfolio"]["trades"]
+
+    # Stage timings in the Engine.runBacktest shape, so main.py --profile reports both modes alike
+    assert sorted(serial["timings"]) == ["allocate", "scan"]
+    outputDir = writeResults(serial, str(tmp_path / "run"))
+    assert sorted(serial["timings"]) == ["allocate", "scan", "write"]
+    assert all(seconds >= 0 for seconds in serial["timings"].values())
+    assert sorted(os.listdir(outputDir)) == [
+        "TradeLog_M2K.csv", "TradeLog_MES.csv", "TradeLog_MNQ.csv", "TradeLog_portfolio.csv", "summary.json"
+    ]
+    assert len(pd.read_csv(os.path.join(outputDir, "TradeLog_MES.csv"))) == serial["perSymbol"]["MES"]["trades"]
+    with open(os.path.join(outputDir, "summary.json")) as f:
+        assert json.load(f)["portfolio"]["trades"] == serial["portfolio"]["trades"]
@@ -0,0 +1,89 @@
+# Tests/PriceBufferTest.py
+
+import numpy as np
+import pandas as pd
+
+from utils.PriceBuffer import NS_PER_MINUTE, PriceBuffer, RingPriceBuffer
+
+FIELDS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+
+def barRecords(bars):
+    return bars[FIELDS].to_dict("records")
+
+
+def test_wraparound_keeps_the_latest_bars_in_order(makeBars):
+    bars = makeBars(37, seed=31)
+    buffer = RingPriceBuffer(maxBars=9)
+    for bar in barRecords(bars):
+        buffer.updateFromBar(bar)
+
+    assert len(buffer) == 10 and buffer.total == 37
+    latest = bars.iloc[-10:]
+    np.testing.assert_array_equal(buffer.view("close"), latest["close"])
+    np.testing.assert_array_equal(buffer.view("timestamp"), latest["datetime"].to_numpy(dtype="datetime64[ns]").view("int64"))
+    np.testing.assert_array_equal(buffer.view("high", 3), latest["high"].iloc[-3:])
+    assert buffer.currentBar["close"] == bars["close"].iloc[-1]
+
+
+def test_views_are_zero_copy_and_see_revisions(makeBars):
+    bars = barRecords(makeBars(25, seed=32))
+    buffer = RingPriceBuffer(maxBars=9)
+    for bar in bars:
+        buffer.updateFromBar(bar)
+
+    views = buffer.arrays()
+    assert all(np.shares_memory(views[field], buffer.columns[field]) for field in RingPriceBuffer.FIELDS)
+    assert np.shares_memory(views["timestamp"], buffer.timestamps)
+    assert np.all(np.diff(views["timestamp"]) > 0)
+
+    # A view taken before the current bar is revised shows the revised values
+    buffer.updateFromBar(dict(bars[-1], high=bars[-1]["high"] + 5, close=bars[-1]["close"] + 1))
+    assert views["high"][-1] == bars[-1]["high"] + 5
+    assert views["close"][-1] == bars[-1]["close"] + 1
+    assert len(buffer) == 10 and buffer.total == 25
+
+
+def test_ticks_within_a_minute_revise_the_current_bar(monkeypatch):
+    now = [pd.Timestamp("2024-03-04 14:30:05").value]
+    monkeypatch.setattr("utils.PriceBuffer.time.time_ns", lambda: now[0])
+    buffer = RingPriceBuffer(maxBars=3)
+
+    # Tick volume is the session total so far; the first tick only sets the baseline
+    for price, volume in [(5000.0, 1200), (5001.5, 1201), (4999.25, 1205), (5000.5, 1208)]:
+        buffer.updateFromTick({"last": price, "volume": volume})
+    assert len(buffer) == 1
+    assert buffer.currentBar == {"open": 5000.0, "high": 5001.5, "low": 4999.25, "close": 5000.5, "volume": 8.0,
+                                 "timestamp": pd.Timestamp("2024-03-04 14:30").value}
+
+    now[0] += NS_PER_MINUTE
+    buffer.updateFromTick({"last": 5002.0, "volume": 1211})
+    assert len(buffer) == 2
+    np.testing.assert_array_equal(buffer.view("close"), [5000.5, 5002.0])
+    np.testing.assert_array_equal(buffer.view("volume"), [8.0, 3.0])
+
+
+def test_tick_volume_restarts_with_the_session(monkeypatch):
+    now = [pd.Timestamp("2024-03-04 22:58:10").value]  # 16:58 CT, two minutes before the rollover
+    monkeypatch.setattr("utils.PriceBuffer.time.time_ns", lambda: now[0])
+    buffer = RingPriceBuffer(maxBars=5)
+
+    for volume in (500_000, 500_040):
+        buffer.updateFromTick({"last": 5000.0, "volume": volume})
+    # The feed missed the rollover and first reports the new session already past the old total
+    now[0] = pd.Timestamp("2024-03-04 23:30:00").value
+    buffer.updateFromTick({"last": 5001.0, "volume": 600_000})
+    # A reconnect mid-session starts the count again from zero
+    buffer.updateFromTick({"last": 5001.5, "volume": 25})
+    buffer.updateFromTick({"last": 5001.25, "volume": 30})
+    np.testing.assert_array_equal(buffer.view("volume"), [40.0, 600_030.0])
+
+
+def test_get_bars_matches_price_buffer(makeBars):
+    ring, reference = RingPriceBuffer(maxBars=20), PriceBuffer(maxBars=20)
+    for bar in barRecords(makeBars(60, seed=33)):
+        for update in (dict(bar, high=bar["open"], low=bar["open"], close=bar["open"]), bar):
+            ring.updateFromBar(update)
+            reference.updateFromBar(update)
+        assert ring.getBars() == reference.getBars()
+    assert len(ring.getBars()) == 21
@@ -0,0 +1,122 @@
+# Tests/PriceCacheTest.py
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from data.PriceCache import PriceCache
+from utils.DataCleaner import clean_ohlcv
+
+
+class FakeFetcher:
+    """Stands in for PriceScraper: deterministic 30m bars for [start, end), with call log."""
+
+    def __init__(self):
+        self.calls = []
+
+    def getHistoricalData(self, start, end):
+        self.calls.append((start, end))
+        times = pd.date_range(start, end, freq="30min", inclusive="left", tz="America/New_York")
+        base = (times.asi8 // 1_800_000_000_000 % 1000).astype("float64")
+        return pd.DataFrame({
+            "Open": base, "High": base + 1, "Low": base - 1, "Close": base + 0.5,
+            "Volume": np.full(len(times), 100.0)
+        }, index=pd.DatetimeIndex(times, name="Datetime"))
+
+
+class WeekdayFetcher(FakeFetcher):
+    """FakeFetcher without weekend bars, so a Saturday-to-Monday range comes back empty."""
+
+    def getHistoricalData(self, start, end):
+        bars = super().getHistoricalData(start, end)
+        return bars[bars.index.dayofweek < 5]
+
+
+def expected(start, end):
+    return clean_ohlcv(FakeFetcher().getHistoricalData(start, end), source_name="expected")
+
+
+def test_serves_cached_range_without_fetching(tmp_path):
+    fetcher = FakeFetcher()
+    cache = PriceCache("MES=F", fetcher=fetcher, cacheDir=str(tmp_path))
+
+    first = cache.getHistoricalData("2024-01-01", "2024-01-10")
+    assert fetcher.calls == [("2024-01-01", "2024-01-10")]
+    pd.testing.assert_frame_equal(first, expected("2024-01-01", "2024-01-10"))
+
+    inner = cache.getHistoricalData("2024-01-03", "2024-01-05")
+    assert len(fetcher.calls) == 1
+    pd.testing.assert_frame_equal(inner, expected("2024-01-03", "2024-01-05"))
+
+    # A fresh instance reads the same files from disk
+    reopened = PriceCache("MES=F", fetcher=fetcher, cacheDir=str(tmp_path))
+    pd.testing.assert_frame_equal(reopened.getHistoricalData("2024-01-02", "2024-01-09"), expected("2024-01-02", "2024-01-09"))
+    assert len(fetcher.calls) == 1
+
+
+def test_tops_up_only_missing_head_and_tail(tmp_path):
+    fetcher = FakeFetcher()
+    cache = PriceCache("MES=F", fetcher=fetcher, cacheDir=str(tmp_path))
+    cache.getHistoricalData("2024-01-05", "2024-01-10")
+
+    wider = cache.getHistoricalData("2024-01-01", "2024-01-15")
+    assert fetcher.calls[1:] == [("2024-01-01", "2024-01-05"), ("2024-01-10", "2024-01-15")]
+    pd.testing.assert_frame_equal(wider, expected("2024-01-01", "2024-01-15"))
+
+    cache.getHistoricalData("2024-01-02", "2024-01-14")
+    assert len(fetcher.calls) == 3
+
+
+def test_cleaned_output_is_not_recleaned(tmp_path):
+    cache = PriceCache("MES=F", fetcher=FakeFetcher(), cacheDir=str(tmp_path))
+    bars = cache.getHistoricalData("2024-01-01", "2024-01-03")
+    assert clean_ohlcv(bars, source_name="caller") is bars
+
+
+def test_failed_edge_fetch_is_not_marked_covered(tmp_path):
+    fetcher = FakeFetcher()
+    cache = PriceCache("MES=F", fetcher=fetcher, cacheDir=str(tmp_path))
+    cache.getHistoricalData("2024-01-05", "2024-01-10")
+
+    # yfinance reports a failed download as an empty frame
+    working = fetcher.getHistoricalData
+    fetcher.getHistoricalData = lambda start, end: working(start, end).iloc[:0]
+    partial = cache.getHistoricalData("2024-01-01", "2024-01-15")
+    pd.testing.assert_frame_equal(partial, expected("2024-01-05", "2024-01-10"))
+
+    fetcher.getHistoricalData = working
+    full = cache.getHistoricalData("2024-01-01", "2024-01-15")
+    assert fetcher.calls[-2:] == [("2024-01-01", "2024-01-05"), ("2024-01-10", "2024-01-15")]
+    pd.testing.assert_frame_equal(full, expected("2024-01-01", "2024-01-15"))
+
+
+def test_empty_weekend_edges_are_covered(tmp_path):
+    fetcher = WeekdayFetcher()
+    cache = PriceCache("MES=F", fetcher=fetcher, cacheDir=str(tmp_path))
+    cache.getHistoricalData("2024-01-08", "2024-01-13")
+
+    # Saturday 2024-01-06 to Monday and Saturday 2024-01-13 to Monday hold no trading day
+    cache.getHistoricalData("2024-01-06", "2024-01-15")
+    assert fetcher.calls[1:] == [("2024-01-06", "2024-01-08"), ("2024-01-13", "2024-01-15")]
+    cache.getHistoricalData("2024-01-06", "2024-01-15")
+    assert len(fetcher.calls) == 3
+    assert (cache._loadMeta()["start"], cache._loadMeta()["end"]) == ("2024-01-06", "2024-01-15")
+
+
+def test_saves_swap_in_whole_generations(tmp_path):
+    cache = PriceCache("MES=F", fetcher=FakeFetcher(), cacheDir=str(tmp_path))
+    cache.getHistoricalData("2024-01-05", "2024-01-10")
+    first = cache._loadMeta()
+
+    cache.getHistoricalData("2024-01-05", "2024-01-12")
+    # A reader that loaded the previous meta can still open the generation it names
+    pd.testing.assert_frame_equal(cache._loadBars(first), expected("2024-01-05", "2024-01-10"))
+
+    cache.getHistoricalData("2024-01-03", "2024-01-12")
+    latest = cache._loadMeta()
+    generations = {name.split(".", 1)[1] for name in os.listdir(str(tmp_path / "MES_F_30m")) if name.endswith(".npy")}
+    assert len(generations) == 2 and f"{latest['generation']}.npy" in generations
+    meta, bars = cache._loadCached()
+    assert meta == latest and len(bars) == latest["rows"]
+    pd.testing.assert_frame_equal(bars, expected("2024-01-03", "2024-01-12"))
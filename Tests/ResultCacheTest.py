@@ -0,0 +1,62 @@
+# Tests/ResultCacheTest.py
+
+import ast
+import os
+import sys
+
+import pandas as pd
+
+from Backtester.ResultCache import CODE_VERSION_DIRS, REPO_ROOT, ResultCache, codeVersion, frameFingerprint, resultKey
+
+
+def makePrices(closes):
+    times = pd.date_range("2024-03-04 15:00", periods=len(closes), freq="30min", tz="UTC")
+    return pd.DataFrame({"datetime": times, "close": closes})
+
+
+def test_key_tracks_data_range_params_and_code():
+    prices = makePrices([5000.0, 5001.0, 5002.5])
+    key = resultKey("MES", "2024-01-01", "2024-04-01", prices, None, {"tqsThreshold": 5.0})
+
+    # Same content in a different frame (and index) is the same key
+    assert key == resultKey("MES", "2024-01-01", "2024-04-01", prices.copy().set_index(pd.Index([7, 8, 9])),
+                            None, {"tqsThreshold": 5.0})
+    assert key != resultKey("MES", "2024-01-01", "2024-04-01", makePrices([5000.0, 5001.0, 5002.75]),
+                            None, {"tqsThreshold": 5.0})
+    assert key != resultKey("MES", "2024-01-01", "2024-05-01", prices, None, {"tqsThreshold": 5.0})
+    assert key != resultKey("MES", "2024-01-01", "2024-04-01", prices, None, {"tqsThreshold": 5.5})
+    assert key != resultKey("MES", "2024-01-01", "2024-04-01", prices, None, {"tqsThreshold": 5.0}, version="other")
+    assert frameFingerprint(None) != frameFingerprint(prices.iloc[:0])
+    assert codeVersion() == codeVersion()
+
+
+def test_lru_evicts_to_disk_and_survives_restart(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    cache = ResultCache(path, maxEntries=2)
+    for i in range(3):
+        cache.put(f"key{i}", {"winRate": i / 10, "monteCarlo": (1, 2, 3)})
+
+    assert list(cache.memory) == ["key1", "key2"]
+    assert cache.get("key0") == {"winRate": 0.0, "monteCarlo": (1, 2, 3)}
+    assert cache.hits == {"memory": 0, "disk": 1}
+    assert list(cache.memory) == ["key2", "key0"]
+    assert cache.get("missing") is None and cache.misses == 1
+    cache.close()
+
+    # A new process (e.g. a resumed walk-forward) finds every finished result on disk
+    resumed = ResultCache(path, maxEntries=2)
+    assert len(resumed) == 3
+    calls = []
+    value = resumed.getOrCompute("key1", lambda: calls.append(1) or {"winRate": -1})
+    assert value["winRate"] == 0.1 and not calls
+    assert resumed.getOrCompute("key3", lambda: {"winRate": 0.3}) == {"winRate": 0.3}
+    assert len(resumed) == 4
+
+
+def test_code_version_covers_every_package_the_engine_imports():
+    with open(os.path.join(REPO_ROOT, "Backtester", "BacktestEngine.py")) as f:
+        tree = ast.parse(f.read())
+    packages = {node.module.split(".")[0] for node in ast.walk(tree) if isinstance(node, ast.ImportFrom) and "." in node.module}
+    packages -= set(sys.stdlib_module_names)
+    assert packages >= {"Strategy", "Scrapers", "Analysis", "Backtester"}
+    assert packages <= set(CODE_VERSION_DIRS)
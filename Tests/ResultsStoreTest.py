@@ -0,0 +1,62 @@
+# Tests/ResultsStoreTest.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pyarrow.dataset as ds
+
+from Backtester.ResultsStore import ResultsStore, configParams, paramHash
+
+
+def makeTrades(count, start=0, outcome="WIN"):
+    return [{"entryTime": f"2024-03-04 15:{i:02d}", "rMultiple": 1.8 if outcome == "WIN" else -1.0, "outcome": outcome}
+            for i in range(start, start + count)]
+
+
+def test_param_hash_is_stable_and_skips_secrets():
+    class Config:
+        tqsThreshold = 5.0
+        useSentiment = True
+        newsApiKey = "secret"
+
+        def helper(self):
+            pass
+
+    params = configParams(Config)
+    assert params == {"tqsThreshold": 5.0, "useSentiment": True}
+    assert paramHash(params) == paramHash({"useSentiment": True, "tqsThreshold": 5.0})
+    assert paramHash(params) != paramHash({"tqsThreshold": 5.5, "useSentiment": True})
+
+
+def test_runs_append_and_query_by_partition(tmp_path):
+    store = ResultsStore(str(tmp_path))
+    first = store.writeTrades(makeTrades(3), "MES", {"tqsThreshold": 5.0})
+    store.writeTrades(makeTrades(2, start=3, outcome="LOSS"), "MES", {"tqsThreshold": 5.0}, runId=first)
+    second = store.writeTrades(makeTrades(4), "MNQ", {"tqsThreshold": 5.5})
+
+    assert first != second
+    assert len(store.query()) == 9
+    assert len(store.query(runId=first)) == 5
+    assert set(store.query(symbol=["MNQ"])["runId"]) == {second}
+    assert len(store.query(paramHash=paramHash({"tqsThreshold": 5.5}))) == 4
+
+    losses = store.query(symbol="MES", columns=["rMultiple"], where=ds.field("outcome") == "LOSS")
+    assert list(losses.columns) == ["rMultiple"] and list(losses["rMultiple"]) == [-1.0, -1.0]
+
+    runs = store.runs()
+    assert sorted(runs["symbol"]) == ["MES", "MNQ"]
+    assert runs.set_index("runId").loc[second, "params"] == {"tqsThreshold": 5.5}
+
+
+def test_concurrent_writes_and_changed_columns(tmp_path):
+    store = ResultsStore(str(tmp_path))
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        runIds = list(pool.map(lambda i: store.writeTrades(makeTrades(10), "MES", {"trial": i}), range(8)))
+    assert len(set(runIds)) == 8 and len(store.query()) == 80
+
+    # A later trade log with an extra column still reads back alongside the older parts
+    extra = [dict(trade, exitReason="target") for trade in makeTrades(2)]
+    runId = store.writeTrades(extra, "MES", {"trial": 99})
+    everything = store.query()
+    assert len(everything) == 82
+    assert everything["exitReason"].isna().sum() == 80
+    assert list(store.query(runId=runId)["exitReason"]) == ["target", "target"]
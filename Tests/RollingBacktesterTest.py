@@ -0,0 +1,113 @@
+# Tests/RollingBacktesterTest.py
+
+import sys
+import types
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from Backtester.FeatureStore import FeatureStore, sweep
+from Backtester.ResultsStore import ResultsStore
+from Backtester.RollingBacktester import RollingBacktester
+
+
+class StubEngine:
+    """Stands in for BacktestEngine.Engine: a deterministic result from the window's data and threshold."""
+
+    def __init__(self, config, cache=None):
+        self.config = config
+
+    def runBacktest(self, symbol, startDate, endDate, priceData=None, sentimentData=None, writeTrades=True, runId=None):
+        closes = priceData["close"].to_numpy()
+        headlineChars = sum(len(headline) for headline in sentimentData["headline"])
+        return {
+            "finalBalance": float(len(closes)),
+            "winRate": float(np.mean(np.sin(closes * self.config.tqsThreshold) > 0)),
+            "expectedValue": float(headlineChars),
+            "monteCarlo": (closes.min(), float(np.median(closes)), closes.max()),
+            "runId": runId if writeTrades else None,
+        }
+
+
+class LosingFirstWindowEngine(StubEngine):
+    """StubEngine whose first training window has no winning trades at any threshold."""
+
+    def runBacktest(self, symbol, startDate, endDate, priceData=None, sentimentData=None, writeTrades=True, runId=None):
+        result = super().runBacktest(symbol, startDate, endDate, priceData, sentimentData, writeTrades, runId)
+        return dict(result, winRate=0.0) if startDate == "2024-01-01" and not writeTrades else result
+
+
+def useEngine(monkeypatch, engine):
+    # Pool workers fork from this process, so they import the stub too
+    monkeypatch.setitem(sys.modules, "Backtester.BacktestEngine", types.ModuleType("Backtester.BacktestEngine"))
+    sys.modules["Backtester.BacktestEngine"].Engine = engine
+
+
+def walkForwardBacktester(bars, monkeypatch):
+    times = bars["datetime"].iloc[::5].reset_index(drop=True)
+    sentiment = pd.DataFrame({
+        "datetime": times,
+        "headline": [f"Futures headline {i} {'!' * (i % 4)}" for i in range(len(times))],
+        "sentiment": np.cos(np.arange(len(times))),
+    })
+
+    def loadData(self):
+        self.priceData, self.sentimentData = bars, sentiment
+
+    monkeypatch.setattr(RollingBacktester, "_load_data", loadData)
+    config = SimpleNamespace(useSentiment=True, tqsThreshold=5.0)
+    return RollingBacktester("MES", "2024-01-01", "2024-04-30", config,
+                             trainWindowMonths=1, testWindowMonths=1, cache=False)
+
+
+def test_walk_forward_matches_sequential_run(makeBars, monkeypatch):
+    useEngine(monkeypatch, StubEngine)
+    backtester = walkForwardBacktester(makeBars(4500, freq="30min", tz="UTC", start="2024-01-01"), monkeypatch)
+
+    parallel = backtester.runWalkForward(maxWorkers=2)
+    sequential = backtester.runRollingBacktest()
+    assert len(sequential) == 2
+    assert sequential["TqsThreshold"].nunique() == 2
+    pd.testing.assert_frame_equal(parallel, sequential)
+    assert not sequential["Skipped"].any()
+
+
+def test_window_without_a_winner_is_skipped_on_both_paths(makeBars, monkeypatch):
+    useEngine(monkeypatch, LosingFirstWindowEngine)
+    backtester = walkForwardBacktester(makeBars(4500, freq="30min", tz="UTC", start="2024-01-01"), monkeypatch)
+
+    parallel = backtester.runWalkForward(maxWorkers=2)
+    sequential = backtester.runRollingBacktest()
+    pd.testing.assert_frame_equal(parallel, sequential)
+    assert list(sequential["Skipped"]) == [True, False]
+    assert list(sequential["TqsThreshold"].isna()) == [True, False]
+    assert sequential.loc[0, ["FinalBalance", "WinRate", "MonteCarloP50"]].isna().all()
+
+
+def test_feature_store_windows_are_tested_on_the_tuning_objective(tmp_path, makeBars, monkeypatch):
+    monkeypatch.setattr("config.config.RESULTS_DIR", str(tmp_path / "results"))
+    bars = makeBars(4500, freq="30min", tz="UTC", start="2024-01-01")
+
+    def loadData(self):
+        self.priceInterval, self.priceData, self.sentimentData = "30m", bars, None
+
+    monkeypatch.setattr(RollingBacktester, "_load_data", loadData)
+    config = SimpleNamespace(useSentiment=False, tqsThreshold=5.0, ev=0.2, biasAligned=True)
+    backtester = RollingBacktester("MES", "2024-01-01", "2024-04-30", config, trainWindowMonths=1,
+                                   testWindowMonths=1, cache=False, featureStore=FeatureStore(str(tmp_path / "features")))
+    records = backtester.runRollingBacktest()
+    assert len(records) == 2 and records["TqsThreshold"].notna().all()
+
+    # The reported test-window stats are what the tuning sweep scores for that threshold and window
+    matrix, simulator = backtester._featureSweepInputs()
+    for record in records.itertuples():
+        testStart, testEnd = next((s, e) for _, _, s, e in backtester._generateWindows() if s.date() == record.TestStart)
+        grid = {"threshold": [record.TqsThreshold], "ev": [0.2], "biasAligned": [True]}
+        expected = sweep(matrix, grid, simulator, start=testStart, end=testEnd).iloc[0]
+        assert (record.WinRate, record.ExpectedValue) == (expected["winRate"], expected["expectedValue"])
+        assert record.FinalBalance == pytest.approx(5000 + 25 * expected["expectedValue"] * expected["trades"])
+
+    stored = ResultsStore().query(runId=backtester.runId)
+    assert len(stored) > 0
@@ -0,0 +1,90 @@
+# Tests/SentimentIndexTest.py
+
+import numpy as np
+import pandas as pd
+
+from analysis.SentimentAnalysis import SentimentAnalysis
+from analysis.SentimentIndex import SentimentIndex, mergeSentimentAsof
+from strategies.BiasScoring import BiasScoring
+
+LABELS = ["positive", "negative", "neutral"]
+
+
+def makeData(seed=7, bars=300, headlines=900):
+    rng = np.random.default_rng(seed)
+    barTimes = pd.date_range("2024-03-01 09:30", periods=bars, freq="30min", tz="America/New_York")
+    offsets = rng.integers(-3_600, bars * 1_800, size=headlines)
+    published = barTimes[0] + pd.to_timedelta(offsets, unit="s")
+    items = [
+        {"created": t.isoformat(), "sentiment": LABELS[rng.integers(0, 3)], "title": f"h{i}"}
+        for i, t in enumerate(published)
+    ]
+    return barTimes, items
+
+
+def windowHeadlines(items, barTimes, startBar, endBar):
+    lower = barTimes[startBar - 1] if startBar > 0 else None
+    upper = barTimes[endBar]
+    return [
+        h for h in items
+        if pd.Timestamp(h["created"]) <= upper and (lower is None or pd.Timestamp(h["created"]) > lower)
+    ]
+
+
+def test_window_counts_match_recounting_headlines():
+    barTimes, items = makeData()
+    index = SentimentIndex.fromHeadlines(items, barTimes)
+    rng = np.random.default_rng(1)
+
+    for _ in range(50):
+        startBar, endBar = sorted(rng.integers(0, len(barTimes), size=2))
+        analyzer = SentimentAnalysis(windowHeadlines(items, barTimes, startBar, endBar))
+        assert index.counts(startBar, endBar) == analyzer.analyzeHeadlines()
+        assert index.biasDirection(startBar, endBar) == analyzer.scoreBiasDirection()
+
+
+def test_rolling_counts_match_point_lookups():
+    barTimes, items = makeData()
+    index = SentimentIndex.fromHeadlines(items, barTimes)
+    rolling = index.rollingCounts(8)
+    bias = index.rollingBias(8)
+
+    for endBar in [0, 3, 7, 8, 150, len(barTimes) - 1]:
+        expected = index.counts(max(endBar - 7, 0), endBar)
+        assert rolling.iloc[endBar].to_dict() == expected
+        assert bias[endBar] == index.biasDirection(max(endBar - 7, 0), endBar)
+
+
+def test_bias_scoring_uses_index_without_fetching():
+    barTimes, items = makeData()
+    index = SentimentIndex.fromHeadlines(items, barTimes)
+
+    class NoNews:
+        def getNews(self, *args):
+            raise AssertionError("index-backed bias scoring should not read headlines")
+
+    bias = BiasScoring(NoNews(), sentimentIndexes={"MES": index})
+    start, end = barTimes[40], barTimes[60]
+    expected = SentimentAnalysis(windowHeadlines(items, barTimes, 40, 60)).scoreBiasDirection()
+    assert bias.getBiasScore("MES", "long", start, end) == (1.0 if expected > 0 else 0.0)
+    assert bias.getBiasScore("MES", "short", start, end) == (1.0 if expected < 0 else 0.0)
+
+
+def test_merge_asof_matches_per_row_lookup():
+    rng = np.random.default_rng(3)
+    prices = pd.DataFrame({
+        "datetime": pd.date_range("2024-03-01", periods=200, freq="30min", tz="UTC"),
+        "close": rng.normal(size=200)
+    }).sample(frac=1.0, random_state=2)
+    sentiment = pd.DataFrame({
+        "datetime": pd.Timestamp("2024-03-01 01:00", tz="UTC") + pd.to_timedelta(rng.integers(0, 200 * 1800, size=60), unit="s"),
+        "sentiment_score": rng.choice([1, -1, 0], size=60)
+    })
+
+    merged = mergeSentimentAsof(prices, sentiment)
+    assert merged.index.equals(prices.index)
+    ordered = sentiment.sort_values("datetime", kind="stable")
+    for i, row in prices.iterrows():
+        earlier = ordered[ordered["datetime"] <= row["datetime"]]
+        expected = earlier["sentiment_score"].iloc[-1] if len(earlier) else 0
+        assert merged.loc[i, "sentiment_score"] == expected
@@ -0,0 +1,60 @@
+# Tests/SentimentScorerTest.py
+
+import pandas as pd
+from textblob import TextBlob
+
+from analysis.SentimentScorer import SentimentScorer
+
+HEADLINES = [
+    "Stocks rally as strong earnings beat expectations",
+    "Futures slump on terrible inflation data",
+    "Fed holds rates steady",
+    "Great quarter for chipmakers lifts Nasdaq",
+    "Banks fall after weak guidance",
+    "Oil prices unchanged ahead of OPEC meeting",
+]
+
+
+def makeNews(repeats=4):
+    times = pd.date_range("2024-05-01 08:00", periods=len(HEADLINES) * repeats, freq="17min", tz="UTC")
+    titles = [HEADLINES[i % len(HEADLINES)] + ("  " if i % 2 else "") for i in range(len(times))]
+    return pd.DataFrame({"publishedAt": times.strftime("%Y-%m-%dT%H:%M:%SZ"), "title": titles})
+
+
+def test_scores_match_textblob_and_dedupe_by_content(tmp_path):
+    scorer = SentimentScorer(cachePath=str(tmp_path / "sentiment.sqlite"))
+    scored = scorer.scoreNews(makeNews())
+
+    assert scorer.scoredCount == len(HEADLINES)
+    expected = [TextBlob(" ".join(t.split())).sentiment.polarity for t in scored["headline"]]
+    assert scored["polarity"].tolist() == expected
+    assert scored["sentiment_score"].tolist() == expected
+    assert set(scored["sentiment"]) <= {"positive", "negative", "neutral"}
+    assert scored["datetime"].is_monotonic_increasing
+
+
+def test_cached_polarity_is_never_rescored(tmp_path):
+    path = str(tmp_path / "sentiment.sqlite")
+    first = SentimentScorer(cachePath=path).scoreNews(makeNews())
+
+    reopened = SentimentScorer(cachePath=path)
+    overlapping = pd.concat([makeNews(), pd.DataFrame({
+        "publishedAt": ["2024-05-03T10:00:00Z"], "title": ["Brand new headline about record highs"]
+    })], ignore_index=True)
+    second = reopened.scoreNews(overlapping)
+
+    assert reopened.scoredCount == 1
+    pd.testing.assert_frame_equal(second.iloc[:len(first)], first)
+
+
+def test_process_pool_batches_match_inline_scoring(tmp_path):
+    texts = [f"{headline} (update {i})" for i in range(5) for headline in HEADLINES]
+    inline = SentimentScorer(cachePath=str(tmp_path / "inline.sqlite"), batchSize=len(texts))
+    pooled = SentimentScorer(cachePath=str(tmp_path / "pooled.sqlite"), batchSize=4, maxWorkers=2)
+
+    assert pooled.polarities(texts) == inline.polarities(texts)
+    assert pooled.scoredCount == len(texts)
+
+    headlines = pooled.scoreHeadlines([{"title": t} for t in texts[:3]])
+    assert [h["polarity"] for h in headlines] == inline.polarities(texts[:3])
+    assert pooled.scoredCount == len(texts)
@@ -0,0 +1,66 @@
+# Tests/SettingsTest.py
+
+import dataclasses
+import importlib
+
+import pandas as pd
+import pytest
+
+from config import config
+from config.Settings import Settings, SettingsProvider
+from live.LiveSignalRunner import LiveSignalRunner
+
+SETTING_VARIABLES = ["TQS_TRADE_THRESHOLD", "TQS_WATCHLIST_THRESHOLD", "TQS_SWEEP_ZONE", "TQS_LOG_PATH"]
+
+
+@pytest.fixture
+def envFile(tmp_path, monkeypatch):
+    """A .env for reload() to read; the environment and config/config.py are restored afterwards."""
+    for name in SETTING_VARIABLES:
+        monkeypatch.delenv(name, raising=False)
+    path = tmp_path / ".env"
+    yield path
+    monkeypatch.undo()
+    importlib.reload(config)
+
+
+def test_reload_swaps_in_the_new_settings(envFile):
+    envFile.write_text("TQS_TRADE_THRESHOLD=6.5\nTQS_WATCHLIST_THRESHOLD=4\nTQS_SWEEP_ZONE=nyHigh\n")
+    provider = SettingsProvider(envPath=str(envFile))
+    before = provider.current
+
+    updated = provider.reload()
+    assert updated is provider.current
+    assert (updated.tradeThreshold, updated.watchlistThreshold, updated.sweepZone) == (6.5, 4.0, "nyHigh")
+    assert updated.logPath == before.logPath
+
+    envFile.write_text("TQS_TRADE_THRESHOLD=7\nTQS_WATCHLIST_THRESHOLD=4\nTQS_SWEEP_ZONE=nyHigh\n")
+    assert provider.reload().tradeThreshold == 7.0
+    # Snapshots readers already took are never changed under them
+    assert updated.tradeThreshold == 6.5
+
+
+def test_failed_reload_keeps_the_previous_settings(envFile):
+    envFile.write_text("TQS_TRADE_THRESHOLD=not-a-number\n")
+    provider = SettingsProvider(envPath=str(envFile))
+    before = provider.current
+    assert provider.reload() is before
+    assert provider.current is before
+
+
+def test_reloaded_log_path_reopens_the_runners_own_sink(tmp_path):
+    first, second = tmp_path / "first.csv", tmp_path / "second.csv"
+    settings = Settings(tradeThreshold=5.0, watchlistThreshold=3.5, sweepZone="londonLow", logPath=str(first))
+    provider = SettingsProvider(settings=settings)
+    runner = LiveSignalRunner({"ev": 1.0, "biasAligned": True, "vixInRange": False}, settings=provider, symbol="MES")
+    try:
+        runner.onTick({"last": 5000.0})
+        provider.current = dataclasses.replace(settings, logPath=str(second))  # as reload() swaps it
+        runner.onTick({"last": 5000.25})
+        runner.onTick({"last": 5000.5})
+    finally:
+        runner.close()
+
+    assert runner.sink.path == str(second)
+    assert len(pd.read_csv(first)) == 1
+    assert list(pd.read_csv(second)["priceUsed"]) == [5000.25, 5000.5]
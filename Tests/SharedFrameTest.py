@@ -0,0 +1,58 @@
+# Tests/SharedFrameTest.py
+
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from utils.SharedFrame import SharedFrame
+
+
+def makeSentiment(numRows=200):
+    times = pd.date_range("2024-03-04 09:30", periods=numRows, freq="15min", tz="America/New_York")
+    return pd.DataFrame({
+        "datetime": times,
+        "headline": [f"Headline {i} — futures move {'é' * (i % 3)}" for i in range(numRows)],
+        "source": [None if i % 7 == 0 else f"wire{i % 3}" for i in range(numRows)],
+        "tags": [["macro", str(i)] for i in range(numRows)],
+        "sentiment": np.linspace(-1, 1, numRows),
+        "isBreaking": np.arange(numRows) % 5 == 0,
+    })
+
+
+def test_attached_slices_match_the_frame():
+    sentiment = makeSentiment()
+    published = SharedFrame.publish(sentiment)
+    try:
+        # Text stays in shared memory: the spec a pool job pickles doesn't grow with it
+        assert "Headline" not in repr(published.spec)
+        assert len(pickle.dumps(published.spec)) < 1000
+
+        attached = SharedFrame.attach(published.spec)
+        assert len(attached) == 200
+        whole = attached.toFrame()
+        pd.testing.assert_frame_equal(whole, sentiment, check_dtype=False)
+        assert whole["datetime"].dt.tz is not None
+
+        start, end = sentiment["datetime"].iloc[40], sentiment["datetime"].iloc[90]
+        expected = sentiment.iloc[40:90].reset_index(drop=True)
+        pd.testing.assert_frame_equal(attached.sliceByTime("datetime", start, end), expected, check_dtype=False)
+        # Naive bounds are read in the column's own time zone
+        naive = attached.sliceByTime("datetime", start.tz_localize(None), end.tz_localize(None))
+        pd.testing.assert_frame_equal(naive, expected, check_dtype=False)
+        assert attached.toFrame(5, 5).empty
+        attached.close()
+    finally:
+        published.close()
+    assert published.blocks == {}
+
+
+def test_empty_frame_round_trips():
+    published = SharedFrame.publish(makeSentiment().iloc[:0])
+    try:
+        attached = SharedFrame.attach(published.spec)
+        frame = attached.toFrame()
+        assert frame.empty and list(frame.columns) == list(makeSentiment().columns)
+        attached.close()
+    finally:
+        published.close()
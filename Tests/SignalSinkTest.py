@@ -0,0 +1,59 @@
+# Tests/SignalSinkTest.py
+
+import csv
+import itertools
+import os
+import queue
+
+from analysis.CorrelationAnalysis import CorrelationAnalysis
+from live.SignalSink import _STOP, SIGNAL_COLUMNS, SignalSink
+from strategies.TqsKernel import TQS_BITS
+
+
+def test_appends_under_a_matching_header(tmp_path):
+    path = str(tmp_path / "signals_log.csv")
+    for minute in range(2):
+        with SignalSink(path) as sink:
+            sink.write(f"2024-03-04T15:0{minute}:00", 4.0, 5000.25, TQS_BITS["ev"], symbol="MES")
+
+    with open(path, newline="") as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == SIGNAL_COLUMNS and len(rows) == 3
+    assert os.listdir(str(tmp_path)) == ["signals_log.csv"]
+
+
+def test_legacy_log_is_rotated_aside(tmp_path):
+    path = str(tmp_path / "signals_log.csv")
+    # Header-less timestamp/score/priceUsed/breakdown rows, as the runner used to write them
+    legacyRows = [["2024-03-01T15:00:00", "4.0", "5000.0", "1.0: Expected value > 0; 0.5: MACD aligned"]]
+    with open(path, "w", newline="") as file:
+        csv.writer(file).writerows(legacyRows)
+
+    with SignalSink(path) as sink:
+        sink.write("2024-03-04T15:00:00", 2.5, 5001.0, TQS_BITS["ev"] | TQS_BITS["rsi"], symbol="MES")
+
+    signals = CorrelationAnalysis(path).loadSignals()
+    assert list(signals.columns) == SIGNAL_COLUMNS and len(signals) == 1
+    assert CorrelationAnalysis(path).analyzeByComponent() == {"Expected value > 0": 1, "RSI aligned": 1}
+
+    rotated = [name for name in os.listdir(str(tmp_path)) if name != "signals_log.csv"]
+    assert len(rotated) == 1 and rotated[0].startswith("signals_log.") and rotated[0].endswith(".csv")
+    with open(os.path.join(str(tmp_path), rotated[0]), newline="") as file:
+        assert list(csv.reader(file)) == legacyRows
+
+
+def test_continuous_writes_still_flush_on_the_interval(tmp_path, monkeypatch):
+    sink = SignalSink(str(tmp_path / "signals_log.csv"), maxBatch=10 ** 9, flushInterval=1.0)
+    sink.close()
+    # Rows arrive faster than the writer drains them, so its queue never runs dry
+    sink.queue = queue.SimpleQueue()
+    for minute in range(30):
+        sink.queue.put((f"2024-03-04T15:{minute:02d}:00", 4.0, 5000.25, TQS_BITS["ev"], "MES"))
+    sink.queue.put(_STOP)
+    clock = itertools.count(step=0.25)  # a quarter of a second passes between every clock read
+    monkeypatch.setattr("live.SignalSink.time.monotonic", lambda: next(clock))
+    batches = []
+    monkeypatch.setattr(sink, "_writeBatch", lambda rows: batches.append(len(rows)))
+
+    sink._run()
+    assert sum(batches) == 30 and len(batches) > 1
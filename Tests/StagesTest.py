@@ -0,0 +1,53 @@
+# Tests/StagesTest.py
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from Backtester.Stages import dateChunks, timed
+from utils.Instrumentation import metrics
+
+
+def test_date_chunks_cover_the_range_without_gaps():
+    chunks = dateChunks("2024-01-01", "2024-03-15", 30)
+    assert chunks == [("2024-01-01", "2024-01-31"), ("2024-01-31", "2024-03-01"), ("2024-03-01", "2024-03-15")]
+
+    # Range an exact multiple of the chunk size, timestamps in, and a chunk longer than the range
+    assert dateChunks("2024-01-01", "2024-01-21", 10) == [("2024-01-01", "2024-01-11"), ("2024-01-11", "2024-01-21")]
+    assert dateChunks(pd.Timestamp("2024-01-01 09:30"), "2024-01-05", 30) == [("2024-01-01", "2024-01-05")]
+    assert dateChunks("2024-01-05", "2024-01-05", 30) == [("2024-01-05", "2024-01-05")]
+
+    long = dateChunks("2022-01-01", "2024-01-01", 60)
+    assert long[0][0] == "2022-01-01" and long[-1][1] == "2024-01-01"
+    assert all(previous[1] == current[0] for previous, current in zip(long, long[1:]))
+
+
+def test_timed_accumulates_across_threads_and_failures():
+    metrics.reset()
+    metrics.enable()
+    try:
+        timings = {}
+
+        def work():
+            with timed(timings, "newsFetch"):
+                time.sleep(0.01)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with pytest.raises(ValueError):
+            with timed(timings, "scan"):
+                raise ValueError("scan failed")
+
+        # Concurrent blocks add up, so a stage can exceed the wall time around it
+        assert timings["newsFetch"] >= 0.04 and "scan" in timings
+        histograms = metrics.summary()["histograms"]
+        assert histograms["engine.newsFetchSeconds"]["count"] == 4
+        assert histograms["engine.scanSeconds"]["count"] == 1
+    finally:
+        metrics.disable()
+        metrics.reset()
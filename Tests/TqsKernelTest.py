@@ -0,0 +1,91 @@
+# Tests/TqsKernelTest.py
+
+import numpy as np
+
+from analysis.CorrelationAnalysis import CorrelationAnalysis
+from live.SignalSink import SignalSink
+from strategies.TqsCalculator import TqsCalculator
+from strategies.TqsKernel import (
+    componentCounts, decodeMask, formatMask, maskScores, scoreMask, scoreMasks
+)
+
+
+def randomInputs(n=2000, seed=5):
+    rng = np.random.default_rng(seed)
+    price = 5000 + rng.choice([-2.0, -1.0, 0.0, 1.0, 2.0], size=n)
+    return {
+        "price": price,
+        "donchianHigh": np.full(n, 5001.0),
+        "donchianLow": np.full(n, 4999.0),
+        "isSwept": rng.random(n) < 0.3,
+        "isConfirmed": rng.random(n) < 0.5,
+        "ev": rng.normal(size=n),
+        "rvol": rng.uniform(0.5, 2.5, size=n),
+        "macdAligned": rng.random(n) < 0.5,
+        "rsiAligned": rng.random(n) < 0.5,
+        "biasAligned": rng.random(n) < 0.5,
+        "vixInRange": rng.random(n) < 0.5,
+    }
+
+
+def calculatorResult(inputs, i):
+    calculator = TqsCalculator()
+    calculator.scoreSweep(inputs["isSwept"][i], inputs["isConfirmed"][i])
+    calculator.scoreDonchianBreakout(inputs["price"][i], inputs["donchianHigh"][i], inputs["donchianLow"][i])
+    calculator.scoreConfirmationIndicators(inputs["ev"][i], inputs["rvol"][i], inputs["macdAligned"][i], inputs["rsiAligned"][i])
+    calculator.scoreBiasAndVolatility(inputs["biasAligned"][i], inputs["vixInRange"][i])
+    return calculator.getScore(), calculator.getBreakdown()
+
+
+def test_scalar_and_vectorized_kernels_match_calculator():
+    inputs = randomInputs()
+    scores, masks = scoreMasks(*inputs.values())
+
+    for i in range(len(inputs["price"])):
+        expectedScore, expectedBreakdown = calculatorResult(inputs, i)
+        score, mask = scoreMask(*(column[i] for column in inputs.values()))
+        assert score == expectedScore == scores[i]
+        assert mask == masks[i]
+        assert decodeMask(mask) == expectedBreakdown
+    np.testing.assert_array_equal(maskScores(masks), scores)
+
+
+def test_rules_score_known_setups():
+    # Confirmed sweep, breakdown, positive EV, RVOL at the threshold, RSI and VIX: every group contributes
+    calculator = TqsCalculator()
+    calculator.scoreSweep(True, True)
+    calculator.scoreDonchianBreakout(4998.0, 5001.0, 4999.0)
+    calculator.scoreConfirmationIndicators(0.2, 1.5, False, True)
+    calculator.scoreBiasAndVolatility(False, True)
+    assert calculator.getScore() == 1.5 + 1.0 + 1.0 + 1.0 + 0.5 + 1.0
+    assert calculator.getBreakdown() == [
+        (1.5, "Liquidity sweep confirmed"), (1.0, "Breakdown below Donchian low"), (1.0, "Expected value > 0"),
+        (1.0, "RVOL >= 1.5"), (0.5, "RSI aligned"), (1.0, "Correct VIX regime"),
+    ]
+    assert scoreMask(4998.0, 5001.0, 4999.0, True, True, 0.2, 1.5, False, True, False, True) == (6.0, calculator.mask)
+
+    # Inside the channel with nothing aligned scores zero; an unconfirmed sweep is worth half a point
+    assert scoreMask(5000.0, 5001.0, 4999.0, False, True, 0.0, 1.49, False, False, False, False) == (0.0, 0)
+    assert scoreMask(5000.0, 5001.0, 4999.0, True, False, 0.0, 1.0, False, False, False, False)[0] == 0.5
+
+
+def test_component_counts_match_string_parsing(tmp_path):
+    inputs = randomInputs(n=300)
+    scores, masks = scoreMasks(*inputs.values())
+
+    path = str(tmp_path / "signals.csv")
+    with SignalSink(path) as sink:
+        for i, (score, mask) in enumerate(zip(scores, masks)):
+            sink.write(f"2024-03-04T10:{i // 60:02d}:{i % 60:02d}", score, inputs["price"][i], mask, symbol="MES")
+
+    legacy = {}
+    for mask in masks:
+        for part in formatMask(mask).split(";"):
+            if ":" in part:
+                reason = part.split(":", 1)[1].strip()
+                legacy[reason] = legacy.get(reason, 0) + 1
+
+    counts = CorrelationAnalysis(path).analyzeByComponent()
+    assert counts == componentCounts(masks)
+    assert counts == legacy
+    assert list(counts.values()) == sorted(counts.values(), reverse=True)
@@ -0,0 +1,42 @@
+# Tests/conftest.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def randomBars(numBars=1500, seed=7, start="2024-03-04 00:00", freq="1min", tz=None, step=2.0, wick=3.0,
+               tickSize=None, drop=()):
+    """
+    Seeded random-walk OHLCV bars with 'timestamp' (ISO text, as BacktestRunner takes it) and
+    'datetime' columns. With tickSize, prices move in whole ticks; drop removes rows to leave gaps.
+    """
+    rng = np.random.default_rng(seed)
+    if tickSize:
+        close = 5000 + np.cumsum(rng.integers(-2, 3, size=numBars) * tickSize)
+        open_ = np.concatenate([[close[0]], close[:-1]])
+        high = np.maximum(open_, close) + rng.integers(0, 3, size=numBars) * tickSize
+        low = np.minimum(open_, close) - rng.integers(0, 3, size=numBars) * tickSize
+    else:
+        close = 5000 + np.cumsum(rng.normal(0, step, size=numBars))
+        open_ = np.concatenate([[5000], close[:-1]])
+        high = np.maximum(open_, close) + rng.uniform(0, wick, size=numBars)
+        low = np.minimum(open_, close) - rng.uniform(0, wick, size=numBars)
+    volume = rng.integers(20, 1000, size=numBars) * rng.choice([1, 1, 1, 4], size=numBars)
+    times = pd.date_range(start, periods=numBars, freq=freq, tz=tz)
+    bars = pd.DataFrame({
+        "timestamp": [ts.isoformat() for ts in times],
+        "datetime": times,
+        "open": open_,
+        "high": high,
+        "low": low,
+        "close": close,
+        "volume": volume.astype(float),
+    })
+    return bars.drop(index=list(drop)).reset_index(drop=True)
+
+
+@pytest.fixture
+def makeBars():
+    """randomBars, as a fixture so every test module shares one bar factory."""
+    return randomBars
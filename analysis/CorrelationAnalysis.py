@@ -1,11 +1,19 @@
+import os
+
 import pandas as pd
 
+from strategies.TqsKernel import componentCounts
+
 class CorrelationAnalysis:
     def __init__(self, signalLogPath: str):
         self.signalLogPath = signalLogPath
 
     def loadSignals(self) -> pd.DataFrame:
-        df = pd.read_csv(self.signalLogPath)
+        """Reads the signal log written by SignalSink, either a CSV file or a Parquet directory."""
+        if os.path.isdir(self.signalLogPath) or self.signalLogPath.endswith(".parquet"):
+            df = pd.read_parquet(self.signalLogPath)
+        else:
+            df = pd.read_csv(self.signalLogPath)
         df["timestamp"] = pd.to_datetime(df["timestamp"])
         return df
 
@@ -25,14 +33,18 @@ class CorrelationAnalysis:
         return merged["score"].corr(merged[outcomeColumn].pct_change().fillna(0))
 
     def analyzeByComponent(self):
+        """How often each TQS reason fired, most frequent first."""
         df = self.loadSignals()
-        # Each component encoded as "1.0: MACD aligned"
-        componentCounts = {}
+        if "mask" in df.columns:
+            return componentCounts(df["mask"].to_numpy(dtype="int64"))
+
+        # Logs written before the mask column: each component encoded as "1.0: MACD aligned"
+        counts = {}
         for row in df["breakdown"]:
             parts = [p.strip() for p in row.split(";")]
             for p in parts:
                 if ":" in p:
                     component = p.split(":", 1)[1].strip()
-                    componentCounts[component] = componentCounts.get(component, 0) + 1
+                    counts[component] = counts.get(component, 0) + 1
 
-        return dict(sorted(componentCounts.items(), key=lambda item: item[1], reverse=True))
+        return dict(sorted(counts.items(), key=lambda item: item[1], reverse=True))
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+from utils.DataCleaner import DataCleaner
+
+SENTIMENT_LABELS = ["positive", "negative", "neutral"]
+
+
+def toEpochNsArray(times):
+    """Vectorized DataCleaner.toEpochNs for a column/array of timestamps (naive means UTC)."""
+    index = pd.DatetimeIndex(pd.to_datetime(times))
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.as_unit("ns").asi8
+
+
+def labelsFromScores(scores):
+    """Map signed sentiment scores (+ / - / 0) onto SENTIMENT_LABELS indices."""
+    scores = np.asarray(scores, dtype="float64")
+    return np.where(scores > 0, 0, np.where(scores < 0, 1, 2))
+
+
+class SentimentIndex:
+    """
+    Headline sentiment bucketed onto a price index as cumulative per-bar counts.
+
+    cumulative[i + 1] holds the positive/negative/neutral counts of every headline published
+    at or before bar i's timestamp (cumulative[0] is all zeros), so the counts for bars
+    startBar..endBar inclusive are cumulative[endBar + 1] - cumulative[startBar]: two row reads,
+    whatever the window length. startBar = 0 also takes in headlines from before the first bar.
+    """
+
+    def __init__(self, barTimes, eventTimes, eventLabels):
+        """
+        :param barTimes: bar timestamps of the price frame, ascending
+        :param eventTimes: headline publish times
+        :param eventLabels: index into SENTIMENT_LABELS per headline
+        """
+        self.barTimes = toEpochNsArray(barTimes)
+        eventTimes = toEpochNsArray(eventTimes)
+        eventLabels = np.asarray(eventLabels, dtype="int64")
+
+        self.cumulative = np.zeros((len(self.barTimes) + 1, len(SENTIMENT_LABELS)), dtype="int64")
+        for label in range(len(SENTIMENT_LABELS)):
+            times = np.sort(eventTimes[eventLabels == label])
+            self.cumulative[1:, label] = np.searchsorted(times, self.barTimes, side="right")
+
+    @classmethod
+    def fromHeadlines(cls, headlines, barTimes):
+        """Headline dicts as served by NewsData/NewsStore, with 'created' and a 'sentiment' label."""
+        times, labels = [], []
+        for headline in headlines:
+            label = headline.get("sentiment", "").lower()
+            published = headline.get("created") or headline.get("published")
+            if label in SENTIMENT_LABELS and published:
+                times.append(DataCleaner.toEpochNs(published))
+                labels.append(SENTIMENT_LABELS.index(label))
+        return cls(barTimes, np.asarray(times, dtype="int64"), labels)
+
+    @classmethod
+    def fromFrame(cls, sentimentData, barTimes, timeColumn="datetime", scoreColumn="sentiment_score"):
+        """Scored sentiment rows (e.g. analyzeSentiment output): the score's sign gives the label."""
+        return cls(barTimes, sentimentData[timeColumn], labelsFromScores(sentimentData[scoreColumn]))
+
+    def __len__(self):
+        return len(self.barTimes)
+
+    def barIndex(self, timestamp):
+        """Index of the last bar at or before timestamp (-1 if it precedes every bar)."""
+        return int(np.searchsorted(self.barTimes, DataCleaner.toEpochNs(timestamp), side="right")) - 1
+
+    def countsArray(self, startBar, endBar):
+        return self.cumulative[endBar + 1] - self.cumulative[max(startBar, 0)]
+
+    def counts(self, startBar, endBar):
+        """Same shape as SentimentAnalysis.analyzeHeadlines, for bars startBar..endBar inclusive."""
+        return dict(zip(SENTIMENT_LABELS, self.countsArray(startBar, endBar).tolist()))
+
+    def biasDirection(self, startBar, endBar):
+        """+1.0 bullish, -1.0 bearish, 0.0 mixed; same rule as SentimentAnalysis.scoreBiasDirection."""
+        pos, neg, _ = self.countsArray(startBar, endBar)
+        return float(np.sign(pos - neg))
+
+    def biasBetween(self, start, end):
+        """biasDirection for the bars stamped in [start, end]."""
+        startBar = int(np.searchsorted(self.barTimes, DataCleaner.toEpochNs(start), side="left"))
+        return self.biasDirection(startBar, self.barIndex(end))
+
+    def rollingCounts(self, lookbackBars):
+        """Counts over the trailing lookbackBars bars ending at every bar, as one DataFrame."""
+        ends = np.arange(1, len(self.barTimes) + 1)
+        starts = np.maximum(ends - lookbackBars, 0)
+        return pd.DataFrame(self.cumulative[ends] - self.cumulative[starts], columns=SENTIMENT_LABELS)
+
+    def rollingBias(self, lookbackBars):
+        window = self.rollingCounts(lookbackBars)
+        return np.sign(window["positive"].to_numpy() - window["negative"].to_numpy()).astype("float64")
+
+
+def mergeSentimentAsof(priceData, sentimentData, timeColumn="datetime", scoreColumn="sentiment_score", tolerance=None):
+    """
+    Attach to every price row the latest sentiment score at or before its timestamp, in one
+    merge_asof pass instead of a per-row lookup. Rows with no earlier sentiment get 0.
+
+    :param tolerance: optional pd.Timedelta; older sentiment than this is ignored
+    """
+    prices = priceData.copy()
+    prices["_key"] = toEpochNsArray(prices[timeColumn])
+    scores = pd.DataFrame({
+        "_key": toEpochNsArray(sentimentData[timeColumn]),
+        scoreColumn: sentimentData[scoreColumn].to_numpy()
+    }).sort_values("_key", kind="stable")
+
+    order = np.argsort(prices["_key"].to_numpy(), kind="stable")
+    merged = pd.merge_asof(
+        prices.iloc[order].drop(columns=[scoreColumn], errors="ignore"),
+        scores,
+        on="_key",
+        direction="backward",
+        tolerance=None if tolerance is None else int(pd.Timedelta(tolerance).value)
+    )
+    merged[scoreColumn] = merged[scoreColumn].fillna(0)
+    merged = merged.iloc[np.argsort(order, kind="stable")].drop(columns="_key")
+    merged.index = priceData.index
+    return merged
@@ -0,0 +1,147 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from config import config
+
+log = logging.getLogger(__name__)
+
+TEXT_COLUMNS = ["headline", "title"]
+TIME_COLUMNS = ["datetime", "publishedAt", "created", "published"]
+
+
+def headlineHash(text):
+    """Content key for a headline: whitespace-normalized text, so reposts of the same text share it."""
+    return hashlib.sha1(" ".join(str(text).split()).encode("utf-8")).hexdigest()
+
+
+def polarityLabel(polarity):
+    if polarity > 0:
+        return "positive"
+    if polarity < 0:
+        return "negative"
+    return "neutral"
+
+
+def _scoreBatch(items):
+    """Worker entry point: TextBlob polarity for a batch of (hash, text) pairs."""
+    from textblob import TextBlob
+    return [(key, TextBlob(text).sentiment.polarity) for key, text in items]
+
+
+class SentimentScorer:
+    """
+    TextBlob headline polarity with a content-addressed on-disk cache.
+
+    Headlines are deduplicated by headlineHash, cached polarities are read from SQLite, and only
+    unseen text is scored: in batches across a process pool when there is more than one batch,
+    inline otherwise. Results are written to the cache as each batch completes, so repeated and
+    overlapping backtests never rescore the same text.
+    """
+
+    def __init__(self, cachePath=None, batchSize=256, maxWorkers=None):
+        self.cachePath = cachePath or config.SENTIMENT_CACHE_PATH
+        self.batchSize = batchSize
+        self.maxWorkers = maxWorkers
+        self.lock = threading.Lock()
+        if os.path.dirname(self.cachePath):
+            os.makedirs(os.path.dirname(self.cachePath), exist_ok=True)
+        self.conn = sqlite3.connect(self.cachePath, check_same_thread=False)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS polarity (hash TEXT PRIMARY KEY, polarity REAL NOT NULL) WITHOUT ROWID")
+        self.scoredCount = 0
+
+    def _cached(self, keys):
+        found = {}
+        keys = list(keys)
+        with self.lock:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self.conn.execute(
+                    f"SELECT hash, polarity FROM polarity WHERE hash IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update(rows)
+        return found
+
+    def _store(self, scored):
+        with self.lock, self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO polarity VALUES (?, ?)", scored)
+        self.scoredCount += len(scored)
+
+    def iterPolarity(self, texts):
+        """
+        Yield (hash, polarity) for every distinct text: cached ones first, then each new batch
+        as soon as it is scored and stored.
+        """
+        unique = {}
+        for text in texts:
+            unique.setdefault(headlineHash(text), str(text))
+
+        cached = self._cached(unique)
+        yield from cached.items()
+
+        missing = [(key, text) for key, text in unique.items() if key not in cached]
+        if not missing:
+            return
+        batches = [missing[i:i + self.batchSize] for i in range(0, len(missing), self.batchSize)]
+        log.info(f"Scoring {len(missing)} new headlines ({len(cached)} cached) in {len(batches)} batches")
+
+        if len(batches) == 1:
+            scored = _scoreBatch(batches[0])
+            self._store(scored)
+            yield from scored
+            return
+
+        with ProcessPoolExecutor(max_workers=self.maxWorkers) as pool:
+            for future in as_completed([pool.submit(_scoreBatch, batch) for batch in batches]):
+                scored = future.result()
+                self._store(scored)
+                yield from scored
+
+    def polarities(self, texts):
+        """Polarity per input text, in input order (duplicates share one score)."""
+        texts = list(texts)
+        byHash = dict(self.iterPolarity(texts))
+        return [byHash[headlineHash(text)] for text in texts]
+
+    def scoreHeadlines(self, headlines):
+        """Headline dicts (NewsData/NewsStore shape) with 'polarity' and a 'sentiment' label added."""
+        texts = [h.get("title") or h.get("headline") or "" for h in headlines]
+        return [
+            {**headline, "polarity": polarity, "sentiment": polarityLabel(polarity)}
+            for headline, polarity in zip(headlines, self.polarities(texts))
+        ]
+
+    def scoreNews(self, newsData):
+        """
+        Score a news frame (or list of article dicts) into time-sorted sentiment rows with
+        'datetime', 'headline', 'polarity', 'sentiment' and 'sentiment_score' (= polarity).
+        """
+        news = pd.DataFrame(newsData)
+        columns = ["datetime", "headline", "polarity", "sentiment", "sentiment_score"]
+        if news.empty:
+            return pd.DataFrame(columns=columns)
+
+        textColumn = next((c for c in TEXT_COLUMNS if c in news.columns), None)
+        timeColumn = next((c for c in TIME_COLUMNS if c in news.columns), None)
+        if textColumn is None or timeColumn is None:
+            raise ValueError(f"News data needs one of {TEXT_COLUMNS} and one of {TIME_COLUMNS}; got {list(news.columns)}")
+
+        texts = news[textColumn].fillna("").astype(str)
+        polarity = pd.Series(self.polarities(texts), index=news.index, dtype="float64")
+        scored = pd.DataFrame({
+            "datetime": pd.to_datetime(news[timeColumn], utc=True),
+            "headline": texts,
+            "polarity": polarity,
+            "sentiment": polarity.map(polarityLabel),
+            "sentiment_score": polarity
+        })
+        return scored.sort_values("datetime", kind="stable").reset_index(drop=True)
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,96 @@
+"""
+Seeded synthetic market data for offline benchmarks.
+
+Bars follow a random walk on a 0.25 tick grid with session structure matching
+strategies.LiquidityZones.SESSION_HOURS (UTC): quiet Asian hours, a livelier London
+session and the most volatile, highest-volume New York session, a daily 21:00-22:00 UTC
+maintenance break and no weekend bars, so session zones and sweeps behave like real data.
+"""
+import numpy as np
+import pandas as pd
+
+TICK_SIZE = 0.25
+INTERVAL_MINUTES = {"1m": 1, "5m": 5, "30m": 30}
+
+# (start hour, end hour, volatility multiplier, volume multiplier) in UTC
+SESSION_PROFILE = [
+    (0.0, 8.0, 0.6, 0.5),     # asian
+    (8.0, 12.0, 1.0, 1.0),    # london
+    (12.0, 18.5, 1.5, 2.0),   # ny
+    (18.5, 24.0, 0.4, 0.3),   # evening
+]
+MAINTENANCE_HOURS = (21.0, 22.0)
+
+
+def _sessionProfile(hours):
+    volatility = np.ones(len(hours))
+    volume = np.ones(len(hours))
+    for start, end, volMultiplier, volumeMultiplier in SESSION_PROFILE:
+        inSession = (hours >= start) & (hours < end)
+        volatility[inSession] = volMultiplier
+        volume[inSession] = volumeMultiplier
+    return volatility, volume
+
+
+def barTimes(interval="1m", days=5, start="2024-01-02"):
+    """Bar open times (naive UTC) covering `days` weekdays from start, skipping the maintenance break."""
+    minutes = INTERVAL_MINUTES[interval]
+    weekdays = pd.bdate_range(start, periods=days)
+    perDay = pd.timedelta_range(0, periods=24 * 60 // minutes, freq=f"{minutes}min")
+    times = (weekdays.values[:, None] + perDay.values[None, :]).ravel()
+    hours = (times - times.astype("datetime64[D]")).astype("timedelta64[m]").astype(np.int64) / 60.0
+    keep = ~((hours >= MAINTENANCE_HOURS[0]) & (hours < MAINTENANCE_HOURS[1]))
+    return pd.DatetimeIndex(times[keep])
+
+
+def generateBars(interval="1m", days=5, seed=0, start="2024-01-02", startPrice=5000.0):
+    """
+    :return: DataFrame with timestamp (ISO string, as BacktestRunner takes it), datetime,
+             open/high/low/close on the tick grid, and volume
+    """
+    rng = np.random.default_rng(seed)
+    times = barTimes(interval, days, start)
+    n = len(times)
+    hours = times.hour + times.minute / 60.0
+    volatility, volumeProfile = _sessionProfile(np.asarray(hours))
+    barScale = np.sqrt(INTERVAL_MINUTES[interval])
+
+    steps = rng.normal(0.0, 0.75, size=n) * volatility * barScale
+    close = startPrice + np.cumsum(steps)
+    close = np.round(close / TICK_SIZE) * TICK_SIZE
+    open_ = np.concatenate([[startPrice], close[:-1]])
+    wick = np.abs(rng.normal(0.0, 0.5, size=(2, n))) * volatility * barScale
+    high = np.maximum(open_, close) + np.round(wick[0] / TICK_SIZE) * TICK_SIZE
+    low = np.minimum(open_, close) - np.round(wick[1] / TICK_SIZE) * TICK_SIZE
+
+    volume = rng.lognormal(mean=5.0, sigma=0.4, size=n) * volumeProfile * INTERVAL_MINUTES[interval]
+    spikes = rng.random(n) < 0.02
+    volume[spikes] *= rng.uniform(2.0, 5.0, size=spikes.sum())
+
+    return pd.DataFrame({
+        "timestamp": times.strftime("%Y-%m-%dT%H:%M:%S"),
+        "datetime": times,
+        "open": open_,
+        "high": high,
+        "low": low,
+        "close": close,
+        "volume": np.round(volume),
+    })
+
+
+def generateTicks(numTicks=10_000, seed=0, startPrice=5000.0):
+    """Quote ticks ({'last', 'bid', 'ask', 'volume'}) stepping by whole ticks."""
+    rng = np.random.default_rng(seed)
+    last = startPrice + np.cumsum(rng.choice([-1, 0, 0, 1], size=numTicks)) * TICK_SIZE
+    volume = rng.integers(1, 20, size=numTicks)
+    return [
+        {"last": float(price), "bid": float(price - TICK_SIZE), "ask": float(price), "volume": float(size)}
+        for price, size in zip(last, volume)
+    ]
+
+
+def generateTradeLog(numTrades=200, winRate=0.45, seed=0):
+    """Trade log rows in the shape MonteCarlo.run reads."""
+    rng = np.random.default_rng(seed)
+    wins = rng.random(numTrades) < winRate
+    return [{"outcome": "WIN" if win else "LOSS"} for win in wins]
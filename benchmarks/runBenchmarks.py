@@ -0,0 +1,356 @@
+"""
+Offline benchmark suite for the scoring pipeline.
+
+    python -m benchmarks.runBenchmarks                      # all cases, compare with baseline.json
+    python -m benchmarks.runBenchmarks --sizes small,medium --cases BacktestRunner
+    python -m benchmarks.runBenchmarks --updateBaseline     # store this machine's numbers
+
+Every case runs on seeded synthetic data (benchmarks.SyntheticData), takes the best of
+--repeat runs, and is written to --output as JSON. Cases slower than the baseline by more
+than --threshold are reported as regressions (exit status 1 with --failOnRegression).
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.SyntheticData import generateBars, generateTicks, generateTradeLog
+
+log = logging.getLogger("benchmarks")
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(BENCHMARK_DIR, "results", "latest.json")
+
+# size -> (bar interval, weekdays of data)
+SIZES = {
+    "small": ("1m", 1),
+    "medium": ("5m", 20),
+    "large": ("30m", 500),
+    "year1m": ("1m", 260),
+}
+
+EVALUATOR_INPUTS = {
+    "ev": 0.4,
+    "rvol": 1.6,
+    "macdAligned": True,
+    "rsiAligned": False,
+    "biasAligned": True,
+    "vixInRange": False,
+}
+
+_barsCache = {}
+
+
+def bars(size):
+    if size not in _barsCache:
+        interval, days = SIZES[size]
+        _barsCache[size] = generateBars(interval, days, seed=42)
+    return _barsCache[size]
+
+
+class _NullSink:
+    def write(self, *row, symbol=None):
+        pass
+
+
+# ---- Cases: each takes a size and returns (work callable, units processed, unit name) ----
+
+def backtestLoop(size):
+    from Backtester.BacktestRunner import BacktestEngine
+    frame = bars(size)
+    return lambda: BacktestEngine(frame, EVALUATOR_INPUTS).run(), len(frame), "bars"
+
+
+def backtestColumnar(size):
+    from Backtester.BacktestRunner import BacktestEngine
+    frame = bars(size)
+    return lambda: BacktestEngine(frame, EVALUATOR_INPUTS, mode="columnar").run(), len(frame), "bars"
+
+
+def priceBuffer(size):
+    from utils.PriceBuffer import PriceBuffer
+    records = bars(size)[["timestamp", "open", "high", "low", "close", "volume"]].to_dict("records")
+
+    def work():
+        buffer = PriceBuffer()
+        for bar in records:
+            buffer.updateFromBar(bar)
+            buffer.getBars()
+    return work, len(records), "bars"
+
+
+def ringPriceBuffer(size):
+    from utils.PriceBuffer import RingPriceBuffer
+    records = bars(size)[["timestamp", "open", "high", "low", "close", "volume"]].to_dict("records")
+
+    def work():
+        buffer = RingPriceBuffer()
+        for bar in records:
+            buffer.updateFromBar(bar)
+            buffer.arrays()
+    return work, len(records), "bars"
+
+
+def donchianZones(size):
+    from strategies.DonchianZones import DonchianZones
+    records = bars(size)[["timestamp", "high", "low"]].to_dict("records")
+    windows = [records[max(0, i - 500):i + 1] for i in range(0, len(records), 10)]
+
+    def work():
+        for window in windows:
+            DonchianZones(window).getRange()
+    return work, len(windows), "windows"
+
+
+def streamingDonchianZones(size):
+    from strategies.DonchianZones import StreamingDonchianZones
+    records = bars(size)[["timestamp", "high", "low"]].to_dict("records")
+
+    def work():
+        zones = StreamingDonchianZones()
+        for bar in records:
+            zones.update(bar)
+            zones.getRange()
+    return work, len(records), "bars"
+
+
+def liquidityZones(size):
+    from strategies.LiquidityZones import LiquidityZones
+    frame = bars(size)
+    records = frame[["timestamp", "high", "low"]].to_dict("records")
+    windows = [records[max(0, i - 500):i + 1] for i in range(0, len(records), 10)]
+    anchors = [frame["datetime"].iloc[i].to_pydatetime() for i in range(0, len(records), 10)]
+
+    def work():
+        for window, now in zip(windows, anchors):
+            LiquidityZones(window, now=now).detectSweep(window[-1]["low"], "londonLow")
+    return work, len(windows), "windows"
+
+
+def sessionZoneIndex(size):
+    from strategies.LiquidityZones import SessionZoneIndex
+    frame = bars(size)
+    return lambda: SessionZoneIndex.fromFrame(frame).zoneColumn("londonLow"), len(frame), "bars"
+
+
+def monteCarlo(size):
+    from Backtester.MonteCarlo import MonteCarlo
+    trades = generateTradeLog({"small": 100, "medium": 500, "large": 2000, "year1m": 5000}[size], seed=42)
+    return lambda: MonteCarlo.run(trades, numSimulations=1000, seed=7), len(trades) * 1000, "trade-paths"
+
+
+def fillSimulator(size):
+    import numpy as np
+    import pandas as pd
+    from Backtester.FillSimulator import FillSimulator
+    frame = bars(size)
+    rng = np.random.default_rng(42)
+    signalIdx = np.sort(rng.choice(len(frame) - 1, size=len(frame) // 2, replace=False))
+    signals = pd.DataFrame({
+        "timestamp": frame["timestamp"].iloc[signalIdx].to_numpy(),
+        "direction": rng.choice([-1, 1], size=len(signalIdx)),
+    })
+    return (lambda: FillSimulator(frame, maxHoldBars=200).simulate(signals, stopPoints=4.0)), len(signals), "signals"
+
+
+def featureSweep(size):
+    import tempfile
+    import numpy as np
+    from Backtester.FeatureStore import FeatureStore, sweep
+    from Backtester.FillSimulator import FillSimulator
+    frame = bars(size)
+    matrix = FeatureStore(tempfile.mkdtemp(prefix="features-")).load(frame, "BENCH", SIZES[size][0])
+    simulator = FillSimulator(frame, maxHoldBars=200)
+    grid = {"threshold": list(np.arange(0.5, 5.01, 0.25)), "ev": [0.0, 0.2, 0.5], "biasAligned": [False, True],
+            "vixInRange": [False, True]}
+    configs = len(grid["threshold"]) * 12
+    return (lambda: sweep(matrix, grid, simulator)), configs, "configs"
+
+
+class _ColumnarEngine:
+    """
+    Offline stand-in for BacktestEngine.Engine (whose news scraper and scanner stack needs the network):
+    each window is scored with the columnar TQS kernel at config.tqsThreshold and filled by FillSimulator.
+    """
+
+    def __init__(self, config, cache=None):
+        self.config = config
+
+    def runBacktest(self, symbol, startDate, endDate, priceData=None, sentimentData=None, writeTrades=True, runId=None):
+        from Backtester.FillSimulator import summarize
+        from Backtester.MonteCarlo import MonteCarlo
+        from Backtester.PortfolioBacktester import scanSymbol
+        from config import config as settings
+        trades = scanSymbol(priceData.reset_index(drop=True), symbol, EVALUATOR_INPUTS, self.config.tqsThreshold,
+                            settings.DEFAULT_SWEEP_ZONE)
+        tradeLog, finalBalance, winRate, ev = summarize(trades)
+        return {
+            "finalBalance": finalBalance,
+            "winRate": winRate,
+            "expectedValue": ev,
+            "monteCarlo": MonteCarlo.run(tradeLog, numSimulations=200, seed=7),
+            "runId": runId if writeTrades else None,
+        }
+
+
+def rollingBacktester(size):
+    # runWalkForward end to end (SharedFrame publish, process pool, per-window jobs) with the
+    # Engine swapped for _ColumnarEngine; pool workers fork after the swap and inherit it
+    import types
+    from types import SimpleNamespace
+    from Backtester.RollingBacktester import DEFAULT_PARAM_GRID, RollingBacktester
+    frame = bars(size)
+    interval = SIZES[size][0]
+
+    class SyntheticRollingBacktester(RollingBacktester):
+        def _load_data(self):
+            self.priceInterval = interval
+            self.priceData = frame
+
+    engineModule = types.ModuleType("Backtester.BacktestEngine")
+    engineModule.Engine = _ColumnarEngine
+    config = SimpleNamespace(useSentiment=False, tqsThreshold=5.0)
+    backtester = SyntheticRollingBacktester("BENCH", frame["datetime"].min(), frame["datetime"].max(), config,
+                                            trainWindowMonths=3, testWindowMonths=1, cache=False)
+    windows = len(list(backtester._generateWindows()))
+
+    def work():
+        saved = sys.modules.get("Backtester.BacktestEngine")
+        sys.modules["Backtester.BacktestEngine"] = engineModule
+        try:
+            backtester.runWalkForward(maxWorkers=min(4, os.cpu_count() or 1))
+        finally:
+            if saved is None:
+                sys.modules.pop("Backtester.BacktestEngine", None)
+            else:
+                sys.modules["Backtester.BacktestEngine"] = saved
+    return work, windows * (len(DEFAULT_PARAM_GRID["tqsThreshold"]) + 1), "window runs"
+
+
+def liveOnTick(size):
+    from live.LiveSignalRunner import LiveSignalRunner
+    ticks = generateTicks({"small": 2_000, "medium": 10_000, "large": 50_000, "year1m": 100_000}[size], seed=42)
+    logging.getLogger("LiveSignal").setLevel(logging.WARNING)
+
+    def work():
+        runner = LiveSignalRunner(EVALUATOR_INPUTS, sink=_NullSink(), symbol="BENCH")
+        for tick in ticks:
+            runner.onTick(tick)
+    return work, len(ticks), "ticks"
+
+
+CASES = {
+    "BacktestRunner.loop": (backtestLoop, ["small", "medium"]),
+    "BacktestRunner.columnar": (backtestColumnar, ["small", "medium", "large", "year1m"]),
+    "PriceBuffer": (priceBuffer, ["small", "medium"]),
+    "RingPriceBuffer": (ringPriceBuffer, ["small", "medium", "large"]),
+    "DonchianZones": (donchianZones, ["small", "medium"]),
+    "StreamingDonchianZones": (streamingDonchianZones, ["small", "medium", "large"]),
+    "LiquidityZones": (liquidityZones, ["small", "medium"]),
+    "SessionZoneIndex": (sessionZoneIndex, ["small", "medium", "large", "year1m"]),
+    "MonteCarlo.run": (monteCarlo, ["small", "medium", "large"]),
+    "FillSimulator": (fillSimulator, ["medium", "large", "year1m"]),
+    "FeatureStore.sweep": (featureSweep, ["medium", "large"]),
+    "RollingBacktester": (rollingBacktester, ["large"]),
+    "LiveSignalRunner.onTick": (liveOnTick, ["small", "medium"]),
+}
+
+
+def runCase(setup, size, repeat):
+    try:
+        work, units, unitName = setup(size)
+    except Exception as e:
+        return {"skipped": f"{type(e).__name__}: {e}"}
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        work()
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return {"seconds": best, "units": units, "unit": unitName, "perSecond": units / best if best else None}
+
+
+def compare(results, baseline, threshold):
+    """Attach baseline seconds and ratio to each result; return the keys that regressed."""
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get("cases", {}).get(key, {})
+        if "seconds" not in result or "seconds" not in reference:
+            continue
+        result["baselineSeconds"] = reference["seconds"]
+        result["ratio"] = result["seconds"] / reference["seconds"]
+        if result["ratio"] > 1 + threshold:
+            regressions.append(key)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HedgeFundLite offline benchmarks")
+    parser.add_argument("--cases", default=None, help="Comma-separated case name prefixes (default: all)")
+    parser.add_argument("--sizes", default=None, help=f"Comma-separated sizes from {list(SIZES)} (default: per case)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--updateBaseline", action="store_true", help="Write this run as the new baseline")
+    parser.add_argument("--failOnRegression", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    prefixes = args.cases.split(",") if args.cases else None
+    sizes = set(args.sizes.split(",")) if args.sizes else None
+
+    results = {}
+    for name, (setup, caseSizes) in CASES.items():
+        if prefixes and not any(name.startswith(prefix) for prefix in prefixes):
+            continue
+        for size in caseSizes:
+            if sizes and size not in sizes:
+                continue
+            key = f"{name}[{size}]"
+            results[key] = runCase(setup, size, args.repeat)
+            result = results[key]
+            if "skipped" in result:
+                log.info(f"{key:<36} skipped ({result['skipped']})")
+            else:
+                log.info(f"{key:<36} {result['seconds']:9.4f}s  {result['perSecond']:>14,.0f} {result['unit']}/s")
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+
+    report = {
+        "createdAt": datetime.utcnow().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "machine": platform.platform(),
+        "repeat": args.repeat,
+        "threshold": args.threshold,
+        "cases": results,
+        "regressions": regressions,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    log.info(f"Results written to {args.output}")
+
+    if args.updateBaseline:
+        with open(args.baseline, "w") as f:
+            json.dump({key: value for key, value in report.items() if key != "regressions"}, f, indent=2)
+        log.info(f"Baseline updated: {args.baseline}")
+
+    for key in regressions:
+        result = results[key]
+        log.warning(f"REGRESSION {key}: {result['seconds']:.4f}s vs baseline {result['baselineSeconds']:.4f}s (x{result['ratio']:.2f})")
+    return 1 if regressions and args.failOnRegression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
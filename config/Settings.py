@@ -0,0 +1,92 @@
+import importlib
+import logging
+import os
+import signal
+import threading
+from dataclasses import dataclass
+
+from dotenv import load_dotenv
+
+from config import config
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Immutable snapshot of the live-signal settings from config/config.py."""
+    tradeThreshold: float
+    watchlistThreshold: float
+    sweepZone: str
+    logPath: str
+
+    @classmethod
+    def fromConfig(cls, module=config):
+        return cls(
+            tradeThreshold=float(module.TQS_TRADE_THRESHOLD),
+            watchlistThreshold=float(module.TQS_WATCHLIST_THRESHOLD),
+            sweepZone=module.DEFAULT_SWEEP_ZONE,
+            logPath=module.TQS_LOG_PATH
+        )
+
+    @classmethod
+    def load(cls, envPath=None):
+        """Re-read .env (overriding the process environment) and rebuild config/config.py."""
+        load_dotenv(envPath, override=True)
+        return cls.fromConfig(importlib.reload(config))
+
+
+class SettingsProvider:
+    """
+    Holds the current Settings. Readers take `provider.current` once and use that snapshot;
+    reload() builds a complete new Settings and swaps the reference in one assignment, so a
+    reader never sees thresholds from two different versions. Nothing here runs per tick.
+    """
+
+    def __init__(self, envPath=None, settings=None):
+        self.envPath = envPath
+        self.current = settings or Settings.fromConfig()
+        self._watcher = None
+        self._stopWatching = threading.Event()
+
+    def reload(self):
+        try:
+            updated = Settings.load(self.envPath)
+        except Exception:
+            log.exception("Settings reload failed; keeping the previous settings.")
+            return self.current
+
+        if updated != self.current:
+            log.info(f"Settings reloaded: {updated}")
+        self.current = updated
+        return updated
+
+    def installSighupHandler(self):
+        """Reload on SIGHUP (POSIX only; must be called from the main thread)."""
+        signal.signal(signal.SIGHUP, lambda signum, frame: self.reload())
+
+    def watchFile(self, path=".env", interval=2.0):
+        """Poll `path` on a daemon thread and reload whenever its modification time changes."""
+        def mtime():
+            try:
+                return os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                return None
+
+        def poll():
+            lastSeen = mtime()
+            while not self._stopWatching.wait(interval):
+                current = mtime()
+                if current != lastSeen:
+                    lastSeen = current
+                    self.reload()
+
+        self._stopWatching.clear()
+        self._watcher = threading.Thread(target=poll, name="SettingsWatcher", daemon=True)
+        self._watcher.start()
+
+    def stopWatching(self):
+        self._stopWatching.set()
+        if self._watcher:
+            self._watcher.join()
+            self._watcher = None
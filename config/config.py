@@ -20,3 +20,19 @@ DEFAULT_SWEEP_ZONE = os.getenv("TQS_SWEEP_ZONE", "londonLow")
 
 # Logging
 TQS_LOG_PATH = os.getenv("TQS_LOG_PATH", "signals_log.csv")
+
+# Local data caches
+PRICE_CACHE_DIR = os.getenv("PRICE_CACHE_DIR", ".cache/prices")
+NEWS_DB_PATH = os.getenv("NEWS_DB_PATH", ".cache/news.sqlite")
+SENTIMENT_CACHE_PATH = os.getenv("SENTIMENT_CACHE_PATH", ".cache/sentiment.sqlite")
+
+# Backtest results (partitioned Parquet trade logs)
+RESULTS_DIR = os.getenv("RESULTS_DIR", "results/store")
+
+# Memoized backtest results (in-memory LRU entries in front of the SQLite file)
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", ".cache/results.sqlite")
+RESULT_CACHE_ENTRIES = int(os.getenv("RESULT_CACHE_ENTRIES", 256))
+
+# Precomputed per-bar feature matrices for threshold/weight sweeps (most recently used kept per symbol/interval)
+FEATURE_STORE_DIR = os.getenv("FEATURE_STORE_DIR", ".cache/features")
+FEATURE_STORE_KEYS = int(os.getenv("FEATURE_STORE_KEYS", 8))
@@ -0,0 +1,153 @@
+import asyncio
+import json
+import logging
+
+import websockets
+
+from config import config
+from utils.Instrumentation import metrics, MetricsServer
+
+log = logging.getLogger(__name__)
+
+
+class SymbolFeed:
+    """
+    Per-symbol routing slot. Every tick is ingested immediately (cheap incremental state);
+    scoring runs on its own task against the latest tick only, so when scoring falls behind,
+    intermediate ticks are coalesced instead of queueing without bound. The scoring itself
+    runs on the loop's default executor, so a slow score never blocks the socket reader.
+    """
+
+    def __init__(self, symbol, runner):
+        self.symbol = symbol
+        self.runner = runner
+        self.latestTick = None
+        self.pending = asyncio.Event()
+        self.closing = False
+        self.received = 0
+        self.scored = 0
+        self.coalesced = 0
+
+    def push(self, tick):
+        self.received += 1
+        if not self.runner.ingestTick(tick):
+            return
+        if self.pending.is_set():
+            self.coalesced += 1
+        self.latestTick = tick
+        self.pending.set()
+
+    def close(self):
+        """Make scoreLoop score the tick still pending (if any) and return."""
+        self.closing = True
+        self.pending.set()
+
+    async def _score(self, tick):
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self.runner.scoreTick, tick)
+        except Exception:
+            log.exception(f"[{self.symbol}] Scoring failed")
+        self.scored += 1
+
+    async def scoreLoop(self):
+        while True:
+            await self.pending.wait()
+            self.pending.clear()
+            tick, self.latestTick = self.latestTick, None
+            if tick is not None:
+                await self._score(tick)
+            if self.closing and self.latestTick is None:
+                return
+
+
+class AsyncMarketDataClient:
+    """
+    Multiplexes md/subscribeQuote subscriptions for many symbols over one Tradovate websocket
+    and routes each quote to that symbol's runner (e.g. a LiveSignalRunner with its own buffer).
+
+    Quotes are expected as {"e": "quote", "d": {"symbol": ..., ...}}, like TradovateData.streamTicks.
+    """
+
+    def __init__(self, accessToken, wsUrl=None, connect=websockets.connect, metricsPort=None):
+        """
+        :param metricsPort: serve the metrics registry (live.ticks, live.tickToSignalSeconds, ...)
+                            at GET /metrics and /metrics.json on this local port while run() is
+                            active; 0 picks a free port (see metricsServer.port)
+        """
+        self.accessToken = accessToken
+        self.wsUrl = wsUrl or config.TRADOVATE_WS_URL
+        self.connect = connect
+        self.metricsPort = metricsPort
+        self.metricsServer = None
+        self.feeds = {}
+
+    def addSymbol(self, symbol, runner):
+        """
+        :param runner: object with ingestTick(tick) -> bool and scoreTick(tick). scoreTick runs on an
+                       executor thread while ingestTick keeps running on the loop, so the runner must
+                       guard the state both touch (LiveSignalRunner reads it under its stateLock)
+        """
+        self.feeds[symbol] = SymbolFeed(symbol, runner)
+
+    def stats(self):
+        return {
+            symbol: {"received": feed.received, "scored": feed.scored, "coalesced": feed.coalesced}
+            for symbol, feed in self.feeds.items()
+        }
+
+    def _route(self, message):
+        data = json.loads(message)
+        if data.get("e") != "quote" or "d" not in data:
+            return
+        tick = data["d"]
+        feed = self.feeds.get(tick.get("symbol"))
+        if feed is None:
+            log.debug(f"Quote for unsubscribed symbol {tick.get('symbol')}")
+            return
+        feed.push(tick)
+
+    @staticmethod
+    async def _closeOnStop(ws, stop):
+        await stop.wait()
+        await ws.close()
+
+    async def run(self, stop=None):
+        """
+        Connect, subscribe every added symbol and route quotes until the socket closes
+        or `stop` (an asyncio.Event) is set.
+        """
+        if self.metricsPort is not None:
+            metrics.enable()
+            self.metricsServer = MetricsServer(port=self.metricsPort).start()
+        for feed in self.feeds.values():
+            feed.closing = False
+        scorers = [asyncio.create_task(feed.scoreLoop()) for feed in self.feeds.values()]
+        try:
+            async with self.connect(self.wsUrl) as ws:
+                log.info(f"[Tradovate WS] Connected; subscribing {len(self.feeds)} symbols.")
+                await ws.send(json.dumps({"e": "authorize", "d": {"token": self.accessToken}}))
+                for symbol in self.feeds:
+                    await ws.send(json.dumps({"e": "md/subscribeQuote", "d": {"symbol": symbol}}))
+
+                stopper = asyncio.create_task(self._closeOnStop(ws, stop)) if stop else None
+                try:
+                    async for message in ws:
+                        self._route(message)
+                except websockets.ConnectionClosedError as e:
+                    log.warning(f"[Tradovate WS] Closed with error: {e}")
+                finally:
+                    if stopper:
+                        stopper.cancel()
+        finally:
+            # Each scorer finishes its current tick and scores whatever arrived last, one at a
+            # time per runner; anything still running after that (e.g. run() was cancelled) is cancelled
+            for feed in self.feeds.values():
+                feed.close()
+            try:
+                await asyncio.gather(*scorers, return_exceptions=True)
+            finally:
+                for task in scorers:
+                    task.cancel()
+                if self.metricsServer is not None:
+                    self.metricsServer.stop()
+                    self.metricsServer = None
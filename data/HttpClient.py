@@ -0,0 +1,94 @@
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+log = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TtlCache:
+    """Small thread-safe key/value cache whose entries expire ttlSeconds after being set."""
+
+    def __init__(self, ttlSeconds=3600, clock=time.monotonic):
+        self.ttlSeconds = ttlSeconds
+        self.clock = clock
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[1] <= self.clock():
+                self.entries.pop(key, None)
+                return default
+            return entry[0]
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (value, self.clock() + self.ttlSeconds)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class HttpClient:
+    """
+    Shared requests.Session with keep-alive connection pooling, retries with exponential
+    backoff on connection errors and 429/5xx (honouring Retry-After), and an optional
+    client-side request rate cap. Safe to use from several threads.
+    """
+
+    def __init__(self, headers=None, poolSize=10, retries=3, backoff=0.5, timeout=10, maxRequestsPerSecond=None):
+        self.timeout = timeout
+        self.session = requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=poolSize, pool_maxsize=poolSize, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.minInterval = 1.0 / maxRequestsPerSecond if maxRequestsPerSecond else 0.0
+        self.nextSlot = 0.0
+        self.rateLock = threading.Lock()
+
+    def _throttle(self):
+        if not self.minInterval:
+            return
+        with self.rateLock:
+            now = time.monotonic()
+            wait = self.nextSlot - now
+            self.nextSlot = max(now, self.nextSlot) + self.minInterval
+        if wait > 0:
+            time.sleep(wait)
+
+    def get(self, url, params=None, **kwargs):
+        """GET with pooling/retries. Returns the response; callers check resp.ok as before."""
+        self._throttle()
+        resp = self.session.get(url, params=params, timeout=kwargs.pop("timeout", self.timeout), **kwargs)
+        if resp.status_code == 429:
+            log.warning(f"Rate limited by {url} after retries (Retry-After: {resp.headers.get('Retry-After')})")
+        return resp
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,12 +1,22 @@
-import requests
 import websocket
 import threading
 import json
-from datetime import datetime
-from config.config import config  # Assuming config.py is in the config/ folder
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import pandas as pd
+
+from config import config
+from data.HttpClient import HttpClient, TtlCache
 
 class TradovateData:
-    def __init__(self, clientId: str, accessToken: str):
+    def __init__(self, clientId: str, accessToken: str, http: HttpClient = None,
+                 contractTtlSeconds=3600, historyChunk=timedelta(days=7), maxWorkers=4):
+        """
+        :param http: shared HttpClient; one with pooling and retries is created if omitted
+        :param contractTtlSeconds: how long the symbol -> contractId map is reused
+        :param historyChunk: long history ranges are split into chunks of this size and fetched concurrently
+        """
         self.clientId = clientId
         self.accessToken = accessToken
         self.baseUrl = config.TRADOVATE_BASE_URL
@@ -14,34 +24,78 @@ class TradovateData:
         self.headers = {
             "Authorization": f"Bearer {self.accessToken}"
         }
+        self.http = http or HttpClient(headers=self.headers)
+        self.contractIds = TtlCache(contractTtlSeconds)
+        self.historyChunk = historyChunk
+        self.maxWorkers = maxWorkers
 
-    def getHistoricalData(self, symbol: str, interval: str, start: str, end: str):
-        """
-        Fetch historical data from Tradovate.
+    def getContractId(self, symbol: str):
+        """Resolve a symbol via the cached /contracts map, refreshing it once on a miss or expiry."""
+        contractId = self.contractIds.get(symbol)
+        if contractId is not None:
+            return contractId
 
-        :param symbol: e.g., 'MNQU4'
-        :param interval: 'Minute', 'Daily', etc.
-        :param start: ISO 8601 timestamp (e.g., '2024-08-01T13:30:00Z')
-        :param end: ISO 8601 timestamp
-        :return: List of OHLCV bars
-        """
-        instrumentUrl = f"{self.baseUrl}/contracts"
-        r = requests.get(instrumentUrl, headers=self.headers)
-        contracts = r.json()
-        contractId = next((c['id'] for c in contracts if c['symbol'] == symbol), None)
+        r = self.http.get(f"{self.baseUrl}/contracts", headers=self.headers)
+        if not r.ok:
+            raise Exception(f"Failed to fetch contracts: {r.status_code} - {r.text}")
+        for c in r.json():
+            self.contractIds.set(c["symbol"], c["id"])
+
+        contractId = self.contractIds.get(symbol)
         if not contractId:
             raise ValueError(f"Symbol '{symbol}' not found in Tradovate contracts.")
+        return contractId
 
+    def _historyChunks(self, start: str, end: str):
+        chunkStart, rangeEnd = pd.Timestamp(start), pd.Timestamp(end)
+        while chunkStart < rangeEnd:
+            chunkEnd = min(chunkStart + self.historyChunk, rangeEnd)
+            yield chunkStart.strftime("%Y-%m-%dT%H:%M:%SZ"), chunkEnd.strftime("%Y-%m-%dT%H:%M:%SZ")
+            chunkStart = chunkEnd
+
+    def _getHistoryChunk(self, contractId, interval, start, end):
         url = f"{self.baseUrl}/md/history/{contractId}"
         params = {
             "startTimestamp": start,
             "endTimestamp": end,
             "interval": interval
         }
-        resp = requests.get(url, headers=self.headers, params=params)
+        resp = self.http.get(url, headers=self.headers, params=params)
         if not resp.ok:
             raise Exception(f"Failed to fetch historical data: {resp.status_code} - {resp.text}")
-        return resp.json()
+        payload = resp.json()
+        # The bars come back either as a bare list or wrapped as {"bars": [...]}
+        return payload.get("bars", []) if isinstance(payload, dict) else payload
+
+    def getHistoricalData(self, symbol: str, interval: str, start: str, end: str):
+        """
+        Fetch historical data from Tradovate.
+
+        :param symbol: e.g., 'MNQU4'
+        :param interval: 'Minute', 'Daily', etc.
+        :param start: ISO 8601 timestamp (e.g., '2024-08-01T13:30:00Z')
+        :param end: ISO 8601 timestamp
+        :return: List of OHLCV bars, the same shape however many chunks the range took
+        """
+        contractId = self.getContractId(symbol)
+        chunks = list(self._historyChunks(start, end)) or [(start, end)]
+        if len(chunks) == 1:
+            parts = [self._getHistoryChunk(contractId, interval, start, end)]
+        else:
+            with ThreadPoolExecutor(max_workers=self.maxWorkers) as pool:
+                parts = list(pool.map(lambda chunk: self._getHistoryChunk(contractId, interval, *chunk), chunks))
+
+        # Chunk edges may both include the boundary bar; keep the first copy
+        bars, seen = [], set()
+        for part in parts:
+            for bar in part:
+                key = bar.get("timestamp") if isinstance(bar, dict) else None
+                if key is not None:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                bars.append(bar)
+        return bars
 
     def streamTicks(self, symbol: str, callback):
         """
@@ -1,23 +1,35 @@
-import requests
+from data.HttpClient import HttpClient
 
 class NewsData:
-    def __init__(self, apiKey, baseUrl):
+    def __init__(self, apiKey, baseUrl, http: HttpClient = None):
         self.apiKey = apiKey
         self.baseUrl = baseUrl
+        self.http = http or HttpClient()
 
-    def getNews(self, symbol, startDate=None, endDate=None, pageSize=100):
+    def getNews(self, symbol, startDate=None, endDate=None, pageSize=100, page=0):
         params = {
             "token": self.apiKey,
             "symbols": symbol,
             "pageSize": pageSize,
+            "page": page,
         }
         if startDate:
             params["published_since"] = startDate
         if endDate:
             params["published_before"] = endDate
 
-        response = requests.get(self.baseUrl, params=params)
+        response = self.http.get(self.baseUrl, params=params)
         if not response.ok:
             raise Exception(f"Benzinga API error {response.status_code}: {response.text}")
 
         return response.json()
+
+    def getAllNews(self, symbol, startDate=None, endDate=None, pageSize=100, maxPages=100):
+        """Page through getNews until a short page comes back, so long ranges are not truncated."""
+        headlines = []
+        for page in range(maxPages):
+            batch = self.getNews(symbol, startDate, endDate, pageSize=pageSize, page=page)
+            headlines.extend(batch)
+            if len(batch) < pageSize:
+                break
+        return headlines
@@ -0,0 +1,199 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+from config import config
+
+log = logging.getLogger(__name__)
+
+DATE_FORMAT = "%Y-%m-%d"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS headlines (
+    symbol TEXT NOT NULL,
+    published INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (symbol, published, id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    symbol TEXT PRIMARY KEY,
+    start TEXT NOT NULL,
+    end TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS partial (
+    symbol TEXT PRIMARY KEY,
+    start TEXT NOT NULL,
+    end TEXT NOT NULL,
+    fetchedAt REAL NOT NULL
+);
+"""
+
+
+def publishedNs(headline):
+    """UTC epoch-ns publish time of a Benzinga headline, or None if it has no usable date."""
+    published = headline.get("created") or headline.get("published")
+    if not published:
+        return None
+    try:
+        ts = pd.Timestamp(published)
+    except (ValueError, TypeError):
+        return None
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return int(ts.as_unit("ns").value)
+
+
+def toUtcNs(value):
+    ts = pd.Timestamp(value)
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return int(ts.as_unit("ns").value)
+
+
+def toUtcNaive(value):
+    """Timestamp of value in naive UTC; naive values are taken to be UTC already."""
+    ts = pd.Timestamp(value)
+    return ts if ts.tzinfo is None else ts.tz_convert("UTC").tz_localize(None)
+
+
+class NewsStore:
+    """
+    Local SQLite store of Benzinga headlines keyed by (symbol, published time).
+
+    getNews(symbol, start, end) has the same shape as NewsData.getNews, so it can be handed to
+    BiasScoring in its place. Headlines are fetched once per day range: the covered date range
+    per symbol is recorded, only the missing head and the tail after the high-water mark are
+    downloaded (day slices fetched concurrently, each paged to exhaustion), and every query is
+    answered from the (symbol, published) primary-key index.
+    Today is never covered, since its headlines are still arriving; the last fetch from the
+    start of today on is reused for partialTtl seconds before it is fetched again.
+    Date ranges are start inclusive, end exclusive, like PriceCache.
+    """
+
+    def __init__(self, newsData=None, dbPath=None, maxWorkers=4, sliceDays=1, partialTtl=300.0):
+        """
+        :param newsData: object with getAllNews(symbol, start, end); defaults to a NewsData
+                         built from the Benzinga config
+        :param partialTtl: seconds a fetch of today's (incomplete) headlines is served before refetching
+        """
+        self.newsData = newsData
+        self.dbPath = dbPath or config.NEWS_DB_PATH
+        self.maxWorkers = maxWorkers
+        self.sliceDays = sliceDays
+        self.partialTtl = partialTtl
+        self.lock = threading.Lock()
+        if os.path.dirname(self.dbPath):
+            os.makedirs(os.path.dirname(self.dbPath), exist_ok=True)
+        self.conn = sqlite3.connect(self.dbPath, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+    def _getNewsData(self):
+        if self.newsData is None:
+            from data.NewsData import NewsData
+            self.newsData = NewsData(config.BENZINGA_API_KEY, config.BENZINGA_BASE_URL)
+        return self.newsData
+
+    def coverage(self, symbol):
+        with self.lock:
+            row = self.conn.execute("SELECT start, end FROM coverage WHERE symbol = ?", (symbol,)).fetchone()
+        return tuple(row) if row else None
+
+    def _partialIsFresh(self, symbol, start, end):
+        """True if [start, end) lies inside a fetch of the incomplete days made within partialTtl."""
+        with self.lock:
+            row = self.conn.execute("SELECT start, end, fetchedAt FROM partial WHERE symbol = ?", (symbol,)).fetchone()
+        if row is None:
+            return False
+        partialStart, partialEnd, fetchedAt = row
+        return partialStart <= start and end <= partialEnd and time.time() - fetchedAt < self.partialTtl
+
+    def _fetchRange(self, symbol, start, end):
+        """Download [start, end) as concurrent day slices and upsert the headlines."""
+        if start >= end:
+            return 0
+        edges = pd.date_range(start, end, freq=f"{self.sliceDays}D").strftime(DATE_FORMAT).tolist()
+        if edges[-1] != end:
+            edges.append(end)
+        slices = list(zip(edges[:-1], edges[1:]))
+        log.info(f"Fetching {symbol} news {start} to {end} in {len(slices)} slices")
+
+        newsData = self._getNewsData()
+        with ThreadPoolExecutor(max_workers=self.maxWorkers) as pool:
+            results = list(pool.map(lambda s: newsData.getAllNews(symbol, s[0], s[1]), slices))
+
+        rows = []
+        for headline in (h for batch in results for h in batch):
+            published = publishedNs(headline)
+            if published is None:
+                log.warning(f"Skipping {symbol} headline without a publish time: {headline.get('title')}")
+                continue
+            rows.append((symbol, published, str(headline.get("id", "")), json.dumps(headline)))
+        with self.lock, self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO headlines VALUES (?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def prefetch(self, symbol, start, end):
+        """Make sure [start, end) is stored, fetching only what lies outside the covered range."""
+        # Coverage is kept in UTC days, so aware bounds are converted before taking their dates
+        start = toUtcNaive(start).strftime(DATE_FORMAT)
+        endTs = toUtcNaive(end)
+        end = endTs.strftime(DATE_FORMAT) if endTs == endTs.normalize() else (endTs.normalize() + pd.Timedelta(days=1)).strftime(DATE_FORMAT)
+        # Today's headlines are still arriving, so coverage never extends past the start of today
+        coverEnd = min(end, datetime.utcnow().strftime(DATE_FORMAT))
+
+        covered = self.coverage(symbol)
+        fetchedTail = None
+        if covered is None:
+            fetchedAt = time.time()
+            self._fetchRange(symbol, start, end)
+            fetchedTail = (start, end, fetchedAt)
+            newStart, newEnd = start, max(start, coverEnd)
+        else:
+            cachedStart, highWater = covered
+            if start < cachedStart:
+                self._fetchRange(symbol, start, cachedStart)
+            # Past the high-water mark only incomplete days are left once it has reached today
+            if end > highWater and not (highWater >= coverEnd and self._partialIsFresh(symbol, highWater, end)):
+                fetchedAt = time.time()
+                self._fetchRange(symbol, highWater, end)
+                fetchedTail = (highWater, end, fetchedAt)
+            newStart, newEnd = min(start, cachedStart), max(highWater, coverEnd)
+
+        with self.lock, self.conn:
+            if covered != (newStart, newEnd):
+                self.conn.execute("INSERT OR REPLACE INTO coverage VALUES (?, ?, ?)", (symbol, newStart, newEnd))
+            if fetchedTail is not None and fetchedTail[1] > newEnd:
+                # Remember the part of this fetch that is not covered yet: from the new high-water mark on
+                self.conn.execute("INSERT OR REPLACE INTO partial VALUES (?, ?, ?, ?)",
+                                  (symbol, max(fetchedTail[0], newEnd), fetchedTail[1], fetchedTail[2]))
+
+    def getNews(self, symbol, startDate=None, endDate=None):
+        """
+        Headlines for symbol published in [startDate, endDate), oldest first.
+        startDate defaults to the start of the stored range, endDate to now.
+        """
+        covered = self.coverage(symbol)
+        if endDate is None:
+            endDate = pd.Timestamp.utcnow().tz_localize(None)
+        if startDate is None:
+            startDate = covered[0] if covered else pd.Timestamp(endDate).normalize()
+        self.prefetch(symbol, startDate, endDate)
+        return self.query(symbol, startDate, endDate)
+
+    def query(self, symbol, startDate, endDate):
+        """Stored headlines in [startDate, endDate) without touching the network."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT payload FROM headlines WHERE symbol = ? AND published >= ? AND published < ? ORDER BY published",
+                (symbol, toUtcNs(startDate), toUtcNs(endDate))
+            ).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,205 @@
+import json
+import logging
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from config import config
+from live.MarketHours import is_trading_day
+from utils.DataCleaner import OHLCV_COLUMNS, clean_ohlcv
+
+log = logging.getLogger(__name__)
+
+DATE_FORMAT = "%Y-%m-%d"
+
+
+class PriceCache:
+    """
+    On-disk cache of cleaned OHLCV bars per (symbol, interval), stored as one memory-mapped
+    .npy file per column plus a meta.json recording the covered date range. Each save writes a
+    new generation of column files and then swaps meta.json to point at it, so a reader always
+    sees one complete generation.
+
+    getHistoricalData(start, end) serves any range inside the covered one straight from disk and
+    only asks the fetcher for the missing head or tail. Bars are cleaned once, when fetched.
+    Date ranges follow the fetcher's convention: start inclusive, end exclusive.
+    """
+
+    def __init__(self, symbol, fetcher=None, interval="30m", cacheDir=None):
+        """
+        :param fetcher: object with getHistoricalData(start, end) returning raw OHLCV;
+                        defaults to PriceScraper(symbol)
+        """
+        self.symbol = symbol
+        self.interval = interval
+        self.fetcher = fetcher
+        safeSymbol = "".join(ch if ch.isalnum() else "_" for ch in symbol)
+        self.path = os.path.join(cacheDir or config.PRICE_CACHE_DIR, f"{safeSymbol}_{interval}")
+
+    def _getFetcher(self):
+        if self.fetcher is None:
+            from Scrapers.PriceScraper import PriceScraper
+            self.fetcher = PriceScraper(self.symbol)
+        return self.fetcher
+
+    def _loadMeta(self):
+        try:
+            with open(os.path.join(self.path, "meta.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _columnPath(self, column, generation):
+        # Caches written before generations were added have unversioned column files
+        name = f"{column}.npy" if generation is None else f"{column}.{generation}.npy"
+        return os.path.join(self.path, name)
+
+    def _loadBars(self, meta):
+        """Cached bars as a DataFrame built over read-only memory maps."""
+        generation = meta.get("generation")
+        data = {
+            column: np.load(self._columnPath(column, generation), mmap_mode="r")
+            for column in OHLCV_COLUMNS
+        }
+        times = pd.DatetimeIndex(data["datetime"].view("datetime64[ns]"))
+        data["datetime"] = times.tz_localize("UTC").tz_convert(meta["tz"]) if meta["tz"] else times
+        bars = pd.DataFrame(data)
+        bars.attrs["ohlcvCleaned"] = True
+        return bars
+
+    def _loadCached(self):
+        """(meta, bars) of the current generation, or (None, None) if nothing is cached yet."""
+        meta = self._loadMeta()
+        while meta is not None:
+            try:
+                return meta, self._loadBars(meta)
+            except FileNotFoundError:
+                # Pruned by later saves after meta was read; a newer meta names files that exist
+                latest = self._loadMeta()
+                if latest is None or latest.get("generation") == meta.get("generation"):
+                    raise
+                meta = latest
+        return None, None
+
+    def _saveMeta(self, meta):
+        tmpPath = os.path.join(self.path, f"meta.{os.getpid()}.tmp.json")
+        with open(tmpPath, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmpPath, os.path.join(self.path, "meta.json"))
+
+    def _saveBars(self, bars, start, end):
+        os.makedirs(self.path, exist_ok=True)
+        times = bars["datetime"]
+        tz = str(times.dt.tz) if times.dt.tz is not None else None
+        if tz:
+            times = times.dt.tz_convert("UTC").dt.tz_localize(None)
+
+        columns = {"datetime": times.to_numpy(dtype="datetime64[ns]").view("int64")}
+        for column in OHLCV_COLUMNS[1:]:
+            columns[column] = bars[column].to_numpy(dtype="float64")
+
+        # A new generation of column files, then meta.json swapped to it last, so readers never
+        # pair columns from two saves
+        generation = f"{time.time_ns()}-{os.getpid()}"
+        for column, values in columns.items():
+            np.save(self._columnPath(column, generation), values)
+
+        previous = self._loadMeta()
+        meta = {"symbol": self.symbol, "interval": self.interval, "start": start, "end": end, "tz": tz,
+                "rows": len(bars), "generation": generation}
+        self._saveMeta(meta)
+        # The generation just replaced stays on disk for readers that loaded its meta a moment ago
+        self._pruneGenerations(keep={generation, previous.get("generation") if previous else None})
+
+    def _pruneGenerations(self, keep):
+        for name in os.listdir(self.path):
+            column, _, rest = name.partition(".")
+            if column not in OHLCV_COLUMNS or not rest.endswith("npy"):
+                continue
+            generation = rest[:-len(".npy")] if rest != "npy" else None
+            if generation not in keep:
+                try:
+                    os.remove(os.path.join(self.path, name))
+                except FileNotFoundError:
+                    pass
+
+    @staticmethod
+    def _holdsNoSession(start, end):
+        """True if [start, end) has no trading day, so an empty fetch there is not a failure."""
+        return not any(is_trading_day(day.date()) for day in pd.date_range(start, end, inclusive="left"))
+
+    def _fetch(self, start, end):
+        log.info(f"Fetching {self.symbol} {self.interval} bars {start} to {end}")
+        raw = self._getFetcher().getHistoricalData(start, end)
+        return clean_ohlcv(raw, source_name="PriceCache")
+
+    def getLatestBars(self, start, end):
+        """
+        Cleaned bars for [start, end) straight from the fetcher, never written to the cache. For
+        the current session: its bars are still forming, and caching them would rewrite every
+        column file on each top-up.
+        """
+        start = pd.Timestamp(start).strftime(DATE_FORMAT)
+        end = pd.Timestamp(end).strftime(DATE_FORMAT)
+        bars = self._fetch(start, end)
+        return self._sliceRange(bars, start, end) if not bars.empty else bars
+
+    @staticmethod
+    def _sliceRange(bars, start, end):
+        times = bars["datetime"]
+        lower, upper = pd.Timestamp(start), pd.Timestamp(end)
+        if times.dt.tz is not None:
+            lower, upper = lower.tz_localize(times.dt.tz), upper.tz_localize(times.dt.tz)
+        sliced = bars[(times >= lower) & (times < upper)].reset_index(drop=True)
+        sliced.attrs["ohlcvCleaned"] = True
+        return sliced
+
+    def getHistoricalData(self, start, end):
+        """
+        :param start: 'YYYY-MM-DD' (or anything pd.Timestamp accepts), inclusive
+        :param end: 'YYYY-MM-DD', exclusive
+        :return: cleaned OHLCV DataFrame
+        """
+        start = pd.Timestamp(start).strftime(DATE_FORMAT)
+        end = pd.Timestamp(end).strftime(DATE_FORMAT)
+        # Today's bars are still forming, so coverage never extends past the start of today
+        coverEnd = min(end, datetime.utcnow().strftime(DATE_FORMAT))
+
+        meta, bars = self._loadCached()
+        if meta is None:
+            bars = self._fetch(start, end)
+            if not bars.empty:
+                self._saveBars(bars, start, max(start, coverEnd))
+            return self._sliceRange(bars, start, end) if not bars.empty else bars
+
+        cachedStart, cachedEnd = meta["start"], meta["end"]
+        # meta's start/end are the requested bounds fetched so far, not the first/last bar. An
+        # empty fetch is also how the fetcher reports a failure, so coverage only grows over
+        # edges that came back with bars or that hold no trading day (weekends, holidays)
+        newStart, newEnd = cachedStart, cachedEnd
+        pieces = [bars]
+        if start < cachedStart:
+            head = self._fetch(start, cachedStart)
+            if not head.empty:
+                pieces.insert(0, head)
+            if not head.empty or self._holdsNoSession(start, cachedStart):
+                newStart = start
+        if end > cachedEnd:
+            tail = self._fetch(cachedEnd, end)
+            if not tail.empty:
+                pieces.append(tail)
+            if not tail.empty or self._holdsNoSession(cachedEnd, coverEnd):
+                newEnd = max(cachedEnd, coverEnd)
+
+        if len(pieces) > 1:
+            merged = pd.concat(pieces, ignore_index=True)
+            # Pieces are already clean; refetched edge bars replace cached ones
+            bars = merged.drop_duplicates(subset="datetime", keep="last").sort_values("datetime").reset_index(drop=True)
+            self._saveBars(bars, newStart, newEnd)
+        elif (newStart, newEnd) != (cachedStart, cachedEnd):
+            self._saveMeta(dict(meta, start=newStart, end=newEnd))
+
+        return self._sliceRange(bars, start, end)
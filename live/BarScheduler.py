@@ -0,0 +1,177 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytz
+
+from live.MarketHours import CST, is_trading_day, session_bounds, next_session_open
+
+log = logging.getLogger(__name__)
+
+
+class SystemClock:
+    """Wall clock for BarCloseScheduler; tests swap in a fake with the same two methods."""
+
+    def now(self):
+        return datetime.now(pytz.utc)
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class BarCloseScheduler:
+    """
+    Calls onBarClose(barClose) right after each bar closes, on exact bar boundaries in exchange
+    time (bars aligned to MARKET_OPEN, the last one closing at MARKET_CLOSE). Weekends, exchange
+    holidays and DST are handled through live.MarketHours, so no cycles run while the market is
+    closed and a late wake-up never fires twice for the same bar.
+    """
+
+    def __init__(self, onBarClose, barMinutes=30, clock=None, settleSeconds=5.0):
+        """
+        :param onBarClose: callable(barClose: tz-aware datetime)
+        :param settleSeconds: delay after the boundary so the data source has the closed bar
+        """
+        self.onBarClose = onBarClose
+        self.barLength = timedelta(minutes=barMinutes)
+        self.clock = clock or SystemClock()
+        self.settle = timedelta(seconds=settleSeconds)
+        self.lastBarClose = None
+
+    def nextBarClose(self, now):
+        """First bar close strictly after now, moving to the next trading session if needed."""
+        local = now.astimezone(CST)
+        day = local.date()
+        if is_trading_day(day):
+            sessionOpen, sessionClose = session_bounds(day)
+            if now < sessionClose:
+                elapsed = max(now - sessionOpen, timedelta(0))
+                bars = elapsed // self.barLength + 1
+                return min(sessionOpen + bars * self.barLength, sessionClose)
+        sessionOpen = next_session_open(now)
+        return min(sessionOpen + self.barLength, session_bounds(sessionOpen.date())[1])
+
+    def waitForNextBar(self):
+        """Sleep until the next unprocessed bar close (plus settle time) and return it."""
+        now = self.clock.now()
+        if self.lastBarClose is None:
+            # Started just after a boundary: still treat that bar as the next one
+            barClose = self.nextBarClose(now - self.settle)
+        else:
+            barClose = self.nextBarClose(self.lastBarClose)
+            # Behind schedule (slow cycle, suspended host): jump to the latest closed bar once;
+            # the cycle itself catches up on every bar it missed
+            while self.nextBarClose(barClose) + self.settle <= now:
+                barClose = self.nextBarClose(barClose)
+
+        delay = (barClose + self.settle - now).total_seconds()
+        if delay > 0:
+            if delay > self.barLength.total_seconds():
+                log.info(f"Market closed. Sleeping {int(delay) // 3600}h{(int(delay) % 3600) // 60}m until {barClose.astimezone(CST)}.")
+            self.clock.sleep(delay)
+        return barClose
+
+    def run(self, stop=None, maxCycles=None):
+        """
+        Run bar-close cycles until stop (a threading.Event) is set or maxCycles have run.
+        A failing cycle is logged and the scheduler moves on to the next bar.
+        """
+        stop = stop or threading.Event()
+        cycles = 0
+        while not stop.is_set() and (maxCycles is None or cycles < maxCycles):
+            barClose = self.waitForNextBar()
+            if stop.is_set():
+                break
+            self.lastBarClose = barClose
+            try:
+                self.onBarClose(barClose)
+            except Exception:
+                log.exception(f"Error during bar-close cycle for {barClose.astimezone(CST)}")
+            cycles += 1
+
+
+class IncrementalBarFeed:
+    """
+    Per-cycle work for the scheduler: pass each newly closed bar to the runner once, and
+    remember the last bar processed. The runner (e.g. LiveSignalRunner) keeps its indicator,
+    Donchian and session-zone state between cycles, so each bar close costs only the new bars.
+
+    Whole days come from the PriceCache, which tops up and rewrites its files at most once a
+    day. The current UTC day is fetched fresh every cycle with getLatestBars and never cached.
+
+    A feed may serve the newest bar half-formed (late or partial data at barClose + settle).
+    Each cycle therefore re-reads the last bar processed. If its values changed, the corrected
+    bar goes to the runner again with the same timestamp, which every incremental component
+    treats as an in-place revision, so the bar is rescored from its final values.
+    """
+
+    def __init__(self, priceCache, runner, barMinutes=30, warmupDays=5):
+        """
+        :param priceCache: object with getHistoricalData(start, end) and getLatestBars(start, end)
+                           returning cleaned bars (e.g. data.PriceCache)
+        :param runner: object with onBar(bar, closedAt)
+        """
+        self.priceCache = priceCache
+        self.runner = runner
+        self.barLength = pd.Timedelta(minutes=barMinutes)
+        self.warmupDays = warmupDays
+        self.lastBarTime = None
+        self.lastBarValues = None
+        self.revisions = 0
+
+    def _fetchBars(self, since, barClose):
+        today = barClose.tz_convert("UTC").normalize()
+        pieces = []
+        if since < today:
+            pieces.append(self.priceCache.getHistoricalData(since.strftime("%Y-%m-%d"), today.strftime("%Y-%m-%d")))
+        tomorrow = today + pd.Timedelta(days=1)
+        pieces.append(self.priceCache.getLatestBars(today.strftime("%Y-%m-%d"), tomorrow.strftime("%Y-%m-%d")))
+        pieces = [piece for piece in pieces if not piece.empty]
+        if len(pieces) < 2:
+            return pieces[0] if pieces else pd.DataFrame()
+        merged = pd.concat(pieces, ignore_index=True)
+        return merged.drop_duplicates(subset="datetime", keep="last").reset_index(drop=True)
+
+    def _closedBars(self, barClose):
+        """Closed bars from the last one processed (included, to catch revisions) up to barClose."""
+        barClose = pd.Timestamp(barClose)
+        since = self.lastBarTime if self.lastBarTime is not None else barClose - pd.Timedelta(days=self.warmupDays)
+        bars = self._fetchBars(since, barClose)
+        if bars.empty:
+            return bars
+
+        times = pd.to_datetime(bars["datetime"])
+        if times.dt.tz is None:
+            times = times.dt.tz_localize("UTC")
+        closed = times + self.barLength <= barClose
+        if self.lastBarTime is not None:
+            closed &= times >= self.lastBarTime
+        return bars[closed.to_numpy()].sort_values("datetime", kind="stable")
+
+    def __call__(self, barClose):
+        """Process every bar closed by barClose that has not been seen yet; returns how many."""
+        newBars = 0
+        for row in self._closedBars(barClose).itertuples(index=False):
+            barTime = pd.Timestamp(row.datetime)
+            barTime = barTime if barTime.tzinfo is not None else barTime.tz_localize("UTC")
+            values = (row.open, row.high, row.low, row.close, row.volume)
+            if barTime == self.lastBarTime:
+                if values == self.lastBarValues:
+                    continue
+                log.info(f"Bar {barTime.tz_convert(CST)} changed since it was scored; revising it")
+                self.revisions += 1
+            else:
+                newBars += 1
+            self.runner.onBar({
+                "timestamp": row.datetime.isoformat(),
+                "open": row.open,
+                "high": row.high,
+                "low": row.low,
+                "close": row.close,
+                "volume": row.volume,
+            }, closedAt=barTime + self.barLength)
+            self.lastBarTime, self.lastBarValues = barTime, values
+        log.info(f"Bar close {pd.Timestamp(barClose).tz_convert(CST)}: {newBars} new bars")
+        return newBars
@@ -1,47 +1,130 @@
 import logging
 from strategies.SignalEvaluator import SignalEvaluator
-from strategies.DonchianZones import DonchianZones
-from strategies.LiquidityZones import LiquidityZones
-from utils.PriceBuffer import PriceBuffer
-from dotenv import load_dotenv
+from strategies.DonchianZones import StreamingDonchianZones
+from strategies.LiquidityZones import SessionZoneIndex, WEEKLY_LOOKBACK_DAYS, sweepDirection
+from strategies.Indicators import StreamingIndicators, confirmationFlags
+from strategies.TqsKernel import formatMask
+from utils.PriceBuffer import RingPriceBuffer
+from live.SignalSink import SignalSink
+from utils.Instrumentation import metrics
+from config.Settings import SettingsProvider
 
-import csv
-import os
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timezone
 
 logger = logging.getLogger("LiveSignal")
 logger.setLevel(logging.INFO)
 
 class LiveSignalRunner:
-    def __init__(self, evaluatorInputs):
-        self.buffer = PriceBuffer()
+    def __init__(self, evaluatorInputs, settings=None, sink=None, symbol=None, useIndicators=True):
+        """
+        :param evaluatorInputs: static SignalEvaluator inputs; rvol/macdAligned/rsiAligned are only
+                                read when useIndicators is False
+        :param settings: SettingsProvider; built from config/config.py once if omitted.
+                         Call settings.reload() (or enable its SIGHUP/file watch) to change thresholds live.
+                         A reloaded logPath moves the runner's own sink to the new file; a shared
+                         sink keeps writing where it was opened.
+        :param sink: SignalSink to log to; several runners may share one. Created (and owned) if omitted.
+        :param symbol: instrument this runner scores, recorded with each logged signal
+        :param useIndicators: score rvol and MACD/RSI alignment from the streaming indicators
+                              updated on every tick
+        """
+        self.settings = settings or SettingsProvider()
+        self.symbol = symbol
+        self.buffer = RingPriceBuffer()
+        self.donchian = StreamingDonchianZones()
+        self.zoneIndex = SessionZoneIndex(retainDays=WEEKLY_LOOKBACK_DAYS)
+        self.indicators = StreamingIndicators()
+        self.useIndicators = useIndicators
         self.evaluatorInputs = evaluatorInputs
+        self.lastTickAt = None
+        # Guards the incremental state: AsyncMarketData ingests on the event loop while it
+        # scores on an executor thread, so scoring reads that state only under this lock
+        self.stateLock = threading.Lock()
+        self.ownsSink = sink is None
+        self.sink = sink or SignalSink(self.settings.current.logPath)
 
-    
+    def close(self):
+        """Flush pending signal rows and stop the log writer (if this runner created it)."""
+        if self.ownsSink:
+            self.sink.close()
 
-    def onTick(self, tick):
-        load_dotenv()
-        import os
-        from config.config import config
-        TRADE_TRIGGER_SCORE = float(os.getenv("TQS_TRADE_THRESHOLD", config.TQS_TRADE_THRESHOLD))
-        WATCHLIST_SCORE = float(os.getenv("TQS_WATCHLIST_THRESHOLD", config.TQS_WATCHLIST_THRESHOLD))
-        
-        self.buffer.updateFromTick(tick)
-        priceData = self.buffer.getBars()
-
-        if not priceData:
+    def _followLogPath(self, logPath):
+        """Reopen an owned sink at a reloaded logPath; rows already queued still go to the old file."""
+        if not self.ownsSink or logPath == self.sink.path:
             return
+        logger.info(f"Signal log path changed to {logPath}; reopening the signal log")
+        previous, self.sink = self.sink, SignalSink(logPath)
+        previous.close()
+
+    def onTick(self, tick):
+        if self.ingestTick(tick):
+            self.scoreTick(tick)
+
+    def ingestTick(self, tick):
+        """
+        Fold one tick into the bar buffer and the incremental Donchian/session/indicator state.
+        Cheap, and must see every tick; returns False if there is nothing to score yet.
+        """
+        with self.stateLock:
+            if metrics.enabled:
+                metrics.count("live.ticks")
+                self.lastTickAt = time.perf_counter()
+            self.buffer.updateFromTick(tick)
+            currentBar = self.buffer.currentBar
+            if not currentBar:
+                return False
+
+            self.donchian.update(currentBar)
+            self.zoneIndex.update(currentBar)
+            self.indicators.update(currentBar)
+            return True
+
+    def onBar(self, bar, closedAt=None):
+        """
+        Fold one closed bar (timestamp/open/high/low/close/volume) into the incremental state and
+        score it at its close. Used by the bar-close scheduler instead of per-tick updates.
+        :param closedAt: tz-aware time the bar closed; with metrics enabled, the delay from it to
+                         the logged signal is recorded as live.barCloseToSignalSeconds
+        """
+        with self.stateLock:
+            self.buffer.updateFromBar(bar)
+            self.donchian.update(bar)
+            self.zoneIndex.update(bar)
+            self.indicators.update(bar)
+        metrics.count("live.bars")
+        self.scoreTick({"last": bar["close"]}, timestamp=bar["timestamp"])
+        if metrics.enabled and closedAt is not None:
+            # Includes the settle delay and data-source lag before the scheduler fetched the bar
+            metrics.observe("live.barCloseToSignalSeconds", (datetime.now(timezone.utc) - closedAt).total_seconds())
+
+    def scoreTick(self, tick, timestamp=None):
+        """
+        Evaluate and log the TQS for a tick already passed to ingestTick().
+        :param timestamp: logged signal time; defaults to now
+        """
+        settings = self.settings.current  # one consistent snapshot per tick
+        self._followLogPath(settings.logPath)
 
         currentPrice = tick.get("last")
         if not currentPrice:
             return
 
-        donchian = DonchianZones(priceData)
-        liquidity = LiquidityZones(priceData)
-        donchianRange = donchian.getRange()
+        # Read everything the score needs in one consistent snapshot; evaluation and logging run unlocked
+        with self.stateLock:
+            donchianRange = self.donchian.getRange()
+            isSwept = self.zoneIndex.detectSweep(currentPrice, settings.sweepZone)
+            isConfirmed = self.zoneIndex.isSweepConfirmed(currentPrice, settings.sweepZone)
+            values = dict(self.indicators.values)
+            tickAt = self.lastTickAt
 
-        isSwept = liquidity.detectSweep(currentPrice, "londonLow")
-        isConfirmed = liquidity.isSweepConfirmed(currentPrice, "londonLow")
+        if self.useIndicators:
+            rvol = values["rvol"]
+            macdAligned, rsiAligned = confirmationFlags(sweepDirection(settings.sweepZone), values["macdHist"], values["rsi"])
+        else:
+            rvol = self.evaluatorInputs["rvol"]
+            macdAligned, rsiAligned = self.evaluatorInputs["macdAligned"], self.evaluatorInputs["rsiAligned"]
 
         evaluator = SignalEvaluator(
             quoteTick=tick,
@@ -50,30 +133,36 @@ class LiveSignalRunner:
             isSwept=isSwept,
             isSweepConfirmed=isConfirmed,
             ev=self.evaluatorInputs["ev"],
-            rvol=self.evaluatorInputs["rvol"],
-            macdAligned=self.evaluatorInputs["macdAligned"],
-            rsiAligned=self.evaluatorInputs["rsiAligned"],
+            rvol=rvol,
+            macdAligned=bool(macdAligned),
+            rsiAligned=bool(rsiAligned),
             biasAligned=self.evaluatorInputs["biasAligned"],
             vixInRange=self.evaluatorInputs["vixInRange"]
         )
 
-        result = evaluator.evaluate()
+        result = evaluator.evaluate(includeBreakdown=False)
         score = result['score']
-        
-        if score >= TRADE_TRIGGER_SCORE:
-            logger.info(f"🚨 TRADE SIGNAL — TQS: {score:.2f} | Price: {result['priceUsed']} | Reasons: {result['breakdown']}")
-        elif score >= WATCHLIST_SCORE:
-            logger.info(f"🔍 WATCHLIST — TQS: {score:.2f} | Price: {result['priceUsed']} | Reasons: {result['breakdown']}")
-        else:
-            logger.info(f"TQS Score: {score:.2f} | Price: {result['priceUsed']} | Reasons: {result['breakdown']}")
-
-        # Log to file
-        log_path = os.getenv("TQS_LOG_PATH", "signals_log.csv")
-        with open(log_path, mode="a", newline="") as file:
-            writer = csv.writer(file)
-            writer.writerow([
-                datetime.utcnow().isoformat(),
-                score,
-                result["priceUsed"],
-                "; ".join(f"{pts}: {msg}" for pts, msg in result["breakdown"])
-            ])
+
+        if logger.isEnabledFor(logging.INFO):
+            reasons = formatMask(result["mask"])
+            if score >= settings.tradeThreshold:
+                logger.info(f"🚨 TRADE SIGNAL — TQS: {score:.2f} | Price: {result['priceUsed']} | Reasons: {reasons}")
+            elif score >= settings.watchlistThreshold:
+                logger.info(f"🔍 WATCHLIST — TQS: {score:.2f} | Price: {result['priceUsed']} | Reasons: {reasons}")
+            else:
+                logger.info(f"TQS Score: {score:.2f} | Price: {result['priceUsed']} | Reasons: {reasons}")
+
+        # Log to file (batched on the sink's writer thread); reasons are decoded from the mask on read
+        self.sink.write(
+            timestamp or datetime.utcnow().isoformat(),
+            score,
+            result["priceUsed"],
+            result["mask"],
+            symbol=self.symbol
+        )
+
+        if metrics.enabled:
+            metrics.count("live.signals")
+            if tickAt is not None:
+                # Includes any time the tick waited behind slower scoring (see AsyncMarketData)
+                metrics.observe("live.tickToSignalSeconds", time.perf_counter() - tickAt)
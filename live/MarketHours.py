@@ -0,0 +1,84 @@
+from datetime import datetime, date, time as dtime, timedelta
+
+import pytz
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar, Holiday, GoodFriday, USMartinLutherKingJr, USPresidentsDay,
+    USMemorialDay, USLaborDay, USThanksgivingDay, nearest_workday, sunday_to_monday
+)
+
+# Trading window in exchange time (CST/CDT; pytz handles the DST switch)
+CST = pytz.timezone("America/Chicago")
+MARKET_OPEN = dtime(8, 30)
+MARKET_CLOSE = dtime(17, 0)
+
+
+class ExchangeHolidayCalendar(AbstractHolidayCalendar):
+    """Full-day US exchange holidays (early closes are not modelled)."""
+    rules = [
+        # A Saturday New Year's Day is not observed: the Friday before (Dec 31) trades
+        Holiday("NewYearsDay", month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday("Juneteenth", month=6, day=19, start_date="2022-01-01", observance=nearest_workday),
+        Holiday("IndependenceDay", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas", month=12, day=25, observance=nearest_workday),
+    ]
+
+
+_holidayCache = {}
+
+
+def is_holiday(day: date) -> bool:
+    if day.year not in _holidayCache:
+        holidays = ExchangeHolidayCalendar().holidays(date(day.year, 1, 1), date(day.year, 12, 31))
+        _holidayCache[day.year] = {ts.date() for ts in holidays}
+    return day in _holidayCache[day.year]
+
+
+def is_trading_day(day: date) -> bool:
+    return day.weekday() < 5 and not is_holiday(day)
+
+
+def session_date(now: datetime) -> date:
+    """Trading day a moment belongs to: the Globex session rolls over at the 17:00 CT close."""
+    local = now.astimezone(CST)
+    return local.date() + timedelta(days=1) if local.time() >= MARKET_CLOSE else local.date()
+
+
+def is_market_open(now: datetime) -> bool:
+    # only Monday–Friday (in exchange time), outside holidays
+    local = now.astimezone(CST)
+    if not is_trading_day(local.date()):
+        return False
+    return MARKET_OPEN <= local.time() <= MARKET_CLOSE
+
+
+def session_bounds(day: date):
+    """(open, close) of a trading day as tz-aware exchange-time datetimes."""
+    return (
+        CST.localize(datetime.combine(day, MARKET_OPEN)),
+        CST.localize(datetime.combine(day, MARKET_CLOSE))
+    )
+
+
+def next_session_open(now: datetime) -> datetime:
+    """The next market open strictly after now, skipping weekends and holidays."""
+    day = now.astimezone(CST).date()
+    while True:
+        sessionOpen, _ = session_bounds(day)
+        if is_trading_day(day) and sessionOpen > now:
+            return sessionOpen
+        day += timedelta(days=1)
+
+
+def seconds_until(target: dtime, now: datetime) -> int:
+    local = now.astimezone(CST)
+    today_target = CST.localize(datetime.combine(local.date(), target))
+    if local.time() >= target:
+        # schedule for tomorrow
+        today_target = CST.localize(datetime.combine(local.date() + timedelta(days=1), target))
+    return int((today_target - local).total_seconds())
@@ -0,0 +1,136 @@
+import atexit
+import csv
+import logging
+import os
+import queue
+import threading
+import time
+
+import pandas as pd
+
+logger = logging.getLogger("SignalSink")
+
+SIGNAL_COLUMNS = ["timestamp", "score", "priceUsed", "mask", "symbol"]
+
+_STOP = object()
+
+
+class SignalSink:
+    """
+    Buffered signal log writer. write() only enqueues; a background thread batches rows and
+    flushes when maxBatch rows are waiting or flushInterval seconds have passed since the first
+    unwritten row. close() (also registered with atexit) drains the queue before returning.
+
+    Formats:
+      'csv'     - appends to one CSV file with a header row; an existing file with any other
+                  header (e.g. the old header-less four-column log) is renamed aside first
+      'parquet' - writes one Parquet part file per flush into a directory; read it back
+                  with pd.read_parquet(path) or CorrelationAnalysis.loadSignals
+    """
+
+    def __init__(self, path, fmt=None, maxBatch=500, flushInterval=1.0):
+        self.path = path
+        self.fmt = fmt or ("parquet" if path.endswith(".parquet") else "csv")
+        if self.fmt not in ("csv", "parquet"):
+            raise ValueError(f"Unknown signal log format '{self.fmt}'")
+        self.maxBatch = maxBatch
+        self.flushInterval = flushInterval
+        self.queue = queue.SimpleQueue()
+        self.partSeq = 0
+        self.headerChecked = False
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name="SignalSink", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def write(self, timestamp, score, priceUsed, mask, symbol=None):
+        """Enqueue one signal row; mask is the TqsKernel component bitmask. Never blocks on I/O."""
+        if self.closed:
+            raise RuntimeError("SignalSink is closed")
+        self.queue.put((timestamp, score, priceUsed, int(mask), symbol or ""))
+
+    def flush(self, timeout=None):
+        """Block until every row written so far is on disk."""
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(_STOP)
+        self.thread.join()
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self):
+        batch, waiters, deadline = [], [], None
+        while True:
+            timeout = None if not batch else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            stopping = item is _STOP
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            elif isinstance(item, tuple):
+                if not batch:
+                    deadline = time.monotonic() + self.flushInterval
+                batch.append(item)
+
+            # The interval is checked on every row too: a steady stream never lets get() time out
+            if batch and (item is None or stopping or waiters or len(batch) >= self.maxBatch
+                          or time.monotonic() >= deadline):
+                self._writeBatch(batch)
+                batch = []
+            for waiter in waiters:
+                waiter.set()
+            waiters = []
+
+            if stopping:
+                return
+
+    def _writeBatch(self, rows):
+        try:
+            if self.fmt == "csv":
+                if not self.headerChecked:
+                    self._rotateMismatchedLog()
+                    self.headerChecked = True
+                isNew = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+                with open(self.path, mode="a", newline="") as file:
+                    writer = csv.writer(file)
+                    if isNew:
+                        writer.writerow(SIGNAL_COLUMNS)
+                    writer.writerows(rows)
+            else:
+                os.makedirs(self.path, exist_ok=True)
+                self.partSeq += 1
+                partName = f"part-{os.getpid()}-{time.time_ns()}-{self.partSeq:06d}.parquet"
+                pd.DataFrame(rows, columns=SIGNAL_COLUMNS).to_parquet(os.path.join(self.path, partName), index=False)
+        except Exception:
+            logger.exception(f"Failed to write {len(rows)} signals to {self.path}")
+
+    def _rotateMismatchedLog(self):
+        """Move an existing CSV log aside unless its header is SIGNAL_COLUMNS, so rows never land under another layout."""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+        with open(self.path, newline="") as file:
+            header = next(csv.reader(file), [])
+        if header == SIGNAL_COLUMNS:
+            return
+        root, ext = os.path.splitext(self.path)
+        rotated = f"{root}.{time.strftime('%Y%m%dT%H%M%S')}{ext}"
+        suffix = 1
+        while os.path.exists(rotated):
+            rotated = f"{root}.{time.strftime('%Y%m%dT%H%M%S')}-{suffix}{ext}"
+            suffix += 1
+        os.rename(self.path, rotated)
+        logger.warning(f"{self.path} has a different layout (first row {header}); moved it to {rotated} and starting a new log")
@@ -1,10 +1,16 @@
 import argparse
+import cProfile
+import json
 import logging
+import pstats
+import time
 from datetime import datetime, timedelta
-from config.config import Config
+from config.config import Config, TQS_TRADE_THRESHOLD, DEFAULT_SWEEP_ZONE
 from Backtester.BacktestEngine import Engine
-from Scrapers.PriceScraper import PriceScraper
-from utils.DataCleaner import clean_ohlcv  # ✅ NEW
+from Backtester.PortfolioBacktester import DEFAULT_SYMBOLS, PortfolioBacktester, PortfolioData, writeResults
+from Backtester.Stages import timed
+from data.PriceCache import PriceCache
+from utils.Instrumentation import metrics
 
 # Logging setup
 logging.basicConfig(
@@ -22,12 +28,28 @@ TEST_MODE_RANGES = {
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Hedge-Fund-Lite Backtester")
-    parser.add_argument("--mode", choices=["backtest"], required=True)
-    parser.add_argument("--symbol", type=str, required=True)
+    parser.add_argument("--mode", choices=["backtest", "portfolio"], required=True)
+    parser.add_argument("--symbol", type=str, help="Instrument for --mode backtest")
+    parser.add_argument("--symbols", type=str, default=",".join(DEFAULT_SYMBOLS),
+                        help="Comma-separated instruments for --mode portfolio")
+    parser.add_argument("--maxPositions", type=int, default=2, help="Portfolio-wide open position limit")
+    parser.add_argument("--outputDir", type=str, default=None,
+                        help="Portfolio results directory (default: results/portfolio_<timestamp>)")
     parser.add_argument("--start", type=str, default=None, help="YYYY-MM-DD")
     parser.add_argument("--end", type=str, default=None, help="YYYY-MM-DD")
     parser.add_argument("--testMode", choices=["quick", "medium", "long"], help="Pre-set test duration")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile the run: writes <profileOut>.pstats and a <profileOut>.json summary")
+    parser.add_argument("--profileOut", type=str, default="profile", help="Output path prefix for --profile")
     args = parser.parse_args()
+    if args.mode == "backtest" and not args.symbol:
+        parser.error("--symbol is required for --mode backtest")
+
+    profiler = None
+    if args.profile:
+        metrics.enable()
+        profiler = cProfile.Profile()
+        profiler.enable()
 
     # Determine date range and sentiment setting
     use_sentiment = True
@@ -49,14 +71,41 @@ if __name__ == "__main__":
         start_date = args.start
         end_date = args.end
 
-   # Always clean price data before backtesting
-    scraper = PriceScraper(args.symbol)
-    raw_price_data = scraper.getHistoricalData(start_date, end_date)
-    cleaned_price_data = clean_ohlcv(raw_price_data, source_name="Main.py")
+    if args.mode == "portfolio":
+        symbols = [symbol.strip() for symbol in args.symbols.split(",") if symbol.strip()]
+        log.info(f"Starting portfolio backtest for {symbols} from {start_date} to {end_date}...")
+        # Same stage timings dict as Engine.runBacktest reports, so --profile has one schema
+        timings, totalStart = {}, time.perf_counter()
+        with timed(timings, "dataLoad"):
+            store = PortfolioData.load(symbols, start_date, end_date)
+        if not store.symbols:
+            log.error("❌ No usable price data for any symbol. Cannot run portfolio backtest.")
+            exit()
+
+        portfolio = PortfolioBacktester(
+            store.symbols,
+            getattr(Config, "evaluatorInputs", {"ev": 0.0, "biasAligned": False, "vixInRange": False}),
+            threshold=getattr(Config, "tqsThreshold", TQS_TRADE_THRESHOLD),
+            sweepZone=getattr(Config, "sweepZone", DEFAULT_SWEEP_ZONE),
+            maxPositions=args.maxPositions
+        )
+        results = portfolio.run(store, timings=timings)
+        outputDir = writeResults(results, args.outputDir)
+        timings["total"] = time.perf_counter() - totalStart
 
-    if cleaned_price_data.empty:
-        log.error("❌ No usable price data after cleaning. Cannot run backtest.")
-        exit()
+        log.info("===== PORTFOLIO RESULTS =====")
+        for symbol, stats in results["perSymbol"].items():
+            log.info(f"{symbol}: {stats['trades']} trades, win rate {stats['winRate']*100:.2f}%, P&L ${stats['pnl']:,.2f}")
+        log.info(f"Portfolio Final Balance: ${results['portfolio']['finalBalance']:,.2f}")
+        log.info(f"Results written to {outputDir}")
+
+    # Cleaned price data, served from the local cache where possible
+    if args.mode == "backtest":
+        cleaned_price_data = PriceCache(args.symbol).getHistoricalData(start_date, end_date)
+
+        if cleaned_price_data.empty:
+            log.error("❌ No usable price data after cleaning. Cannot run backtest.")
+            exit()
 
     # Run backtest
     if args.mode == "backtest":
@@ -78,3 +127,25 @@ if __name__ == "__main__":
         log.info(f"Expected Value: {results['expectedValue']:.2f}R")
         log.info(f"Monte Carlo (5% / 50% / 95%): {results['monteCarlo']}")
 
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(f"{args.profileOut}.pstats")
+        stats = pstats.Stats(profiler).sort_stats("cumulative")
+        topFunctions = [
+            {
+                "function": f"{path}:{line}({name})",
+                "calls": callCount,
+                "totalSeconds": totalTime,
+                "cumulativeSeconds": cumulativeTime,
+            }
+            for (path, line, name), (_, callCount, totalTime, cumulativeTime, _) in
+            sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:30]
+        ]
+        with open(f"{args.profileOut}.json", "w") as f:
+            json.dump({
+                "stageTimings": results.get("timings", {}),
+                "metrics": metrics.summary(),
+                "topFunctions": topFunctions,
+            }, f, indent=2)
+        log.info(f"Profile written to {args.profileOut}.pstats and {args.profileOut}.json")
+
@@ -1,17 +1,29 @@
 from  analysis.SentimentAnalysis import SentimentAnalysis
 
 class BiasScoring:
-    def __init__(self, newsData):
+    def __init__(self, newsData, sentimentIndexes=None):
+        """
+        :param newsData: anything with getNews(symbol, startDate, endDate). Pass a NewsStore
+                         (prefetched over the backtest range) so repeated calls hit the local
+                         index instead of the Benzinga API.
+        :param sentimentIndexes: optional {symbol: SentimentIndex}; windows for these symbols are
+                                 scored from the index at bar resolution without reading headlines
+        """
         self.newsData = newsData
+        self.sentimentIndexes = sentimentIndexes or {}
 
     def getBiasScore(self, symbol: str, direction: str, startDate=None, endDate=None) -> float:
         """
         Fetches headlines and scores bias alignment.
         Returns 1.0 if sentiment supports direction, 0.0 otherwise.
         """
-        headlines = self.newsData.getNews(symbol, startDate, endDate)
-        sentimentAnalyzer = SentimentAnalysis(headlines)
-        score = sentimentAnalyzer.scoreBiasDirection()
+        sentimentIndex = self.sentimentIndexes.get(symbol)
+        if sentimentIndex is not None and startDate is not None and endDate is not None:
+            score = sentimentIndex.biasBetween(startDate, endDate)
+        else:
+            headlines = self.newsData.getNews(symbol, startDate, endDate)
+            sentimentAnalyzer = SentimentAnalysis(headlines)
+            score = sentimentAnalyzer.scoreBiasDirection()
 
         if direction == "long" and score > 0:
             return 1.0
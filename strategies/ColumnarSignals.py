@@ -0,0 +1,91 @@
+# strategies/columnar_signals.py
+import numpy as np
+import pandas as pd
+
+from strategies.LiquidityZones import LiquidityZones
+from strategies.TqsKernel import scoreMasks, componentPoints
+
+# Breakdown columns, in the order TqsCalculator adds them
+TQS_COMPONENTS = ["sweep", "donchian", "ev", "rvol", "macd", "rsi", "bias", "vix"]
+
+
+def toUtcNaive(timestamps):
+    """
+    Parse a timestamp column once into naive UTC datetime64[ns] values.
+    Accepts ISO strings, datetimes or pandas timestamps (tz-aware or not).
+    """
+    parsed = pd.to_datetime(pd.Series(timestamps))
+    if parsed.dt.tz is not None:
+        parsed = parsed.dt.tz_convert("UTC").dt.tz_localize(None)
+    return parsed.to_numpy(dtype="datetime64[ns]")
+
+
+def rollingDonchian(high, low, period=20):
+    """
+    Donchian high/low over the last `period` bars, current bar included.
+    Matches DonchianZones.getRange() evaluated at every bar.
+    :return: (donchianHigh, donchianLow) float arrays
+    """
+    donchianHigh = pd.Series(high, dtype="float64").rolling(period, min_periods=1).max().to_numpy()
+    donchianLow = pd.Series(low, dtype="float64").rolling(period, min_periods=1).min().to_numpy()
+    return donchianHigh, donchianLow
+
+
+def sessionZone(timestamps, high, low, zoneName, now, window):
+    """
+    Zone level (e.g. 'londonLow') as LiquidityZones would compute it from the
+    last `window` bars at every bar, with sessions anchored to `now`.
+    :return: float array, NaN where the window holds no bars of the session
+    """
+    session = zoneName[:-3] if zoneName.endswith("Low") else zoneName[:-4]
+    start, end = LiquidityZones.sessionBounds(now)[session]
+    inSession = (timestamps >= np.datetime64(start)) & (timestamps <= np.datetime64(end))
+
+    if zoneName.endswith("Low"):
+        masked = np.where(inSession, np.asarray(low, dtype="float64"), np.inf)
+        zone = pd.Series(masked).rolling(window, min_periods=1).min().to_numpy()
+    else:
+        masked = np.where(inSession, np.asarray(high, dtype="float64"), -np.inf)
+        zone = pd.Series(masked).rolling(window, min_periods=1).max().to_numpy()
+
+    return np.where(np.isinf(zone), np.nan, zone)
+
+
+def sweepFlags(price, zone, zoneName, tickSize=0.25, toleranceTicks=4):
+    """
+    Column form of LiquidityZones.detectSweep / isSweepConfirmed.
+    NaN zone levels never sweep or confirm.
+    :return: (isSwept, isConfirmed) boolean arrays
+    """
+    hasZone = ~np.isnan(zone)
+    distance = np.abs(price - zone)
+
+    if "Low" in zoneName:
+        beyond = price < zone
+        confirmed = price > zone
+    else:
+        beyond = price > zone
+        confirmed = price < zone
+
+    isSwept = hasZone & beyond & (distance <= tickSize * toleranceTicks)
+    isConfirmed = hasZone & confirmed
+    return isSwept, isConfirmed
+
+
+def scoreTqsColumns(price, donchianHigh, donchianLow, isSwept, isConfirmed,
+                    ev, rvol, macdAligned, rsiAligned, biasAligned, vixInRange):
+    """
+    Column form of SignalEvaluator.evaluate(). Indicator inputs may be scalars
+    or per-bar arrays.
+    :return: DataFrame with one points column per TQS component plus 'score' and the TqsKernel 'mask'
+    """
+    score, mask = scoreMasks(
+        price, donchianHigh, donchianLow, isSwept, isConfirmed,
+        ev, rvol, macdAligned, rsiAligned, biasAligned, vixInRange
+    )
+    points = componentPoints(mask)
+
+    frame = pd.DataFrame({name: points[name] for name in TQS_COMPONENTS})
+    frame["score"] = score
+    frame["mask"] = mask
+    return frame
@@ -1,3 +1,5 @@
+from collections import deque
+
 class DonchianZones:
     def __init__(self, priceData):
         self.priceData = priceData
@@ -12,3 +14,112 @@ class DonchianZones:
         high = max(bar["high"] for bar in recent)
         low = min(bar["low"] for bar in recent)
         return {"donchianHigh": high, "donchianLow": low}
+
+
+class StreamingDonchianZones:
+    """
+    Incremental Donchian channels for several periods at once.
+    Each period keeps a monotonic deque of (barIndex, price), so a new bar costs amortized O(1)
+    and getRange() is O(1). Results match DonchianZones(bars).getRange(period) on the same bars.
+    """
+
+    def __init__(self, periods=(20, 55, 100)):
+        self.periods = tuple(periods)
+        maxPeriod = max(self.periods)
+        self.count = 0
+        self.lastTimestamp = None
+        self.highs = deque(maxlen=maxPeriod)
+        self.lows = deque(maxlen=maxPeriod)
+        self.maxDeques = {p: deque() for p in self.periods}
+        self.minDeques = {p: deque() for p in self.periods}
+
+    @classmethod
+    def fromBars(cls, bars, periods=(20, 55, 100)):
+        zones = cls(periods)
+        for bar in bars:
+            zones.update(bar)
+        return zones
+
+    def update(self, bar):
+        """
+        Feed one bar. A bar with the same timestamp as the previous one is treated as
+        a revision of the still-forming bar (as PriceBuffer does per tick) and replaces it.
+        """
+        timestamp = bar.get("timestamp")
+        if self.count and timestamp == self.lastTimestamp:
+            self._reviseLast(bar["high"], bar["low"])
+        else:
+            self._append(bar["high"], bar["low"])
+            self.lastTimestamp = timestamp
+
+    def _append(self, high, low):
+        index = self.count
+        self.count += 1
+        self.highs.append(high)
+        self.lows.append(low)
+
+        for period in self.periods:
+            maxQ = self.maxDeques[period]
+            while maxQ and maxQ[-1][1] <= high:
+                maxQ.pop()
+            maxQ.append((index, high))
+            if maxQ[0][0] <= index - period:
+                maxQ.popleft()
+
+            minQ = self.minDeques[period]
+            while minQ and minQ[-1][1] >= low:
+                minQ.pop()
+            minQ.append((index, low))
+            if minQ[0][0] <= index - period:
+                minQ.popleft()
+
+    def _reviseLast(self, high, low):
+        index = self.count - 1
+        oldHigh, oldLow = self.highs[-1], self.lows[-1]
+        self.highs[-1] = high
+        self.lows[-1] = low
+
+        for period in self.periods:
+            # The forming bar is always at the back of its deques. Widening it only
+            # evicts more entries; narrowing it may resurrect evicted ones, so rebuild.
+            if high >= oldHigh:
+                maxQ = self.maxDeques[period]
+                while maxQ and maxQ[-1][1] <= high:
+                    maxQ.pop()
+                maxQ.append((index, high))
+            else:
+                self.maxDeques[period] = self._rebuild(period, self.highs, lambda back, value: back <= value)
+
+            if low <= oldLow:
+                minQ = self.minDeques[period]
+                while minQ and minQ[-1][1] >= low:
+                    minQ.pop()
+                minQ.append((index, low))
+            else:
+                self.minDeques[period] = self._rebuild(period, self.lows, lambda back, value: back >= value)
+
+    def _rebuild(self, period, values, dominated):
+        rebuilt = deque()
+        window = list(values)[-period:]
+        firstIndex = self.count - len(window)
+        for offset, value in enumerate(window):
+            while rebuilt and dominated(rebuilt[-1][1], value):
+                rebuilt.pop()
+            rebuilt.append((firstIndex + offset, value))
+        return rebuilt
+
+    def getRange(self, period=20):
+        """
+        :param period: one of the periods this instance tracks
+        :return: dict with 'donchianHigh' and 'donchianLow'
+        """
+        if period not in self.maxDeques:
+            raise ValueError(f"Period {period} not tracked; tracked periods are {self.periods}")
+        return {
+            "donchianHigh": self.maxDeques[period][0][1],
+            "donchianLow": self.minDeques[period][0][1]
+        }
+
+    def getRanges(self):
+        """:return: dict of period -> getRange(period), for multi-timeframe scoring"""
+        return {period: self.getRange(period) for period in self.periods}
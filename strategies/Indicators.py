@@ -0,0 +1,228 @@
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+MACD_PERIODS = (12, 26, 9)
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+RVOL_PERIOD = 20
+
+
+def emaAlpha(period):
+    return 2.0 / (period + 1)
+
+
+def wilderAlpha(period):
+    return 1.0 / period
+
+
+# ---- Scalar recurrences used by the streaming versions ----
+
+def _emaStep(prev, value, alpha):
+    return value if prev is None else prev + alpha * (value - prev)
+
+
+def _rsiFromAverages(avgGain, avgLoss):
+    if avgLoss == 0:
+        return 100.0 if avgGain > 0 else 50.0
+    return 100.0 - 100.0 / (1.0 + avgGain / avgLoss)
+
+
+def _trueRange(high, low, prevClose):
+    if prevClose is None:
+        return high - low
+    return max(high - low, abs(high - prevClose), abs(low - prevClose))
+
+
+def _smooth(values, alpha):
+    """
+    prev + alpha * (value - prev) along values, seeded with the first value, in float64. The
+    recurrence runs in pandas' compiled EWM; results match the streaming step to rounding.
+    """
+    values = np.asarray(values, dtype="float64")
+    if len(values) == 0:
+        return np.empty(0, dtype="float64")
+    return pd.Series(values).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+
+
+# ---- Batch versions over whole NumPy columns ----
+
+def ema(values, period):
+    """EMA seeded with the first value (pandas ewm(span=period, adjust=False))."""
+    return _smooth(values, emaAlpha(period))
+
+
+def macd(close, fast=MACD_PERIODS[0], slow=MACD_PERIODS[1], signal=MACD_PERIODS[2]):
+    """:return: (macdLine, signalLine, histogram)"""
+    macdLine = ema(close, fast) - ema(close, slow)
+    signalLine = ema(macdLine, signal)
+    return macdLine, signalLine, macdLine - signalLine
+
+
+def rsi(close, period=RSI_PERIOD):
+    """Wilder RSI, seeded with the first close-to-close change; NaN on the first bar."""
+    close = np.asarray(close, dtype="float64")
+    out = np.full(len(close), np.nan)
+    if len(close) < 2:
+        return out
+    change = np.diff(close)
+    avgGain = _wilder(np.maximum(change, 0.0), period)
+    avgLoss = _wilder(np.maximum(-change, 0.0), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fromAverages = 100.0 - 100.0 / (1.0 + avgGain / avgLoss)
+    # Same zero-loss cases as _rsiFromAverages
+    out[1:] = np.where(avgLoss == 0, np.where(avgGain > 0, 100.0, 50.0), fromAverages)
+    return out
+
+
+def _wilder(values, period):
+    return _smooth(values, wilderAlpha(period))
+
+
+def atr(high, low, close, period=ATR_PERIOD):
+    """Wilder ATR seeded with the first bar's range."""
+    high = np.asarray(high, dtype="float64")
+    low = np.asarray(low, dtype="float64")
+    close = np.asarray(close, dtype="float64")
+    if len(close) == 0:
+        return np.empty(0, dtype="float64")
+    prevClose = np.concatenate([[np.nan], close[:-1]])
+    trueRange = np.maximum.reduce([high - low, np.abs(high - prevClose), np.abs(low - prevClose)])
+    trueRange[0] = high[0] - low[0]
+    return _wilder(trueRange, period)
+
+
+def rvol(volume, period=RVOL_PERIOD):
+    """Bar volume over the mean volume of the previous `period` bars; NaN until there are enough."""
+    volume = np.asarray(volume, dtype="float64")
+    out = np.full(len(volume), np.nan)
+    if len(volume) <= period:
+        return out
+    totals = np.concatenate([[0.0], np.add.accumulate(volume)])
+    windowSum = totals[period:-1] - totals[:-period - 1]
+    average = windowSum / period
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[period:] = np.where(average > 0, volume[period:] / average, np.nan)
+    return out
+
+
+def indicatorColumns(high, low, close, volume=None):
+    """Every indicator for a whole frame, keyed like StreamingIndicators.values."""
+    close = np.asarray(close, dtype="float64")
+    volume = np.zeros(len(close)) if volume is None else np.asarray(volume, dtype="float64")
+    macdLine, signalLine, histogram = macd(close)
+    return {
+        "macd": macdLine,
+        "macdSignal": signalLine,
+        "macdHist": histogram,
+        "rsi": rsi(close),
+        "atr": atr(high, low, close),
+        "rvol": rvol(volume),
+    }
+
+
+def confirmationFlags(direction, macdHist, rsiValue):
+    """
+    MACD/RSI alignment with the trade direction: histogram above zero and RSI above 50 for
+    'long', below for 'short'. Works on scalars or arrays; NaN (warm-up) is never aligned.
+    """
+    macdHist = np.asarray(macdHist, dtype="float64")
+    rsiValue = np.asarray(rsiValue, dtype="float64")
+    if direction == "long":
+        return macdHist > 0, rsiValue > 50
+    return macdHist < 0, rsiValue < 50
+
+
+# ---- Streaming versions ----
+
+class StreamingIndicators:
+    """
+    O(1)-per-bar EMA/MACD/RSI/ATR/RVOL over a bar stream, matching the batch functions above.
+
+    update(bar) takes a bar dict (high/low/close and optional volume). A bar with the same
+    timestamp as the previous one revises it: the current bar is recomputed from the state
+    saved at the close of the bar before, so live bars can be updated tick by tick.
+    """
+
+    def __init__(self, macdPeriods=MACD_PERIODS, rsiPeriod=RSI_PERIOD, atrPeriod=ATR_PERIOD, rvolPeriod=RVOL_PERIOD):
+        self.fastAlpha, self.slowAlpha, self.signalAlpha = (emaAlpha(p) for p in macdPeriods)
+        self.rsiAlpha = wilderAlpha(rsiPeriod)
+        self.atrAlpha = wilderAlpha(atrPeriod)
+        self.rvolPeriod = rvolPeriod
+        # Running volume totals at the close of each of the last rvolPeriod + 1 closed bars
+        self.volumeTotals = deque([0.0], maxlen=rvolPeriod + 1)
+        self.closedState = None
+        self.state = None
+        self.lastTimestamp = None
+        self.count = 0
+        self.values = {}
+
+    @classmethod
+    def fromBars(cls, bars, **kwargs):
+        indicators = cls(**kwargs)
+        for bar in bars:
+            indicators.update(bar)
+        return indicators
+
+    def update(self, bar):
+        timestamp = bar.get("timestamp")
+        if self.count and timestamp == self.lastTimestamp:
+            self.state = self._step(self.closedState, bar)
+        else:
+            if self.state is not None:
+                self.volumeTotals.append(self.state["volumeTotal"])
+            self.closedState = self.state
+            self.state = self._step(self.closedState, bar)
+            self.lastTimestamp = timestamp
+            self.count += 1
+        self.values = self._values()
+        return self.values
+
+    def _step(self, prev, bar):
+        high, low, close = float(bar["high"]), float(bar["low"]), float(bar["close"])
+        volume = float(bar.get("volume") or 0.0)
+        prev = prev or {}
+        prevClose = prev.get("close")
+
+        fast = _emaStep(prev.get("fast"), close, self.fastAlpha)
+        slow = _emaStep(prev.get("slow"), close, self.slowAlpha)
+        macdLine = fast - slow
+        signal = _emaStep(prev.get("signal"), macdLine, self.signalAlpha)
+
+        avgGain, avgLoss = prev.get("avgGain"), prev.get("avgLoss")
+        if prevClose is not None:
+            change = close - prevClose
+            avgGain = _emaStep(avgGain, max(change, 0.0), self.rsiAlpha)
+            avgLoss = _emaStep(avgLoss, max(-change, 0.0), self.rsiAlpha)
+
+        return {
+            "close": close,
+            "fast": fast,
+            "slow": slow,
+            "macd": macdLine,
+            "signal": signal,
+            "avgGain": avgGain,
+            "avgLoss": avgLoss,
+            "atr": _emaStep(prev.get("atr"), _trueRange(high, low, prevClose), self.atrAlpha),
+            "volume": volume,
+            "volumeTotal": self.volumeTotals[-1] + volume,
+        }
+
+    def _rvol(self):
+        if len(self.volumeTotals) <= self.rvolPeriod:
+            return np.nan
+        average = (self.volumeTotals[-1] - self.volumeTotals[0]) / self.rvolPeriod
+        return self.state["volume"] / average if average > 0 else np.nan
+
+    def _values(self):
+        state = self.state
+        hasRsi = state["avgGain"] is not None
+        return {
+            "macd": state["macd"],
+            "macdSignal": state["signal"],
+            "macdHist": state["macd"] - state["signal"],
+            "rsi": _rsiFromAverages(state["avgGain"], state["avgLoss"]) if hasRsi else np.nan,
+            "atr": state["atr"],
+            "rvol": self._rvol(),
+        }
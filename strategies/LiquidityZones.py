@@ -1,34 +1,84 @@
+from collections import deque
 from datetime import datetime, timedelta
 
+import numpy as np
+import pandas as pd
+
+from utils.DataCleaner import DataCleaner
+
+# Session times in UTC hours: Asian 00:00–08:00, London 08:00–12:00, NY 12:00–18:30
+SESSION_HOURS = {
+    "asian": (0, 8),
+    "london": (8, 12),
+    "ny": (12, 18.5)
+}
+WEEKLY_LOOKBACK_DAYS = 5
+
+ZONE_NAMES = ["asianLow", "asianHigh", "londonLow", "londonHigh", "nyLow", "nyHigh", "weeklyHigh", "weeklyLow"]
+
+
+def sweepAgainst(zoneLevel, currentPrice, zoneName, tickSize=0.25, toleranceTicks=4):
+    """True if price has poked through zoneLevel by at most toleranceTicks."""
+    if zoneLevel is None:
+        return False
+
+    distance = abs(currentPrice - zoneLevel)
+
+    isLowSweep = "Low" in zoneName and currentPrice < zoneLevel
+    isHighSweep = "High" in zoneName and currentPrice > zoneLevel
+
+    return (isLowSweep or isHighSweep) and distance <= tickSize * toleranceTicks
+
+
+def sweepDirection(zoneName):
+    """Trade direction a sweep of zoneName sets up: reclaiming a swept low is long, a high is short."""
+    return "long" if "Low" in zoneName else "short"
+
+
+def confirmAgainst(zoneLevel, currentPrice, zoneName):
+    """True if price is back on the near side of a swept zoneLevel."""
+    if zoneLevel is None:
+        return False
+
+    if "Low" in zoneName:
+        return currentPrice > zoneLevel
+    elif "High" in zoneName:
+        return currentPrice < zoneLevel
+    return False
+
+
 class LiquidityZones:
-    def __init__(self, priceData):
+    def __init__(self, priceData, now=None):
         self.priceData = priceData
+        self.now = now
         self.zones = self.getZones()
 
     def _filterByTimeRange(self, startTime, endTime):
         return [bar for bar in self.priceData if startTime <= datetime.fromisoformat(bar["timestamp"]) <= endTime]
 
-    def getZones(self):
-        now = datetime.utcnow()
-        today = now.date()
-
-        # Define session times in UTC
-        asianStart = datetime.combine(today, datetime.min.time()) + timedelta(hours=0)   # 00:00 UTC
-        asianEnd = asianStart + timedelta(hours=8)  # 00:00–08:00 UTC
-
-        londonStart = asianEnd
-        londonEnd = londonStart + timedelta(hours=4)  # 08:00–12:00 UTC
-
-        nyStart = londonEnd
-        nyEnd = nyStart + timedelta(hours=6.5)  # 12:00–18:30 UTC
+    @staticmethod
+    def sessionBounds(now):
+        """
+        Session windows (in UTC) anchored to the trading day of `now`.
+        :return: dict of session name -> (start, end), inclusive on both ends
+        """
+        dayStart = datetime.combine(now.date(), datetime.min.time())
+        bounds = {
+            session: (dayStart + timedelta(hours=startHour), dayStart + timedelta(hours=endHour))
+            for session, (startHour, endHour) in SESSION_HOURS.items()
+        }
+        bounds["weekly"] = (now - timedelta(days=WEEKLY_LOOKBACK_DAYS), now)
+        return bounds
 
-        weekStart = now - timedelta(days=5)
+    def getZones(self):
+        now = self.now or datetime.utcnow()
+        bounds = self.sessionBounds(now)
 
         # Filter bars
-        asianSession = self._filterByTimeRange(asianStart, asianEnd)
-        londonSession = self._filterByTimeRange(londonStart, londonEnd)
-        nySession = self._filterByTimeRange(nyStart, nyEnd)
-        weeklyData = self._filterByTimeRange(weekStart, now)
+        asianSession = self._filterByTimeRange(*bounds["asian"])
+        londonSession = self._filterByTimeRange(*bounds["london"])
+        nySession = self._filterByTimeRange(*bounds["ny"])
+        weeklyData = self._filterByTimeRange(*bounds["weekly"])
 
         return {
             "asianLow": min(bar["low"] for bar in asianSession) if asianSession else None,
@@ -51,16 +101,7 @@ class LiquidityZones:
         :param toleranceTicks: Max distance from zone to still count as a sweep
         :return: True if sweep detected, else False
         """
-        zoneLevel = self.zones.get(zoneName)
-        if zoneLevel is None:
-            return False
-
-        distance = abs(currentPrice - zoneLevel)
-
-        isLowSweep = "Low" in zoneName and currentPrice < zoneLevel
-        isHighSweep = "High" in zoneName and currentPrice > zoneLevel
-
-        return (isLowSweep or isHighSweep) and distance <= tickSize * toleranceTicks
+        return sweepAgainst(self.zones.get(zoneName), currentPrice, zoneName, tickSize, toleranceTicks)
 
     def isSweepConfirmed(self, currentPrice, zoneName):
         """
@@ -69,12 +110,224 @@ class LiquidityZones:
         :param zoneName: Zone that was swept (e.g. 'nyLow', 'londonHigh')
         :return: True if confirmed reversal
         """
-        zoneLevel = self.zones.get(zoneName)
-        if zoneLevel is None:
+        return confirmAgainst(self.zones.get(zoneName), currentPrice, zoneName)
+
+
+NS_PER_HOUR = 3_600_000_000_000
+NS_PER_DAY = 24 * NS_PER_HOUR
+SESSION_OFFSETS_NS = {
+    session: (int(startHour * NS_PER_HOUR), int(endHour * NS_PER_HOUR))
+    for session, (startHour, endHour) in SESSION_HOURS.items()
+}
+WEEKLY_LOOKBACK_NS = WEEKLY_LOOKBACK_DAYS * NS_PER_DAY
+
+
+class SessionZoneIndex:
+    """
+    Session liquidity zones keyed to each bar's own trading day rather than the wall clock.
+
+    Timestamps are parsed once into int64 UTC epoch nanoseconds. For every bar the index stores
+    the running Asian/London/NY high/low of that bar's trading day (sessions seen so far, bar
+    included) and the trailing 5-day weekly high/low, so zone lookups and sweep checks for any
+    bar are O(1). Bars can be appended one at a time (update) or indexed in bulk (fromFrame).
+
+    A long-running feed should set retainDays: when the arrays fill up, bars more than that many
+    days older than the newest are dropped instead of growing them, and barIndex then counts
+    from the oldest retained bar.
+    """
+
+    def __init__(self, capacity=1024, retainDays=None):
+        """:param retainDays: days of bars to keep behind the newest (at least WEEKLY_LOOKBACK_DAYS); None keeps all"""
+        if retainDays is not None and retainDays < WEEKLY_LOOKBACK_DAYS:
+            raise ValueError(f"retainDays must cover the {WEEKLY_LOOKBACK_DAYS}-day weekly lookback")
+        self.retainNs = None if retainDays is None else int(retainDays * NS_PER_DAY)
+        self.count = 0
+        self.epochNs = np.empty(capacity, dtype="int64")
+        self.high = np.empty(capacity, dtype="float64")
+        self.low = np.empty(capacity, dtype="float64")
+        self.zoneValues = {name: np.empty(capacity, dtype="float64") for name in ZONE_NAMES}
+        self.weeklyMax = deque()  # (barIndex, high), decreasing
+        self.weeklyMin = deque()  # (barIndex, low), increasing
+
+    @classmethod
+    def fromBars(cls, bars):
+        index = cls(capacity=max(len(bars), 1))
+        for bar in bars:
+            index.update(bar)
+        return index
+
+    @classmethod
+    def fromFrame(cls, priceData, timestampColumn="timestamp"):
+        """Vectorized build over a whole DataFrame sorted by time."""
+        n = len(priceData)
+        index = cls(capacity=max(n, 1))
+        if n == 0:
+            return index
+
+        stamps = pd.to_datetime(priceData[timestampColumn])
+        if stamps.dt.tz is not None:
+            stamps = stamps.dt.tz_convert("UTC").dt.tz_localize(None)
+        epochNs = stamps.to_numpy(dtype="datetime64[ns]").view("int64")
+        high = priceData["high"].to_numpy(dtype="float64")
+        low = priceData["low"].to_numpy(dtype="float64")
+
+        index.epochNs[:n] = epochNs
+        index.high[:n] = high
+        index.low[:n] = low
+
+        day = epochNs // NS_PER_DAY
+        timeOfDay = epochNs - day * NS_PER_DAY
+        for session, (startNs, endNs) in SESSION_OFFSETS_NS.items():
+            inSession = (timeOfDay >= startNs) & (timeOfDay <= endNs)
+            lows = pd.Series(np.where(inSession, low, np.inf)).groupby(day).cummin().to_numpy()
+            highs = pd.Series(np.where(inSession, high, -np.inf)).groupby(day).cummax().to_numpy()
+            index.zoneValues[session + "Low"][:n] = np.where(np.isinf(lows), np.nan, lows)
+            index.zoneValues[session + "High"][:n] = np.where(np.isinf(highs), np.nan, highs)
+
+        timeIndex = pd.DatetimeIndex(epochNs)
+        window = f"{WEEKLY_LOOKBACK_DAYS}D"
+        index.zoneValues["weeklyHigh"][:n] = pd.Series(high, index=timeIndex).rolling(window, closed="both").max().to_numpy()
+        index.zoneValues["weeklyLow"][:n] = pd.Series(low, index=timeIndex).rolling(window, closed="both").min().to_numpy()
+        index.count = n
+        index._rebuildWeekly()
+        return index
+
+    def __len__(self):
+        return self.count
+
+    def update(self, bar):
+        """
+        Feed one bar. A bar with the same timestamp as the last one revises it in place
+        (the still-forming bar PriceBuffer updates per tick).
+        """
+        epochNs = DataCleaner.toEpochNs(bar["timestamp"])
+        if self.count and epochNs == self.epochNs[self.count - 1]:
+            self._reviseLast(bar["high"], bar["low"])
+            return
+        if self.count and epochNs < self.epochNs[self.count - 1]:
+            raise ValueError(f"Bar at {bar['timestamp']} is older than the last indexed bar")
+
+        if self.count == len(self.epochNs) and not (self.retainNs is not None and self._dropOld()):
+            self._grow()
+        i = self.count
+        self.count += 1
+        self.epochNs[i] = epochNs
+        self.high[i] = bar["high"]
+        self.low[i] = bar["low"]
+        self._fillSessions(i)
+
+        while self.weeklyMax and self.weeklyMax[-1][1] <= bar["high"]:
+            self.weeklyMax.pop()
+        self.weeklyMax.append((i, bar["high"]))
+        while self.weeklyMin and self.weeklyMin[-1][1] >= bar["low"]:
+            self.weeklyMin.pop()
+        self.weeklyMin.append((i, bar["low"]))
+        self._fillWeekly(i)
+
+    def _grow(self):
+        size = len(self.epochNs) * 2
+        self.epochNs = np.resize(self.epochNs, size)
+        self.high = np.resize(self.high, size)
+        self.low = np.resize(self.low, size)
+        self.zoneValues = {name: np.resize(values, size) for name, values in self.zoneValues.items()}
+
+    def _dropOld(self):
+        """
+        Shift out the bars older than retainNs before the newest; returns False (and drops
+        nothing) if that would free less than half the arrays, so the caller grows them instead.
+        Zones of later bars never look further back than the weekly window, which the retained
+        bars still cover.
+        """
+        first = int(np.searchsorted(self.epochNs[:self.count], self.epochNs[self.count - 1] - self.retainNs))
+        if first < len(self.epochNs) // 2:
             return False
+        kept = self.count - first
+        for values in (self.epochNs, self.high, self.low, *self.zoneValues.values()):
+            values[:kept] = values[first:self.count]
+        self.count = kept
+        self.weeklyMax = deque((i - first, high) for i, high in self.weeklyMax)
+        self.weeklyMin = deque((i - first, low) for i, low in self.weeklyMin)
+        return True
 
-        if "Low" in zoneName:
-            return currentPrice > zoneLevel
-        elif "High" in zoneName:
-            return currentPrice < zoneLevel
-        return False
+    def _fillSessions(self, i):
+        day, timeOfDay = divmod(int(self.epochNs[i]), NS_PER_DAY)
+        sameDay = i > 0 and int(self.epochNs[i - 1]) // NS_PER_DAY == day
+
+        for session, (startNs, endNs) in SESSION_OFFSETS_NS.items():
+            prevLow = self.zoneValues[session + "Low"][i - 1] if sameDay else np.nan
+            prevHigh = self.zoneValues[session + "High"][i - 1] if sameDay else np.nan
+            if startNs <= timeOfDay <= endNs:
+                prevLow = self.low[i] if np.isnan(prevLow) else min(prevLow, self.low[i])
+                prevHigh = self.high[i] if np.isnan(prevHigh) else max(prevHigh, self.high[i])
+            self.zoneValues[session + "Low"][i] = prevLow
+            self.zoneValues[session + "High"][i] = prevHigh
+
+    def _fillWeekly(self, i):
+        cutoff = self.epochNs[i] - WEEKLY_LOOKBACK_NS
+        while self.epochNs[self.weeklyMax[0][0]] < cutoff:
+            self.weeklyMax.popleft()
+        while self.epochNs[self.weeklyMin[0][0]] < cutoff:
+            self.weeklyMin.popleft()
+        self.zoneValues["weeklyHigh"][i] = self.weeklyMax[0][1]
+        self.zoneValues["weeklyLow"][i] = self.weeklyMin[0][1]
+
+    def _reviseLast(self, high, low):
+        i = self.count - 1
+        widened = high >= self.high[i] and low <= self.low[i]
+        self.high[i] = high
+        self.low[i] = low
+        self._fillSessions(i)
+
+        if widened:
+            while self.weeklyMax and self.weeklyMax[-1][1] <= high:
+                self.weeklyMax.pop()
+            self.weeklyMax.append((i, high))
+            while self.weeklyMin and self.weeklyMin[-1][1] >= low:
+                self.weeklyMin.pop()
+            self.weeklyMin.append((i, low))
+        else:
+            # A narrowed bar may no longer dominate entries it evicted earlier
+            self._rebuildWeekly()
+        self._fillWeekly(i)
+
+    def _rebuildWeekly(self):
+        self.weeklyMax.clear()
+        self.weeklyMin.clear()
+        if not self.count:
+            return
+        last = self.count - 1
+        first = int(np.searchsorted(self.epochNs[:self.count], self.epochNs[last] - WEEKLY_LOOKBACK_NS))
+        for i in range(first, self.count):
+            while self.weeklyMax and self.weeklyMax[-1][1] <= self.high[i]:
+                self.weeklyMax.pop()
+            self.weeklyMax.append((i, self.high[i]))
+            while self.weeklyMin and self.weeklyMin[-1][1] >= self.low[i]:
+                self.weeklyMin.pop()
+            self.weeklyMin.append((i, self.low[i]))
+
+    def zoneColumn(self, zoneName):
+        """:return: per-bar zone levels for zoneName (NaN before the session has traded that day)"""
+        return self.zoneValues[zoneName][:self.count]
+
+    def zoneLevel(self, zoneName, barIndex=-1):
+        """:param barIndex: retained bar, counted like a list index (-1 is the latest); out of range raises IndexError"""
+        if not -self.count <= barIndex < self.count:
+            raise IndexError(f"barIndex {barIndex} out of range for {self.count} retained bars")
+        value = self.zoneValues[zoneName][barIndex if barIndex >= 0 else self.count + barIndex]
+        return None if np.isnan(value) else float(value)
+
+    def getZones(self, barIndex=-1):
+        """:return: the same dict LiquidityZones.getZones builds, for the given bar's own session"""
+        return {name: self.zoneLevel(name, barIndex) for name in ZONE_NAMES}
+
+    def detectSweep(self, currentPrice, zoneName, tickSize=0.25, toleranceTicks=4, *, barIndex=-1):
+        """LiquidityZones.detectSweep against the zone as of barIndex (keyword-only)."""
+        if not self.count:
+            return False
+        return sweepAgainst(self.zoneLevel(zoneName, barIndex), currentPrice, zoneName, tickSize, toleranceTicks)
+
+    def isSweepConfirmed(self, currentPrice, zoneName, *, barIndex=-1):
+        """LiquidityZones.isSweepConfirmed against the zone as of barIndex (keyword-only)."""
+        if not self.count:
+            return False
+        return confirmAgainst(self.zoneLevel(zoneName, barIndex), currentPrice, zoneName)
@@ -1,5 +1,5 @@
 # strategies/signal_evaluator.py
-from TqsCalculator import TqsCalculator
+from strategies.TqsCalculator import TqsCalculator
 
 class SignalEvaluator:
     def __init__(self, *, quoteTick, donchianHigh, donchianLow,
@@ -18,7 +18,6 @@ class SignalEvaluator:
         self.rsiAligned = rsiAligned
         self.biasAligned = biasAligned
         self.vixInRange = vixInRange
-        self.calculator = TqsCalculator()
 
     def _getCurrentPrice(self):
         # Use midpoint of bid/ask as the current price estimate
@@ -31,14 +30,23 @@ class SignalEvaluator:
             return last
         return None
 
-    def evaluate(self):
-        self.calculator.scoreSweep(self.isSwept, self.isSweepConfirmed)
-        self.calculator.scoreDonchianBreakout(self.currentPrice, self.donchianHigh, self.donchianLow)
-        self.calculator.scoreConfirmationIndicators(self.ev, self.rvol, self.macdAligned, self.rsiAligned)
-        self.calculator.scoreBiasAndVolatility(self.biasAligned, self.vixInRange)
+    def evaluate(self, includeBreakdown=True):
+        """
+        Score with TqsCalculator. 'mask' holds one TqsKernel bit per reason;
+        the (points, reason) 'breakdown' list is only decoded when includeBreakdown is set.
+        """
+        calculator = TqsCalculator()
+        calculator.scoreSweep(self.isSwept, self.isSweepConfirmed)
+        calculator.scoreDonchianBreakout(self.currentPrice, self.donchianHigh, self.donchianLow)
+        calculator.scoreConfirmationIndicators(self.ev, self.rvol, self.macdAligned, self.rsiAligned)
+        calculator.scoreBiasAndVolatility(self.biasAligned, self.vixInRange)
+        score, mask = calculator.getScore(), calculator.mask
 
-        return {
-            "score": self.calculator.getScore(),
-            "breakdown": self.calculator.getBreakdown(),
+        result = {
+            "score": score,
+            "mask": mask,
             "priceUsed": self.currentPrice
         }
+        if includeBreakdown:
+            result["breakdown"] = calculator.getBreakdown()
+        return result
@@ -1,44 +1,30 @@
 # strategies/tqs_calculator.py
+from strategies.TqsKernel import biasBits, confirmationBits, decodeMask, donchianBits, maskScores, sweepBits
+
 
 class TqsCalculator:
-    def __init__(self):
-        self.score = 0
-        self.reasons = []
+    """
+    Step-by-step TQS scoring. The rules live in TqsKernel; each score* call sets that group's
+    reason bits in `mask`, and the score and breakdown are read back from the mask.
+    """
 
-    def add(self, points, reason):
-        self.score += points
-        self.reasons.append((points, reason))
+    def __init__(self):
+        self.mask = 0
 
     def scoreSweep(self, isSwept, isConfirmed):
-        if isSwept and isConfirmed:
-            self.add(1.5, "Liquidity sweep confirmed")
-        elif isSwept:
-            self.add(0.5, "Potential sweep (unconfirmed)")
+        self.mask |= sweepBits(isSwept, isConfirmed)
 
     def scoreDonchianBreakout(self, currentPrice, donchianHigh, donchianLow):
-        if currentPrice > donchianHigh:
-            self.add(1.0, "Breakout above Donchian high")
-        elif currentPrice < donchianLow:
-            self.add(1.0, "Breakdown below Donchian low")
+        self.mask |= donchianBits(currentPrice, donchianHigh, donchianLow)
 
     def scoreConfirmationIndicators(self, ev, rvol, macdAligned, rsiAligned):
-        if ev > 0:
-            self.add(1.0, "Expected value > 0")
-        if rvol >= 1.5:
-            self.add(1.0, "RVOL >= 1.5")
-        if macdAligned:
-            self.add(0.5, "MACD aligned")
-        if rsiAligned:
-            self.add(0.5, "RSI aligned")
+        self.mask |= confirmationBits(ev, rvol, macdAligned, rsiAligned)
 
     def scoreBiasAndVolatility(self, biasAligned, vixInRange):
-        if biasAligned:
-            self.add(1.0, "Directional bias aligned")
-        if vixInRange:
-            self.add(1.0, "Correct VIX regime")
+        self.mask |= biasBits(biasAligned, vixInRange)
 
     def getScore(self):
-        return self.score
+        return float(maskScores(self.mask))
 
     def getBreakdown(self):
-        return self.reasons
+        return decodeMask(self.mask)
@@ -0,0 +1,151 @@
+# strategies/tqs_kernel.py
+import numpy as np
+
+# The TQS rules: one bit per reason, in scoring order:
+# (name, points, reason text, breakdown column in ColumnarSignals.TQS_COMPONENTS)
+TQS_REASONS = [
+    ("sweepConfirmed", 1.5, "Liquidity sweep confirmed", "sweep"),
+    ("sweepUnconfirmed", 0.5, "Potential sweep (unconfirmed)", "sweep"),
+    ("breakoutHigh", 1.0, "Breakout above Donchian high", "donchian"),
+    ("breakdownLow", 1.0, "Breakdown below Donchian low", "donchian"),
+    ("ev", 1.0, "Expected value > 0", "ev"),
+    ("rvol", 1.0, "RVOL >= 1.5", "rvol"),
+    ("macd", 0.5, "MACD aligned", "macd"),
+    ("rsi", 0.5, "RSI aligned", "rsi"),
+    ("bias", 1.0, "Directional bias aligned", "bias"),
+    ("vix", 1.0, "Correct VIX regime", "vix"),
+]
+
+TQS_BITS = {name: 1 << bit for bit, (name, _, _, _) in enumerate(TQS_REASONS)}
+TQS_POINTS = np.array([points for _, points, _, _ in TQS_REASONS])
+MASK_DTYPE = np.uint16
+
+RVOL_THRESHOLD = 1.5
+
+# Score of every possible mask, so a mask converts to its score with one lookup
+_MASK_SCORES = np.array([
+    sum(TQS_POINTS[bit] for bit in range(len(TQS_REASONS)) if mask >> bit & 1)
+    for mask in range(1 << len(TQS_REASONS))
+])
+
+
+def sweepBits(isSwept, isConfirmed):
+    if not isSwept:
+        return 0
+    return TQS_BITS["sweepConfirmed"] if isConfirmed else TQS_BITS["sweepUnconfirmed"]
+
+
+def donchianBits(currentPrice, donchianHigh, donchianLow):
+    if currentPrice > donchianHigh:
+        return TQS_BITS["breakoutHigh"]
+    if currentPrice < donchianLow:
+        return TQS_BITS["breakdownLow"]
+    return 0
+
+
+def confirmationBits(ev, rvol, macdAligned, rsiAligned):
+    mask = 0
+    if ev > 0:
+        mask |= TQS_BITS["ev"]
+    if rvol >= RVOL_THRESHOLD:
+        mask |= TQS_BITS["rvol"]
+    if macdAligned:
+        mask |= TQS_BITS["macd"]
+    if rsiAligned:
+        mask |= TQS_BITS["rsi"]
+    return mask
+
+
+def biasBits(biasAligned, vixInRange):
+    mask = 0
+    if biasAligned:
+        mask |= TQS_BITS["bias"]
+    if vixInRange:
+        mask |= TQS_BITS["vix"]
+    return mask
+
+
+def scoreMask(currentPrice, donchianHigh, donchianLow, isSwept, isConfirmed,
+              ev, rvol, macdAligned, rsiAligned, biasAligned, vixInRange):
+    """
+    Scalar TQS from the rule groups above (TqsCalculator adds the same groups one call at a time).
+    :return: (score, mask)
+    """
+    mask = (
+        sweepBits(isSwept, isConfirmed)
+        | donchianBits(currentPrice, donchianHigh, donchianLow)
+        | confirmationBits(ev, rvol, macdAligned, rsiAligned)
+        | biasBits(biasAligned, vixInRange)
+    )
+    return float(_MASK_SCORES[mask]), mask
+
+
+def scoreMasks(price, donchianHigh, donchianLow, isSwept, isConfirmed,
+               ev, rvol, macdAligned, rsiAligned, biasAligned, vixInRange):
+    """
+    Vectorized scoreMask. Price/Donchian/sweep inputs are per-bar arrays; the indicator
+    inputs may be scalars or arrays.
+    :return: (score float array, mask uint16 array)
+    """
+    price = np.asarray(price, dtype="float64")
+    n = len(price)
+
+    def flag(value):
+        return np.broadcast_to(np.asarray(value), (n,)).astype(bool)
+
+    isSwept = flag(isSwept)
+    isConfirmed = flag(isConfirmed)
+    breakout = price > donchianHigh
+    rvol = np.broadcast_to(np.asarray(rvol, dtype="float64"), (n,))
+    conditions = {
+        "sweepConfirmed": isSwept & isConfirmed,
+        "sweepUnconfirmed": isSwept & ~isConfirmed,
+        "breakoutHigh": breakout,
+        "breakdownLow": ~breakout & (price < donchianLow),
+        "ev": np.broadcast_to(np.asarray(ev, dtype="float64"), (n,)) > 0,
+        "rvol": rvol >= RVOL_THRESHOLD,
+        "macd": flag(macdAligned),
+        "rsi": flag(rsiAligned),
+        "bias": flag(biasAligned),
+        "vix": flag(vixInRange),
+    }
+
+    mask = np.zeros(n, dtype=MASK_DTYPE)
+    for name, condition in conditions.items():
+        mask |= np.where(condition, TQS_BITS[name], 0).astype(MASK_DTYPE)
+    return maskScores(mask), mask
+
+
+def maskScores(masks):
+    """Score for each mask (scalar or array)."""
+    return _MASK_SCORES[np.asarray(masks, dtype=np.int64)]
+
+
+def decodeMask(mask):
+    """The TqsCalculator breakdown for a mask: [(points, reason), ...] in scoring order."""
+    mask = int(mask)
+    return [(points, reason) for bit, (_, points, reason, _) in enumerate(TQS_REASONS) if mask >> bit & 1]
+
+
+def formatMask(mask):
+    """Breakdown as the text the signal log used to store, e.g. '1.0: Expected value > 0; 0.5: MACD aligned'."""
+    return "; ".join(f"{points}: {reason}" for points, reason in decodeMask(mask))
+
+
+def componentPoints(masks):
+    """Points per ColumnarSignals breakdown column (sweep, donchian, ...) for an array of masks."""
+    masks = np.asarray(masks, dtype=np.int64)
+    points = {}
+    for bit, (_, value, _, column) in enumerate(TQS_REASONS):
+        points[column] = points.get(column, 0.0) + np.where(masks >> bit & 1, value, 0.0)
+    return points
+
+
+def componentCounts(masks):
+    """How many masks have each reason set, keyed by reason text, most frequent first; zero counts are left out."""
+    masks = np.asarray(masks, dtype=np.int64)
+    counts = {
+        reason: int(np.count_nonzero(masks >> bit & 1))
+        for bit, (_, _, reason, _) in enumerate(TQS_REASONS)
+    }
+    return dict(sorted(((r, c) for r, c in counts.items() if c), key=lambda item: item[1], reverse=True))
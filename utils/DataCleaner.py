@@ -1,3 +1,11 @@
+import logging
+
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ["datetime", "open", "high", "low", "close", "volume"]
+
 class DataCleaner:
     @staticmethod
     def cleanBars(bars):
@@ -21,3 +29,51 @@ class DataCleaner:
         if ts and isinstance(ts, str) and not ts.endswith("Z"):
             bar["timestamp"] = ts + "Z"
         return bar
+
+    @staticmethod
+    def toEpochNs(timestamp):
+        """Parse one timestamp (ISO string, datetime, pandas Timestamp or epoch ns) into UTC epoch nanoseconds."""
+        ts = pd.Timestamp(timestamp)
+        if ts.tzinfo is not None:
+            ts = ts.tz_convert("UTC").tz_localize(None)
+        return ts.value
+
+
+def clean_ohlcv(df, source_name="unknown"):
+    """
+    Normalize a raw OHLCV DataFrame (e.g. a yfinance download): flat lowercase columns,
+    a 'datetime' column, numeric prices, no incomplete or duplicate bars, sorted by time.
+    Frames this function already cleaned are returned as-is, so cleaning cached data is free.
+    """
+    if df is None or df.empty:
+        log.warning(f"[{source_name}] No OHLCV rows to clean.")
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+    if df.attrs.get("ohlcvCleaned"):
+        return df
+
+    df = df.copy()
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+    df.columns = [str(c).lower() for c in df.columns]
+
+    if "datetime" not in df.columns:
+        df = df.reset_index()
+        df.columns = [str(c).lower() for c in df.columns]
+        df = df.rename(columns={"date": "datetime", "index": "datetime"})
+
+    df["datetime"] = pd.to_datetime(df["datetime"]).dt.as_unit("ns")
+    for column in OHLCV_COLUMNS[1:]:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors="coerce")
+    if "volume" not in df.columns:
+        df["volume"] = 0.0
+
+    rawRows = len(df)
+    df = df.dropna(subset=["datetime", "open", "high", "low", "close"])
+    df["volume"] = df["volume"].fillna(0)
+    df = df.drop_duplicates(subset="datetime", keep="last").sort_values("datetime")
+    df = df[OHLCV_COLUMNS].reset_index(drop=True)
+
+    log.info(f"[{source_name}] Cleaned OHLCV: {rawRows} -> {len(df)} rows")
+    df.attrs["ohlcvCleaned"] = True
+    return df
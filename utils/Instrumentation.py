@@ -0,0 +1,192 @@
+import json
+import logging
+import threading
+import time
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+HISTOGRAM_SAMPLES = 4096
+PERCENTILES = (50, 90, 99)
+
+_NULL_TIMER = nullcontext()
+
+
+class Histogram:
+    """Count/sum/min/max of every observation plus a ring of the latest samples for percentiles."""
+
+    def __init__(self, samples=HISTOGRAM_SAMPLES):
+        self.values = np.empty(samples, dtype="float64")
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def observe(self, value):
+        self.values[self.count % len(self.values)] = value
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def summary(self):
+        if not self.count:
+            return {"count": 0}
+        recent = self.values[:min(self.count, len(self.values))]
+        summary = {"count": self.count, "sum": self.total, "mean": self.total / self.count, "min": self.min, "max": self.max}
+        for p, value in zip(PERCENTILES, np.percentile(recent, PERCENTILES)):
+            summary[f"p{p}"] = float(value)
+        return summary
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+
+
+class Metrics:
+    """
+    In-process counters and histograms for the scoring pipeline.
+
+    Disabled by default: every call returns after one attribute check and timer() hands back a
+    shared no-op context, so instrumented hot paths cost almost nothing until enable() is called.
+    Counters also report a per-second rate since the registry was enabled or reset (ticks/sec).
+    Histograms of durations are in seconds.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.reset()
+
+    def enable(self):
+        if not self.enabled:
+            self.startedAt = time.perf_counter()
+        self.enabled = True
+        return self
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self.lock:
+            self.counters = {}
+            self.histograms = {}
+            self.startedAt = time.perf_counter()
+
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name, value):
+        if not self.enabled:
+            return
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(value)
+
+    def timer(self, name):
+        """Context manager recording the block's wall-clock seconds into histogram `name`."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def summary(self):
+        elapsed = max(time.perf_counter() - self.startedAt, 1e-9)
+        with self.lock:
+            counters = {
+                name: {"count": value, "perSecond": value / elapsed}
+                for name, value in self.counters.items()
+            }
+            histograms = {name: histogram.summary() for name, histogram in self.histograms.items()}
+        return {"counters": counters, "histograms": histograms}
+
+    def toJson(self, **kwargs):
+        return json.dumps(self.summary(), **kwargs)
+
+    def toPrometheus(self, prefix="hfl"):
+        """Prometheus text exposition: counters as *_total, histograms as summaries with quantiles."""
+        summary = self.summary()
+        lines = []
+        for name, counter in summary["counters"].items():
+            metric = f"{prefix}_{_metricName(name)}"
+            lines += [f"# TYPE {metric}_total counter", f"{metric}_total {counter['count']}",
+                      f"# TYPE {metric}_per_second gauge", f"{metric}_per_second {counter['perSecond']:.6g}"]
+        for name, histogram in summary["histograms"].items():
+            metric = f"{prefix}_{_metricName(name)}"
+            lines.append(f"# TYPE {metric} summary")
+            for p in PERCENTILES:
+                if f"p{p}" in histogram:
+                    lines.append(f'{metric}{{quantile="{p / 100}"}} {histogram[f"p{p}"]:.6g}')
+            lines += [f"{metric}_sum {histogram.get('sum', 0.0):.6g}", f"{metric}_count {histogram['count']}"]
+        return "\n".join(lines) + "\n"
+
+
+def _metricName(name):
+    return "".join(ch if ch.isalnum() else "_" for ch in name)
+
+
+# Process-wide registry used by the runners and the Engine
+metrics = Metrics()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        registry = self.server.metrics
+        if self.path.startswith("/metrics.json"):
+            body, contentType = registry.toJson().encode(), "application/json"
+        elif self.path.startswith("/metrics"):
+            body, contentType = registry.toPrometheus().encode(), "text/plain; version=0.0.4"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", contentType)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MetricsServer:
+    """
+    Local HTTP endpoint for a Metrics registry on a daemon thread:
+    GET /metrics (Prometheus text) and GET /metrics.json.
+    """
+
+    def __init__(self, registry=None, host="127.0.0.1", port=9108):
+        self.server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        self.server.metrics = registry or metrics
+        self.thread = threading.Thread(target=self.server.serve_forever, name="MetricsServer", daemon=True)
+
+    @property
+    def port(self):
+        return self.server.server_address[1]
+
+    def start(self):
+        self.thread.start()
+        log.info(f"Metrics at http://{self.server.server_address[0]}:{self.port}/metrics")
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -1,6 +1,11 @@
 # utils/price_buffer.py
-from datetime import datetime
-from DataCleaner import DataCleaner
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from live.MarketHours import session_date
+from utils.DataCleaner import DataCleaner
 
 class PriceBuffer:
     def __init__(self, maxBars=500):
@@ -8,6 +13,13 @@ class PriceBuffer:
         self.bars = []
         self.currentBar = None
 
+    def _rollBar(self, newBar):
+        if self.currentBar:
+            self.bars.append(self.currentBar)
+            if len(self.bars) > self.maxBars:
+                self.bars.pop(0)
+        self.currentBar = newBar
+
     def updateFromTick(self, tick):
         if not DataCleaner.isValidTick(tick):
             return
@@ -16,23 +28,162 @@ class PriceBuffer:
         price = tick.get("last")
 
         if not self.currentBar or self.currentBar["timestamp"] != timestamp:
-            if self.currentBar:
-                self.bars.append(self.currentBar)
-                if len(self.bars) > self.maxBars:
-                    self.bars.pop(0)
-            self.currentBar = {
+            self._rollBar({
                 "timestamp": timestamp,
                 "open": price,
                 "high": price,
                 "low": price,
                 "close": price
-            }
+            })
         else:
             self.currentBar["high"] = max(self.currentBar["high"], price)
             self.currentBar["low"] = min(self.currentBar["low"], price)
             self.currentBar["close"] = price
 
+    def updateFromBar(self, bar):
+        """
+        Push a historical bar (e.g. one row of a backtest DataFrame).
+        A bar with the same timestamp as the current one replaces it in place.
+        """
+        if self.currentBar and self.currentBar["timestamp"] == bar.get("timestamp"):
+            self.currentBar.update(bar)
+        else:
+            self._rollBar(dict(bar))
+
     def getBars(self):
         allBars = self.bars + ([self.currentBar] if self.currentBar else [])
         clean = DataCleaner.cleanBars(allBars)
         return DataCleaner.sortBarsByTime(clean)
+
+
+NS_PER_MINUTE = 60_000_000_000
+
+
+class RingPriceBuffer:
+    """
+    Fixed-capacity OHLCV ring buffer stored as preallocated NumPy columns
+    (float64 prices/volume, int64 UTC epoch-ns timestamps).
+
+    Every bar is written twice, at slot and slot + capacity, so the most recent N bars are always
+    one contiguous slice and view()/arrays() return zero-copy views. Appending a bar and revising
+    the still-forming bar are O(1). Holds up to maxBars closed bars plus the current one, like PriceBuffer.
+
+    Tick 'volume' is the feed's cumulative session volume, so each tick adds only the increase
+    since the previous one. The count restarts at a session rollover or when the total drops.
+    """
+
+    FIELDS = ("open", "high", "low", "close", "volume")
+
+    def __init__(self, maxBars=500):
+        self.maxBars = maxBars
+        self.capacity = maxBars + 1
+        self.timestamps = np.zeros(2 * self.capacity, dtype="int64")
+        self.columns = {field: np.zeros(2 * self.capacity, dtype="float64") for field in self.FIELDS}
+        self.total = 0
+        self.lastCumulativeVolume = None  # None until a tick sets the baseline
+        self.volumeSession = None
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def _write(self, slot, field, value):
+        column = self.columns[field]
+        column[slot] = value
+        column[slot + self.capacity] = value
+
+    def append(self, timestamp, open, high, low, close, volume=0.0):
+        """Start a new bar. :param timestamp: UTC epoch nanoseconds"""
+        slot = self.total % self.capacity
+        self.timestamps[slot] = timestamp
+        self.timestamps[slot + self.capacity] = timestamp
+        for field, value in zip(self.FIELDS, (open, high, low, close, volume)):
+            self._write(slot, field, value)
+        self.total += 1
+
+    def reviseCurrent(self, **fields):
+        """Overwrite fields of the still-forming bar in place, e.g. reviseCurrent(high=..., close=...)."""
+        slot = (self.total - 1) % self.capacity
+        for field, value in fields.items():
+            self._write(slot, field, value)
+
+    @property
+    def currentTimestamp(self):
+        return int(self.timestamps[(self.total - 1) % self.capacity]) if self.total else None
+
+    def updateFromTick(self, tick):
+        if not DataCleaner.isValidTick(tick):
+            return
+
+        timestamp = time.time_ns() // NS_PER_MINUTE * NS_PER_MINUTE
+        price = tick.get("last")
+
+        if timestamp != self.currentTimestamp:
+            # Sessions roll over on a minute boundary, so the check only runs when a new bar starts
+            session = session_date(datetime.fromtimestamp(timestamp / 1e9, tz=timezone.utc))
+            if self.volumeSession is not None and session != self.volumeSession:
+                self.lastCumulativeVolume = 0.0
+            self.volumeSession = session
+            volume = self._volumeDelta(tick.get("volume"))
+            self.append(timestamp, price, price, price, price, volume)
+        else:
+            slot = (self.total - 1) % self.capacity
+            self.reviseCurrent(
+                high=max(self.columns["high"][slot], price),
+                low=min(self.columns["low"][slot], price),
+                close=price,
+                volume=self.columns["volume"][slot] + self._volumeDelta(tick.get("volume"))
+            )
+
+    def _volumeDelta(self, cumulative):
+        """Volume traded since the previous tick, from the feed's cumulative session volume."""
+        if cumulative is None:
+            return 0.0
+        previous, self.lastCumulativeVolume = self.lastCumulativeVolume, float(cumulative)
+        if previous is None:
+            return 0.0
+        if cumulative < previous:
+            # The feed restarted its count (a new session or a reconnect): all of it is new volume
+            return float(cumulative)
+        return float(cumulative) - previous
+
+    def updateFromBar(self, bar):
+        """Push a bar dict; a bar with the current bar's timestamp revises it in place."""
+        timestamp = DataCleaner.toEpochNs(bar["timestamp"])
+        values = {field: bar.get(field, 0.0) for field in self.FIELDS}
+        if timestamp == self.currentTimestamp:
+            self.reviseCurrent(**values)
+        else:
+            self.append(timestamp, **values)
+
+    def view(self, field, n=None):
+        """
+        Zero-copy view of the last n values of a column (oldest first).
+        :param field: 'timestamp' or one of FIELDS
+        """
+        count = len(self)
+        n = count if n is None else min(n, count)
+        end = (self.total - 1) % self.capacity + self.capacity + 1
+        column = self.timestamps if field == "timestamp" else self.columns[field]
+        return column[end - n:end]
+
+    def arrays(self, n=None):
+        """:return: dict of zero-copy views for the last n bars, keyed 'timestamp' plus FIELDS"""
+        return {field: self.view(field, n) for field in ("timestamp",) + self.FIELDS}
+
+    @property
+    def currentBar(self):
+        if not self.total:
+            return None
+        slot = (self.total - 1) % self.capacity
+        bar = {field: float(self.columns[field][slot]) for field in self.FIELDS}
+        bar["timestamp"] = int(self.timestamps[slot])
+        return bar
+
+    def getBars(self):
+        """Compatibility with PriceBuffer.getBars(): list of bar dicts with ISO timestamps, oldest first."""
+        data = self.arrays()
+        isoTimes = data["timestamp"].view("datetime64[ns]").astype("datetime64[s]").astype(str).tolist()
+        return [
+            {"timestamp": isoTimes[i], **{field: float(data[field][i]) for field in self.FIELDS}}
+            for i in range(len(isoTimes))
+        ]
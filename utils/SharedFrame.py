@@ -0,0 +1,159 @@
+# utils/shared_frame.py
+import pickle
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+
+def _attachBlock(name):
+    """Attach to an existing block. Pool workers share the publisher's resource tracker, so the
+    re-registration on older Pythons is idempotent and only the publisher ever unlinks."""
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13 has no track flag
+        return SharedMemory(name=name)
+
+
+def _encodeObjects(values):
+    """
+    Object column -> (kind, offsets, data): row i is data[offsets[i]:offsets[i + 1]]. All-string
+    columns (e.g. headlines) are stored as UTF-8 'text'; anything else as one pickle per row.
+    """
+    if all(isinstance(value, str) for value in values):
+        kind, encoded = "text", [value.encode("utf-8") for value in values]
+    else:
+        kind, encoded = "pickled", [pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL) for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(item) for item in encoded], out=offsets[1:])
+    return kind, offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def _decodeObjects(kind, offsets, data, start, stop):
+    """Rows [start, stop) of an encoded object column as an object array."""
+    offsets = offsets[start:stop + 1] if stop is not None else offsets[start:]
+    if len(offsets) < 2:
+        return np.empty(0, dtype=object)
+    raw = data[offsets[0]:offsets[-1]].tobytes()
+    bounds = (offsets - offsets[0]).tolist()
+    decode = (lambda item: item.decode("utf-8")) if kind == "text" else pickle.loads
+    values = np.empty(len(bounds) - 1, dtype=object)
+    for i, (a, b) in enumerate(zip(bounds[:-1], bounds[1:])):
+        values[i] = decode(raw[a:b])  # item by item, so list-valued rows aren't broadcast
+    return values
+
+
+class SharedFrame:
+    """
+    A DataFrame published column by column into shared memory so worker processes can read it
+    without pickling. Numeric and datetime columns are shared arrays; object columns (text and
+    the like) are shared as one byte buffer plus row offsets and decoded only for the rows a
+    worker slices. The spec is just names, dtypes and block names, so it pickles in a few bytes.
+
+    The publishing process owns the blocks and must call close() when the workers are done.
+    """
+
+    def __init__(self, spec, blocks, owner):
+        self.spec = spec
+        self.blocks = blocks
+        self.owner = owner
+        self.columns = {}
+        self.encoded = {}
+        for column in spec["columns"]:
+            name = column["name"]
+            if column["kind"] in ("text", "pickled"):
+                offsets = np.ndarray(spec["length"] + 1, dtype=np.int64, buffer=blocks[f"{name}:offsets"].buf)
+                data = np.ndarray(column["nbytes"], dtype=np.uint8, buffer=blocks[name].buf)
+                self.encoded[name] = (column["kind"], offsets, data)
+            else:
+                block = blocks[name]
+                self.columns[name] = np.ndarray(spec["length"], dtype=column["dtype"], buffer=block.buf)
+
+    @staticmethod
+    def _share(values):
+        block = SharedMemory(create=True, size=max(values.nbytes, 1))
+        np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[:] = values
+        return block
+
+    @classmethod
+    def publish(cls, df):
+        spec = {"length": len(df), "columns": []}
+        blocks = {}
+        try:
+            for name in df.columns:
+                series = df[name]
+                if pd.api.types.is_datetime64_any_dtype(series):
+                    tz = str(series.dt.tz) if series.dt.tz is not None else None
+                    values = series.dt.tz_convert("UTC").dt.tz_localize(None) if tz else series
+                    values = values.to_numpy(dtype="datetime64[ns]")
+                    column = {"name": name, "kind": "datetime", "dtype": "datetime64[ns]", "tz": tz}
+                elif pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+                    values = series.to_numpy()
+                    column = {"name": name, "kind": "numeric", "dtype": values.dtype.str}
+                else:
+                    kind, offsets, values = _encodeObjects(series.tolist())
+                    blocks[f"{name}:offsets"] = cls._share(offsets)
+                    column = {"name": name, "kind": kind, "nbytes": values.nbytes,
+                              "offsetsBlock": blocks[f"{name}:offsets"].name}
+
+                blocks[name] = cls._share(values)
+                column["block"] = blocks[name].name
+                spec["columns"].append(column)
+        except Exception:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+            raise
+        return cls(spec, blocks, owner=True)
+
+    @classmethod
+    def attach(cls, spec, columns=None):
+        """:param columns: names of the only columns to map (default: all of them)"""
+        if columns is not None:
+            spec = dict(spec, columns=[column for column in spec["columns"] if column["name"] in columns])
+        blocks = {}
+        for column in spec["columns"]:
+            blocks[column["name"]] = _attachBlock(column["block"])
+            if "offsetsBlock" in column:
+                blocks[f"{column['name']}:offsets"] = _attachBlock(column["offsetsBlock"])
+        return cls(spec, blocks, owner=False)
+
+    def __len__(self):
+        return self.spec["length"]
+
+    def toFrame(self, start=0, stop=None):
+        """Copy rows [start, stop) out of shared memory into a regular DataFrame."""
+        data = {}
+        for column in self.spec["columns"]:
+            if column["name"] in self.encoded:
+                data[column["name"]] = _decodeObjects(*self.encoded[column["name"]], start, stop)
+                continue
+            values = self.columns[column["name"]][start:stop].copy()
+            if column["kind"] == "datetime" and column["tz"]:
+                values = pd.DatetimeIndex(values).tz_localize("UTC").tz_convert(column["tz"])
+            data[column["name"]] = values
+        return pd.DataFrame(data)
+
+    def sliceByTime(self, column, start, end):
+        """Rows with start <= column < end. The column must be sorted ascending."""
+        values = self.columns[column]
+        meta = next(c for c in self.spec["columns"] if c["name"] == column)
+        bounds = []
+        for ts in (start, end):
+            ts = pd.Timestamp(ts)
+            if ts.tzinfo is None and meta.get("tz"):
+                ts = ts.tz_localize(meta["tz"])
+            if ts.tzinfo is not None:
+                ts = ts.tz_convert("UTC").tz_localize(None)
+            bounds.append(np.datetime64(ts.to_datetime64(), "ns"))
+        first, last = np.searchsorted(values, bounds, side="left")
+        return self.toFrame(first, last)
+
+    def close(self):
+        self.columns = {}
+        self.encoded = {}
+        for block in self.blocks.values():
+            block.close()
+            if self.owner:
+                block.unlink()
+        self.blocks = {}